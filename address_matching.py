@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Indexed fuzzy matching of lot addresses against postcode sales tables
+
+Addresses are parsed once into a normalized key: postcode, house number,
+flat/sub-building and street/building-name tokens (upper case, common
+abbreviations expanded). AddressIndex hashes a postcode's rows by
+(house number, flat) and by token, so matching a lot only scores the handful
+of rows that share its number or a word, however large the table is.
+
+Handles "Flat 2, 10 High St" vs "10 High Street, Flat 2" vs "FLAT 2 10 HIGH
+STREET", "10A" house numbers and named buildings without a number.
+
+property_id() turns the same key into the canonical property ID stored on
+every lot and sheet row, so joins and dedup compare one short string.
+
+ResultsIndex is the inverted word -> lot number index over an auction's
+results table, used to give lots their lot number.
+"""
+
+import re
+import hashlib
+from collections import namedtuple
+
+MIN_MATCH_SCORE = 0.6
+MIN_RESULTS_SCORE = 0.6
+
+# Prices and outcome words in a results row that are not part of its address
+RESULT_NOISE_RE = re.compile(
+    r'£\s?[\d,.]+\+?|\b(?:SOLD|UNSOLD|NOT|WITHDRAWN|POSTPONED|PRIOR|POST|AFTER|AUCTION|FOR|GUIDE|PRICE|LOT\s*\d+[A-Z]?)\b',
+    re.IGNORECASE
+)
+
+ABBREVIATIONS = {
+    'ST': 'STREET', 'RD': 'ROAD', 'AVE': 'AVENUE', 'AV': 'AVENUE', 'LN': 'LANE', 'DR': 'DRIVE',
+    'CT': 'COURT', 'CRT': 'COURT', 'CL': 'CLOSE', 'CRES': 'CRESCENT', 'GDNS': 'GARDENS', 'GRN': 'GREEN',
+    'GRO': 'GROVE', 'GR': 'GROVE', 'PL': 'PLACE', 'SQ': 'SQUARE', 'TER': 'TERRACE', 'TERR': 'TERRACE',
+    'PK': 'PARK', 'PDE': 'PARADE', 'HSE': 'HOUSE', 'HO': 'HOUSE', 'MT': 'MOUNT', 'BLDGS': 'BUILDINGS',
+    'APT': 'APARTMENT', 'APTS': 'APARTMENTS', 'N': 'NORTH', 'S': 'SOUTH', 'E': 'EAST', 'W': 'WEST',
+    'UPR': 'UPPER', 'LWR': 'LOWER', 'GT': 'GREAT',
+}
+
+# Words that never help tell two addresses in one postcode apart
+STOP_WORDS = frozenset({'THE', 'OF', 'AND', 'AT', 'LAND', 'ADJACENT', 'TO', 'REAR', 'GROUND', 'FLOOR', 'FIRST',
+                        'SECOND', 'THIRD', 'TOP', 'BASEMENT'})
+
+# Stop words that still tell two properties at one house number apart
+PARCEL_WORDS = frozenset({'LAND', 'ADJACENT', 'REAR', 'GROUND', 'FLOOR', 'FIRST', 'SECOND', 'THIRD', 'TOP',
+                          'BASEMENT'})
+
+# Last word of a street name ("High STREET", "Park ROAD"); the words after it are locality or town
+STREET_TYPES = frozenset({'STREET', 'ROAD', 'AVENUE', 'LANE', 'DRIVE', 'COURT', 'CLOSE', 'CRESCENT', 'GARDENS',
+                          'GREEN', 'GROVE', 'PLACE', 'SQUARE', 'TERRACE', 'PARK', 'PARADE', 'MOUNT', 'WAY', 'WALK',
+                          'HILL', 'ROW', 'MEWS', 'RISE', 'VIEW', 'GATE', 'YARD', 'WHARF', 'BROADWAY', 'HIGHWAY'})
+
+SUB_BUILDING_WORDS = r'FLAT|APARTMENT|UNIT|MAISONETTE|STUDIO|ROOM|SUITE'
+
+POSTCODE_RE = re.compile(r'\b([A-Z]{1,2}\d[A-Z\d]?)\s*(\d[A-Z]{2})\b')
+SUB_BUILDING_RE = re.compile(r'\b(?:' + SUB_BUILDING_WORDS + r')\s+(\d+[A-Z]?|[A-Z]\d*)\b')
+NUMBER_RE = re.compile(r'^(\d+[A-Z]?)(?:-\d+[A-Z]?)?$')
+
+AddressKey = namedtuple('AddressKey', ['postcode', 'number', 'flat', 'tokens'])
+AddressMatch = namedtuple('AddressMatch', ['row', 'score', 'key'])
+
+
+def parse_address(text):
+    """
+    Parse an address into its AddressKey.
+
+    Returns:
+        AddressKey(postcode, number, flat, tokens) - number/flat are None when
+        absent and tokens is a frozenset of expanded street/building words
+    """
+    postcode, number, flat, words = _address_words(text)
+    return AddressKey(postcode, number, flat, frozenset(words))
+
+
+def _address_words(text):
+    """(postcode, number, flat, street/building words in order) of an address"""
+    upper = (text or '').upper()
+
+    postcode = None
+    postcode_match = POSTCODE_RE.search(upper)
+    if postcode_match:
+        postcode = f"{postcode_match.group(1)} {postcode_match.group(2)}"
+        upper = upper[:postcode_match.start()] + ' ' + upper[postcode_match.end():]
+
+    upper = re.sub(r'[^A-Z0-9/\- ]', ' ', upper)
+    upper = ' '.join(ABBREVIATIONS.get(word, word) for word in upper.split())
+
+    flat = None
+    flat_match = SUB_BUILDING_RE.search(upper)
+    if flat_match:
+        flat = flat_match.group(1)
+        upper = upper[:flat_match.start()] + ' ' + upper[flat_match.end():]
+
+    number = None
+    words = []
+    for word in upper.split():
+        number_match = NUMBER_RE.match(word)
+        if number_match:
+            if number is None:
+                number = number_match.group(1)
+            elif flat is None:
+                # "2 10 HIGH STREET": the first number was the sub-building
+                flat, number = number, number_match.group(1)
+            continue
+        word = word.strip('/-')
+        if len(word) > 1 and word not in STOP_WORDS and not word.isdigit() and word not in words:
+            words.append(word)
+
+    return postcode, number, flat, words
+
+
+def street_name(words):
+    """
+    Street name words of an address part: up to the street type ending it
+    ("HIGH STREET" of "HIGH STREET LONDON", "PARK ROAD" of "PARK ROAD WOOD
+    GREEN"), or every word if there is none.
+    """
+    for position, word in enumerate(words):
+        if word in STREET_TYPES and (position + 1 == len(words) or words[position + 1] not in STREET_TYPES):
+            return words[:position + 1]
+    return words
+
+
+def street_tokens(address, number):
+    """
+    Street words of a numbered address plus the words that mark a different
+    parcel at the same number ("land adjacent to", "rear of", "ground floor").
+
+    The street is read from the comma-separated part holding the house number
+    (the next part when "10," stands on its own) and stops at its street type,
+    so locality, town and county words do not count however the address is
+    punctuated.
+    """
+    upper = ' '.join(ABBREVIATIONS.get(word, word) for word in re.sub(r'[^A-Z0-9 ]', ' ', (address or '').upper()).split())
+    parts = [_address_words(part)[1:] for part in (address or '').split(',')]
+    words = None
+    for position, (part_number, _, part_words) in enumerate(parts):
+        if part_number == number:
+            following = [later_words for _, _, later_words in parts[position + 1:] if later_words]
+            words = part_words or (following[0] if following else [])
+            break
+    if words is None:
+        words = _address_words(address)[3]
+    return set(street_name(words)) | (PARCEL_WORDS & set(upper.split()))
+
+
+def property_id(address, postcode=None):
+    """
+    Canonical ID of a property, stable across EIG, EHP/Price Paid and sheet rows.
+
+    The ID hashes the postcode, house number, flat and street words (building
+    words for unnumbered addresses), so differently written forms of one
+    address (abbreviations, order, town names) share an ID while different
+    streets or parcels at the same number do not.
+
+    Args:
+        address: Address text
+        postcode: Postcode to use when the address does not contain one
+
+    Returns:
+        16 character hex ID, or '' if the address has no postcode or nothing
+        else to identify it by (callers then match on the address itself)
+    """
+    key = parse_address(address)
+    code = key.postcode or parse_address(postcode or '').postcode
+    if not code:
+        return ''
+    tokens = street_tokens(address, key.number) if key.number is not None else key.tokens
+    if not tokens and key.number is None:
+        return ''
+    parts = [code.replace(' ', ''), key.number or '', key.flat or '', ' '.join(sorted(tokens))]
+    return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()[:16]
+
+
+def score_keys(query, candidate):
+    """
+    Score how well a candidate row's key matches the query address key (0-1).
+
+    House numbers and flats must agree whenever either side has one; street
+    words are scored by how many of the candidate's words appear in the query
+    (the query usually also carries town/county words the row lacks).
+    """
+    if query.postcode and candidate.postcode and query.postcode != candidate.postcode:
+        return 0.0
+    if query.number != candidate.number and (query.number or candidate.number):
+        return 0.0
+    if query.flat != candidate.flat:
+        return 0.0
+    if not candidate.tokens:
+        return 0.6 if query.number else 0.0
+    overlap = len(query.tokens & candidate.tokens) / len(candidate.tokens)
+    if query.number:
+        return 0.5 + 0.5 * overlap
+    return overlap  # Named buildings rely on their words alone
+
+
+class AddressIndex:
+    """Hash index over one postcode's rows for constant-time fuzzy lookups"""
+
+    def __init__(self, rows, address_of=lambda row: row['cell']):
+        """
+        Build the index
+
+        Args:
+            rows: Rows of one postcode's sales table
+            address_of: Function returning a row's address text
+        """
+        self.rows = rows
+        self._by_number = {}
+        self._by_token = {}
+        for position, row in enumerate(rows):
+            key = parse_address(address_of(row))
+            entry = (position, key)
+            self._by_number.setdefault((key.number, key.flat), []).append(entry)
+            if key.number is None:
+                for token in key.tokens:
+                    self._by_token.setdefault(token, []).append(entry)
+
+    def candidates(self, key):
+        """Rows that could match: same (number, flat), or sharing a word for unnumbered buildings"""
+        if key.number is not None:
+            return self._by_number.get((key.number, key.flat), [])
+        seen = {}
+        for token in key.tokens:
+            for entry in self._by_token.get(token, []):
+                seen[entry[0]] = entry
+        return list(seen.values())
+
+    def best_match(self, address, prefer=None, min_score=MIN_MATCH_SCORE):
+        """
+        Best scoring row for an address.
+
+        Args:
+            address: Address to look up
+            prefer: Optional key function breaking score ties (highest wins), e.g. sale date
+            min_score: Lowest score accepted as a match
+
+        Returns:
+            AddressMatch(row, score, key) or None
+        """
+        query = parse_address(address)
+        best = None
+        for position, key in self.candidates(query):
+            score = score_keys(query, key)
+            if score < min_score:
+                continue
+            row = self.rows[position]
+            rank = (score, prefer(row) if prefer else 0, -position)
+            if best is None or rank > best[0]:
+                best = (rank, AddressMatch(row, score, key))
+        return best[1] if best else None
+
+
+def score_result(query, row):
+    """
+    Score how well an auction results row's key matches a lot address key (0-1).
+
+    Half the score is the share of words the two sides have in common (of the
+    shorter side, as either may carry extra town/county words); house
+    number and postcode make up the rest (half credit when a side lacks one),
+    and a number, flat or postcode that disagrees rules the row out.
+    """
+    for part in ('postcode', 'number', 'flat'):
+        if getattr(query, part) and getattr(row, part) and getattr(query, part) != getattr(row, part):
+            return 0.0
+    if not query.tokens or not row.tokens:
+        return 0.0
+    overlap = len(query.tokens & row.tokens) / min(len(query.tokens), len(row.tokens))
+    number = 1.0 if query.number and query.number == row.number else 0.5
+    postcode = 1.0 if query.postcode and query.postcode == row.postcode else 0.5
+    return 0.5 * overlap + 0.25 * number + 0.25 * postcode
+
+
+class ResultsIndex:
+    """Inverted word -> lot number index over one auction's results table"""
+
+    def __init__(self, results):
+        """
+        Tokenize the results table once
+
+        Args:
+            results: Dict of lot number -> results row text
+        """
+        self.results = dict(results)
+        self._keys = {}
+        self._by_term = {}
+        for lot_number, text in self.results.items():
+            key = parse_address(RESULT_NOISE_RE.sub(' ', text or ''))
+            self._keys[lot_number] = key
+            terms = set(key.tokens)
+            if key.number:
+                terms.add('#' + key.number)
+            if key.postcode:
+                terms.add('@' + key.postcode)
+            for term in terms:
+                self._by_term.setdefault(term, set()).add(lot_number)
+
+    def get(self, lot_number, default=None):
+        """Results row text of a lot"""
+        return self.results.get(lot_number, default)
+
+    def __len__(self):
+        return len(self.results)
+
+    def match(self, address, min_score=MIN_RESULTS_SCORE):
+        """
+        Lot number whose results row best matches an address.
+
+        Returns:
+            The lot number, or None if no row scores min_score or two rows tie for best
+        """
+        query = parse_address(address)
+        terms = set(query.tokens)
+        if query.number:
+            terms.add('#' + query.number)
+        if query.postcode:
+            terms.add('@' + query.postcode)
+
+        candidates = set()
+        for term in terms:
+            candidates |= self._by_term.get(term, set())
+
+        scored = sorted(((score_result(query, self._keys[lot]), lot) for lot in candidates), reverse=True)
+        if not scored or scored[0][0] < min_score:
+            return None
+        if len(scored) > 1 and scored[1][0] == scored[0][0]:
+            return None  # Ambiguous: better no lot number than the wrong one
+        return scored[0][1]
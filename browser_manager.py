@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+One Chromium per process, shared by the EIG scraper, the enrichment workflow
+and the main workflow controller
+
+BrowserManager launches Chromium the first time a context is asked for and
+hands out one long-lived context per site, loaded from that site's saved
+session and with the request blocking profile from request_blocking.py
+installed. Contexts are recycled after BROWSER_CONTEXT_MAX_USES pages so
+cookies, caches and leaked pages do not build up over a long run. The browser itself is
+closed when the process exits (or when close() is called).
+
+Playwright's sync API is bound to the thread that started it, so every sync
+Playwright call runs on one dedicated browser thread: callers hand their work
+to it with run_on_browser_thread() or the @on_browser_thread decorator, and
+get_browser_manager() only works there. The EIG pipeline's worker threads,
+the scripts and the workflow controller therefore all share one Chromium, and
+it is closed on that same thread (close_browser_thread(), also run at exit).
+AsyncBrowserManager is the playwright.async_api counterpart used by eig_async;
+close_async_browser_manager() closes it on its event loop.
+"""
+
+import os
+import atexit
+import queue
+import asyncio
+import functools
+import threading
+from concurrent.futures import Future
+
+from playwright.sync_api import sync_playwright
+from playwright.async_api import async_playwright
+
+from request_blocking import install_request_blocking, install_request_blocking_async, get_blocking_stats
+
+# Site name -> saved storage_state file (None = anonymous context)
+SITE_SESSIONS = {
+    'eig': "sessions/eig.json",
+    'propertyengine': "sessions/propertyengine.json",
+    'anonymous': None,
+}
+
+DEFAULT_HEADLESS = os.getenv('BROWSER_HEADLESS', 'true').lower() != 'false'
+DEFAULT_CONTEXT_MAX_USES = int(os.getenv('BROWSER_CONTEXT_MAX_USES', '200'))
+
+
+def _context_options(site):
+    if site not in SITE_SESSIONS:
+        raise ValueError(f"Unknown browser site: {site}")
+    session_file = SITE_SESSIONS[site]
+    if session_file and os.path.exists(session_file):
+        return {'storage_state': session_file}
+    return {}
+
+
+class BrowserManager:
+    """Lazily started Chromium with one recyclable context per site"""
+
+    def __init__(self, headless=DEFAULT_HEADLESS, context_max_uses=DEFAULT_CONTEXT_MAX_USES):
+        """
+        Initialize the manager (nothing is launched until a context is needed)
+
+        Args:
+            headless: Launch Chromium without a window
+            context_max_uses: Pages a context may open before it is recycled
+        """
+        self.headless = headless
+        self.context_max_uses = max(1, context_max_uses)
+        self.playwright = None
+        self.browser = None
+        self._contexts = {}
+        self._uses = {}
+
+    def start(self):
+        """Launch Chromium if it is not already running"""
+        if self.browser is None or not self.browser.is_connected():
+            if self.playwright is None:
+                self.playwright = sync_playwright().start()
+            print(f"🚀 Launching shared Chromium (headless={self.headless})")
+            self.browser = self.playwright.chromium.launch(headless=self.headless)
+            self._contexts = {}
+            self._uses = {}
+        return self.browser
+
+    def set_headless(self, headless):
+        """
+        Switch headless mode. A running browser in the other mode is closed
+        first (its pages should be done with) and relaunched on next use.
+        """
+        if headless == self.headless:
+            return
+        if self.browser is not None:
+            open_pages = sum(len(context.pages) for context in self._contexts.values())
+            if open_pages:
+                print(f"⚠️ Relaunching shared Chromium with {open_pages} pages still open")
+            print(f"🔁 Relaunching shared Chromium with headless={headless}")
+            self.close()
+        self.headless = headless
+
+    def context(self, site='anonymous'):
+        """
+        Return the shared context for a site, creating or recycling it as needed.
+
+        A context that has opened context_max_uses pages is replaced once
+        none of its pages are still open.
+        """
+        self.start()
+        context = self._contexts.get(site)
+        if context is not None and self._uses.get(site, 0) >= self.context_max_uses and not context.pages:
+            print(f"♻️ Recycling '{site}' browser context")
+            self._close_context(site)
+            context = None
+
+        if context is None:
+            options = _context_options(site)
+            if options:
+                print(f"📁 Loading {site} session from: {options['storage_state']}")
+            context = self.browser.new_context(**options)
+            context.on("page", lambda _page: self._count_use(site))
+            install_request_blocking(context)
+            self._contexts[site] = context
+            self._uses[site] = 0
+        return context
+
+    def new_page(self, site='anonymous'):
+        """Open a page in the site's shared context"""
+        return self.context(site).new_page()
+
+    def _count_use(self, site):
+        self._uses[site] = self._uses.get(site, 0) + 1
+
+    def save_session(self, site):
+        """Write the site's cookies and storage back to its session file"""
+        session_file = SITE_SESSIONS.get(site)
+        if session_file and site in self._contexts:
+            os.makedirs(os.path.dirname(session_file), exist_ok=True)
+            self._contexts[site].storage_state(path=session_file)
+
+    def recycle(self, site):
+        """Drop the site's context so the next request reloads its session file"""
+        self._close_context(site)
+
+    def _close_context(self, site):
+        context = self._contexts.pop(site, None)
+        self._uses.pop(site, None)
+        if context is not None:
+            try:
+                context.close()
+            except Exception as e:
+                print(f"⚠️ Error closing {site} context: {e}")
+
+    def close(self):
+        """Close every context, the browser and Playwright"""
+        if self.browser is not None:
+            print(f"🚫 {get_blocking_stats().summary()}")
+        for site in list(self._contexts):
+            self._close_context(site)
+        try:
+            if self.browser:
+                self.browser.close()
+        except Exception as e:
+            print(f"⚠️ Error closing browser: {e}")
+        try:
+            if self.playwright:
+                self.playwright.stop()
+        except Exception as e:
+            print(f"⚠️ Error stopping playwright: {e}")
+        self.browser = None
+        self.playwright = None
+
+
+class AsyncBrowserManager:
+    """asyncio counterpart of BrowserManager for eig_async"""
+
+    def __init__(self, headless=DEFAULT_HEADLESS, context_max_uses=DEFAULT_CONTEXT_MAX_USES):
+        self.headless = headless
+        self.context_max_uses = max(1, context_max_uses)
+        self.loop = None
+        self.playwright = None
+        self.browser = None
+        self._contexts = {}
+        self._uses = {}
+
+    async def start(self):
+        """Launch Chromium if it is not already running"""
+        if self.browser is None or not self.browser.is_connected():
+            if self.playwright is None:
+                self.playwright = await async_playwright().start()
+            print(f"🚀 Launching shared Chromium (headless={self.headless})")
+            self.browser = await self.playwright.chromium.launch(headless=self.headless)
+            self._contexts = {}
+            self._uses = {}
+        return self.browser
+
+    async def context(self, site='anonymous'):
+        """Return the shared context for a site, creating or recycling it as needed"""
+        await self.start()
+        context = self._contexts.get(site)
+        if context is not None and self._uses.get(site, 0) >= self.context_max_uses and not context.pages:
+            print(f"♻️ Recycling '{site}' browser context")
+            await self._close_context(site)
+            context = None
+
+        if context is None:
+            context = await self.browser.new_context(**_context_options(site))
+            context.on("page", lambda _page: self._count_use(site))
+            await install_request_blocking_async(context)
+            self._contexts[site] = context
+            self._uses[site] = 0
+        return context
+
+    async def new_page(self, site='anonymous'):
+        """Open a page in the site's shared context"""
+        context = await self.context(site)
+        return await context.new_page()
+
+    def _count_use(self, site):
+        self._uses[site] = self._uses.get(site, 0) + 1
+
+    async def recycle(self, site):
+        """Drop the site's context so the next request reloads its session file"""
+        await self._close_context(site)
+
+    async def _close_context(self, site):
+        context = self._contexts.pop(site, None)
+        self._uses.pop(site, None)
+        if context is not None:
+            try:
+                await context.close()
+            except Exception as e:
+                print(f"⚠️ Error closing {site} context: {e}")
+
+    async def close(self):
+        """Close every context, the browser and Playwright"""
+        if self.browser is not None:
+            print(f"🚫 {get_blocking_stats().summary()}")
+        for site in list(self._contexts):
+            await self._close_context(site)
+        try:
+            if self.browser:
+                await self.browser.close()
+        except Exception as e:
+            print(f"⚠️ Error closing browser: {e}")
+        try:
+            if self.playwright:
+                await self.playwright.stop()
+        except Exception as e:
+            print(f"⚠️ Error stopping playwright: {e}")
+        self.browser = None
+        self.playwright = None
+
+
+_thread_state = threading.local()
+_manager = None
+_async_manager = None
+_browser_thread = None
+_browser_thread_lock = threading.Lock()
+
+
+class _BrowserThread:
+    """
+    A daemon thread running submitted calls one at a time, in arrival order.
+
+    It is a daemon (unlike a ThreadPoolExecutor's workers, which are stopped
+    before atexit handlers run) so the exit hook can still close the browser on it.
+    """
+
+    def __init__(self):
+        self._calls = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="browser", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        _thread_state.browser_thread = True
+        while True:
+            call = self._calls.get()
+            if call is None:
+                return
+            future, fn, args, kwargs = call
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        self._calls.put((future, fn, args, kwargs))
+        return future
+
+    def stop(self):
+        """Finish the calls already submitted, then end the thread"""
+        self._calls.put(None)
+        self._thread.join()
+
+
+def _on_browser_thread():
+    return getattr(_thread_state, 'browser_thread', False)
+
+
+def get_browser_manager(headless=None):
+    """
+    Return the shared BrowserManager (only on the browser thread).
+
+    Args:
+        headless: Headless mode the caller needs (None: whatever is running, else
+                  DEFAULT_HEADLESS). Asking for the other mode than the running
+                  browser's relaunches it, e.g. headed for the manual
+                  PropertyEngine login after the scraper started it headless
+
+    Raises:
+        RuntimeError: Called from another thread than the browser thread
+    """
+    global _manager
+    if not _on_browser_thread():
+        raise RuntimeError("Sync Playwright work must run on the browser thread (see run_on_browser_thread)")
+    if _manager is None:
+        _manager = BrowserManager(headless=DEFAULT_HEADLESS if headless is None else headless)
+    elif headless is not None:
+        _manager.set_headless(headless)
+    return _manager
+
+
+def get_async_browser_manager():
+    """
+    Return the process-wide AsyncBrowserManager.
+
+    Playwright's async objects belong to the event loop that created them, so a
+    new manager is made if the running loop has changed (e.g. successive asyncio.run calls).
+    """
+    global _async_manager
+    loop = asyncio.get_running_loop()
+    if _async_manager is None or _async_manager.loop is not loop:
+        _async_manager = AsyncBrowserManager()
+        _async_manager.loop = loop
+    return _async_manager
+
+
+async def close_async_browser_manager():
+    """Close the running event loop's AsyncBrowserManager (a new one is made if needed again)"""
+    global _async_manager
+    manager = _async_manager
+    if manager is not None and manager.loop is asyncio.get_running_loop():
+        _async_manager = None
+        await manager.close()
+
+
+def _close_manager():
+    if _manager is not None:
+        _manager.close()
+
+
+def run_on_browser_thread(fn, *args, **kwargs):
+    """
+    Run fn on the dedicated browser thread and return its result.
+
+    Every caller's get_browser_manager() inside fn is the same manager, so
+    threads that take turns here share one Chromium. Calls are run one at a
+    time, in the order they arrive; a call made on the browser thread itself
+    runs straight away.
+
+    Args:
+        fn: Callable doing Playwright work
+        *args, **kwargs: Passed to fn
+
+    Returns:
+        What fn returned (its exception is raised in the caller)
+    """
+    global _browser_thread
+    if _on_browser_thread():
+        return fn(*args, **kwargs)
+    with _browser_thread_lock:
+        if _browser_thread is None:
+            _browser_thread = _BrowserThread()
+        browser_thread = _browser_thread
+    return browser_thread.submit(fn, *args, **kwargs).result()
+
+
+def on_browser_thread(fn):
+    """Decorator: every call of fn runs on the browser thread (see run_on_browser_thread)"""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        return run_on_browser_thread(fn, *args, **kwargs)
+    return wrapper
+
+
+def close_browser_manager():
+    """Close the shared browser on the browser thread (it is relaunched if needed again)"""
+    if _browser_thread is not None or _on_browser_thread():
+        run_on_browser_thread(_close_manager)
+
+
+def close_browser_thread():
+    """Close the shared browser on its thread and stop the thread (it is restarted if needed again)"""
+    global _browser_thread
+    if _on_browser_thread():
+        raise RuntimeError("close_browser_thread() cannot be called on the browser thread")
+    with _browser_thread_lock:
+        browser_thread, _browser_thread = _browser_thread, None
+    if browser_thread is not None:
+        browser_thread.submit(_close_manager).result()
+        browser_thread.stop()
+
+
+@atexit.register
+def _close_on_exit():
+    # Sync Playwright objects can only be closed on the thread that created them
+    close_browser_thread()
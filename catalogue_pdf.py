@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Bulk guide prices from auction catalogue PDFs
+
+Reading a lot's guide price used to mean clicking "Catalogue Entry" on its
+lot page and waiting for the entry to render. Auctions publish the whole
+catalogue as a PDF (and sometimes one PDF per lot), so this module downloads
+those documents over HTTP, extracts their text in a process pool and maps
+guide prices to lot numbers for the whole auction in one go.
+
+Parsed documents are cached in SQLite by the SHA-256 of their bytes, so an
+unchanged catalogue is never parsed twice. pypdf is optional: without it no
+PDF is parsed and guide prices come from the lot pages as before.
+"""
+
+import os
+import re
+import json
+import asyncio
+import time
+import sqlite3
+import hashlib
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from bs4 import BeautifulSoup
+
+from eig_http import GUIDE_PRICE_PATTERNS, absolute_url
+
+try:
+    import pypdf
+except ImportError:  # Optional: guide prices then come from the lot pages
+    pypdf = None
+
+CATALOGUE_PDF_CACHE_PATH = os.getenv('CATALOGUE_PDF_CACHE_PATH', 'cache/catalogue_pdf.sqlite')
+CATALOGUE_PDF_ENABLED = os.getenv('CATALOGUE_PDF', 'true').lower() != 'false'
+CATALOGUE_PDF_WORKERS = int(os.getenv('CATALOGUE_PDF_WORKERS', str(min(4, os.cpu_count() or 1))))
+
+# Pages extracted per process pool task (smaller documents are extracted in-process)
+PAGES_PER_TASK = 16
+
+LOT_HEADING_PATTERN = re.compile(r'^\s*Lot\s*(?:No\.?|Number)?\s*:?\s*(\d{1,4}[A-Za-z]?)\b', re.IGNORECASE | re.MULTILINE)
+
+# Key under which a per-lot document's guide price is cached (it has no lot headings)
+DOCUMENT_GUIDE_KEY = ''
+
+
+# ----------------------------
+# Document discovery
+# ----------------------------
+
+def find_catalogue_pdf_urls(html):
+    """
+    Whole-catalogue PDF links on an auction detail page.
+
+    Returns:
+        Absolute URLs of PDF links whose URL or text mentions the catalogue, in page order
+    """
+    soup = BeautifulSoup(html, "lxml")
+    urls = []
+    for link in soup.select("a[href$='.pdf'], a[href*='.pdf?']"):
+        href = link.get("href") or ""
+        if 'catalogue' in href.lower() or 'catalogue' in link.get_text(" ", strip=True).lower():
+            url = absolute_url(href)
+            if url not in urls:
+                urls.append(url)
+    return urls
+
+
+def document_hash(data):
+    """Cache key of a document: SHA-256 of its bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+
+# ----------------------------
+# Text extraction
+# ----------------------------
+
+def _extract_pages(data, start, stop):
+    """Text of pages [start, stop) of a PDF (runs in a worker process)"""
+    reader = pypdf.PdfReader(BytesIO(data))
+    return "\n".join(reader.pages[index].extract_text() or "" for index in range(start, stop))
+
+
+def extract_pdf_text(data, executor=None):
+    """
+    Text of a whole PDF, extracted PAGES_PER_TASK pages at a time on the process pool.
+
+    Returns:
+        The text, or '' if pypdf is missing or the document cannot be read
+    """
+    if pypdf is None:
+        return ""
+    try:
+        page_count = len(pypdf.PdfReader(BytesIO(data)).pages)
+        if page_count <= PAGES_PER_TASK or executor is None:
+            return _extract_pages(data, 0, page_count)
+        ranges = [(start, min(start + PAGES_PER_TASK, page_count)) for start in range(0, page_count, PAGES_PER_TASK)]
+        chunks = executor.map(_extract_pages, [data] * len(ranges), *zip(*ranges))
+        return "\n".join(chunks)
+    except Exception as e:
+        print(f"    ⚠️ Could not read PDF: {e}")
+        return ""
+
+
+def first_guide_price(text):
+    """First guide price in a piece of text ('£120,000+'), or None"""
+    flattened = " ".join(text.split())
+    for pattern in GUIDE_PRICE_PATTERNS:
+        match = re.search(pattern, flattened, re.IGNORECASE)
+        if match:
+            return f"£{match.group(1)}"
+    return None
+
+
+def guide_prices_from_text(text):
+    """
+    Map lot numbers to guide prices in a catalogue's text.
+
+    The text is split at "Lot N" headings and each lot's first guide price is
+    taken; a lot mentioned several times (e.g. in a contents page) keeps the
+    first section that has one.
+
+    Returns:
+        Dict of lot number -> guide price
+    """
+    headings = list(LOT_HEADING_PATTERN.finditer(text))
+    guides = {}
+    for heading, following in zip(headings, headings[1:] + [None]):
+        lot_number = heading.group(1).upper()
+        if lot_number in guides:
+            continue
+        guide = first_guide_price(text[heading.end():following.start() if following else len(text)])
+        if guide:
+            guides[lot_number] = guide
+    return guides
+
+
+def parse_document(data, executor=None):
+    """Guide prices of one document: lot number -> guide, plus DOCUMENT_GUIDE_KEY for its first guide"""
+    text = extract_pdf_text(data, executor)
+    guides = guide_prices_from_text(text)
+    first = first_guide_price(text)
+    if first:
+        guides[DOCUMENT_GUIDE_KEY] = first
+    return guides
+
+
+# ----------------------------
+# Cache
+# ----------------------------
+
+class CatalogueGuideCache:
+    """SQLite-backed document hash -> parsed guide prices cache"""
+
+    def __init__(self, path=CATALOGUE_PDF_CACHE_PATH):
+        """
+        Initialize the cache
+
+        Args:
+            path: SQLite file (created with its directory if missing)
+        """
+        self.path = path
+        self.stats = {'hits': 0, 'misses': 0}
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS catalogue_guides ("
+            " document_hash TEXT PRIMARY KEY,"
+            " url TEXT NOT NULL,"
+            " guides TEXT NOT NULL,"
+            " parsed_at REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    def get(self, digest):
+        """Cached guide prices of a document, or None"""
+        with self._lock:
+            row = self._db.execute("SELECT guides FROM catalogue_guides WHERE document_hash = ?", (digest,)).fetchone()
+            self.stats['hits' if row else 'misses'] += 1
+        return json.loads(row[0]) if row else None
+
+    def put(self, digest, url, guides):
+        """Store a document's parsed guide prices"""
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO catalogue_guides (document_hash, url, guides, parsed_at) VALUES (?, ?, ?, ?)",
+                (digest, url, json.dumps(guides), time.time())
+            )
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_cache = None
+_executor = None
+_shared_lock = threading.Lock()
+
+
+def get_catalogue_guide_cache():
+    """Return the process-wide CatalogueGuideCache"""
+    global _cache
+    with _shared_lock:
+        if _cache is None:
+            _cache = CatalogueGuideCache()
+        return _cache
+
+
+def get_pdf_executor():
+    """Return the process-wide ProcessPoolExecutor for PDF text extraction"""
+    global _executor
+    with _shared_lock:
+        if _executor is None:
+            # Spawned, not forked: the parent runs Playwright and other threads,
+            # whose locks and driver state a forked child would inherit
+            _executor = ProcessPoolExecutor(max_workers=max(1, CATALOGUE_PDF_WORKERS),
+                                            mp_context=multiprocessing.get_context('spawn'))
+        return _executor
+
+
+def document_guides(url, data):
+    """Guide prices of a downloaded document, from the cache or parsed (and cached)"""
+    cache = get_catalogue_guide_cache()
+    digest = document_hash(data)
+    guides = cache.get(digest)
+    if guides is None:
+        guides = parse_document(data, get_pdf_executor())
+        cache.put(digest, url, guides)
+    return guides
+
+
+# ----------------------------
+# Auction level
+# ----------------------------
+
+def catalogue_documents(detail_html, catalogue):
+    """
+    Documents worth downloading for an auction.
+
+    Returns:
+        List of (url, lot_url) pairs: lot_url is None for a whole-catalogue PDF,
+        else the lot a per-lot PDF belongs to (only lots still without a guide price)
+    """
+    if not CATALOGUE_PDF_ENABLED or pypdf is None:
+        return []
+    documents = [(url, None) for url in find_catalogue_pdf_urls(detail_html or "")]
+    documents += [
+        (entry['document_url'], entry['lot_url'])
+        for entry in catalogue
+        if entry.get('document_url') and not entry.get('guide_price')
+    ]
+    return documents
+
+
+def apply_document_guides(catalogue, documents):
+    """
+    Fill catalogue entries' guide prices from parsed documents.
+
+    Args:
+        catalogue: Entries from eig_http.parse_auction_catalogue (updated in place)
+        documents: List of (lot_url, guides) pairs, lot_url as in catalogue_documents
+
+    Returns:
+        Dict of lot number -> guide price for the auction, or None when the
+        documents gave no guide prices (lots missing from the dict still open
+        their catalogue entries on the lot page)
+    """
+    if not documents:
+        return None
+    by_lot_number = {}
+    by_lot_url = {}
+    for lot_url, guides in documents:
+        if lot_url is None:
+            for lot_number, guide in guides.items():
+                if lot_number != DOCUMENT_GUIDE_KEY:
+                    by_lot_number.setdefault(lot_number, guide)
+        elif guides.get(DOCUMENT_GUIDE_KEY):
+            by_lot_url[lot_url] = guides[DOCUMENT_GUIDE_KEY]
+
+    for entry in catalogue:
+        if entry.get('guide_price'):
+            continue
+        guide = by_lot_url.get(entry['lot_url']) or by_lot_number.get((entry.get('lot_number') or '').upper())
+        if guide:
+            entry['guide_price'] = guide
+            if entry.get('lot_number'):
+                by_lot_number.setdefault(entry['lot_number'].upper(), guide)
+
+    print(f"📄 Catalogue PDFs: guide prices for {len(by_lot_number)} lots from {len(documents)} documents")
+    return by_lot_number or None
+
+
+def apply_catalogue_guide_prices(detail_html, catalogue, client):
+    """
+    Download and parse an auction's catalogue PDFs and fill in its guide prices.
+
+    Args:
+        detail_html: Auction detail page HTML
+        catalogue: Entries from eig_http.parse_auction_catalogue (updated in place)
+        client: EIGHttpClient used for the downloads
+
+    Returns:
+        Dict of lot number -> guide price, or None if the auction has no usable PDF
+    """
+    documents = []
+    for url, lot_url in catalogue_documents(detail_html, catalogue):
+        data = client.get_document(url)
+        if data:
+            documents.append((lot_url, document_guides(url, data)))
+    return apply_document_guides(catalogue, documents)
+
+
+async def apply_catalogue_guide_prices_async(detail_html, catalogue, client):
+    """Async version of apply_catalogue_guide_prices (AsyncEIGHttpClient downloads, parsing off the loop)"""
+    documents = []
+    for url, lot_url in catalogue_documents(detail_html, catalogue):
+        data = await client.get_document(url)
+        if data:
+            documents.append((lot_url, await asyncio.to_thread(document_guides, url, data)))
+    return apply_document_guides(catalogue, documents)
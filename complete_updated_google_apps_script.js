@@ -32,6 +32,11 @@ function doPost(e) {
 
     Logger.log(`Successfully found sheet: ${sheet.getName()}`);
 
+    // Rows are found again by property_id, so written sheets must have it
+    if (["add", "update_row", "update_rows"].indexOf(action) !== -1) {
+      ensurePropertyIdHeader(sheet);
+    }
+
     switch (action) {
       case "add":
         return handleAdd(sheet, rows, tabName);
@@ -39,6 +44,8 @@ function doPost(e) {
         return handleRead(sheet, tabName);
       case "update_row":
         return handleUpdateRow(sheet, row_data, tabName);
+      case "update_rows":
+        return handleUpdateRows(sheet, rows, tabName);
       case "delete_row":
         return handleDeleteRow(sheet, row_data, tabName);
       default:
@@ -54,12 +61,29 @@ function doPost(e) {
   }
 }
 
+// Migration for sheets created before property_id existed: append the
+// header when it is missing (idempotent, so it is safe on every write)
+function ensurePropertyIdHeader(sheet) {
+  const lastColumn = sheet.getLastColumn();
+  const headers =
+    lastColumn > 0 ? sheet.getRange(1, 1, 1, lastColumn).getValues()[0] : [];
+  if (headers.length === 0 || headers.indexOf("property_id") !== -1) {
+    return false;
+  }
+  sheet
+    .getRange(1, lastColumn + 1)
+    .setValue("property_id")
+    .setFontWeight("bold");
+  Logger.log(`Added property_id header to ${sheet.getName()}`);
+  return true;
+}
+
 function handleAdd(sheet, rows, tabName) {
   try {
     Logger.log(`Adding ${rows.length} rows to sheet: ${tabName}`);
 
-    let addedCount = 0;
     const headers = sheet.getDataRange().getValues()[0];
+    const values = [];
 
     Logger.log(`Headers in ${tabName}: ${headers.join(", ")}`);
 
@@ -73,6 +97,8 @@ function handleAdd(sheet, rows, tabName) {
             return rowData.auction_date || "";
           case "address":
             return rowData.address || "";
+          case "property_id":
+            return rowData.property_id || "";
           case "auction_sale":
             return rowData.auction_sale || "";
           case "lot_number":
@@ -102,9 +128,23 @@ function handleAdd(sheet, rows, tabName) {
         }
       });
 
-      sheet.appendRow(row);
-      addedCount++;
+      values.push(row);
+    }
+
+    // One write for the whole batch instead of an appendRow per row; the
+    // lock keeps concurrent executions from claiming the same free rows
+    const lock = LockService.getScriptLock();
+    lock.waitLock(30000);
+    try {
+      if (values.length > 0) {
+        sheet
+          .getRange(sheet.getLastRow() + 1, 1, values.length, headers.length)
+          .setValues(values);
+      }
+    } finally {
+      lock.releaseLock();
     }
+    const addedCount = values.length;
 
     Logger.log(`Successfully added ${addedCount} rows to ${tabName}`);
 
@@ -112,6 +152,7 @@ function handleAdd(sheet, rows, tabName) {
       JSON.stringify({
         ok: true,
         count: addedCount,
+        results: values.map((_, i) => ({ index: i, ok: true })),
         message: `Added ${addedCount} rows to ${tabName}`,
         sheet_name: tabName,
       })
@@ -162,23 +203,7 @@ function handleUpdateRow(sheet, rowData, tabName) {
     const headers = data[0];
     const rows = data.slice(1);
 
-    const addressIndex = headers.indexOf("address");
-    const auctionNameIndex = headers.indexOf("auction_name");
-    const auctionDateIndex = headers.indexOf("auction_date");
-
-    let rowIndex = -1;
-
-    for (let i = 0; i < rows.length; i++) {
-      const row = rows[i];
-      if (
-        row[addressIndex] === rowData.address &&
-        row[auctionNameIndex] === rowData.auction_name &&
-        row[auctionDateIndex] === rowData.auction_date
-      ) {
-        rowIndex = i + 1; // Adjust for header
-        break;
-      }
-    }
+    const rowIndex = findRowIndex(sheet, headers, rows, rowData);
 
     if (rowIndex === -1) {
       return ContentService.createTextOutput(
@@ -186,44 +211,7 @@ function handleUpdateRow(sheet, rowData, tabName) {
       ).setMimeType(ContentService.MimeType.JSON);
     }
 
-    const currentRow = rows[rowIndex - 1];
-    const updatedRow = headers.map((header, i) => {
-      switch (header) {
-        case "auction_name":
-          return rowData.auction_name || "";
-        case "auction_date":
-          return rowData.auction_date || "";
-        case "address":
-          return rowData.address || "";
-        case "auction_sale":
-          return rowData.auction_sale || "";
-        case "lot_number":
-          return rowData.lot_number || "";
-        case "postcode":
-          return rowData.postcode || "";
-        case "purchase_price":
-          return rowData.purchase_price || "";
-        case "sold_date":
-          return rowData.sold_date || "";
-        case "owner":
-          return rowData.owner || "";
-        case "guide_price":
-          return rowData.guide_price || "";
-        case "auction_url":
-          return rowData.auction_url || "";
-        case "source_url":
-          return rowData.source_url || "";
-        case "qa_status":
-          return rowData.qa_status || "enriched";
-        case "added_to_potential_trades":
-          return rowData.added_to_potential_trades || "";
-        case "ingested_at":
-          return rowData.ingested_at || new Date().toISOString();
-        default:
-          return currentRow[i] || "";
-      }
-    });
-
+    const updatedRow = updatedRowValues(headers, rows[rowIndex - 1], rowData);
     const range = sheet.getRange(rowIndex + 1, 1, 1, updatedRow.length);
     range.setValues([updatedRow]);
 
@@ -243,31 +231,141 @@ function handleUpdateRow(sheet, rowData, tabName) {
   }
 }
 
-function handleDeleteRow(sheet, rowData, tabName) {
+// Sheet values of an updated row: the fields of rowData, keeping the
+// current value of property_id (if rowData has none) and unknown columns
+function updatedRowValues(headers, currentRow, rowData) {
+  return headers.map((header, i) => {
+    switch (header) {
+      case "auction_name":
+        return rowData.auction_name || "";
+      case "auction_date":
+        return rowData.auction_date || "";
+      case "address":
+        return rowData.address || "";
+      case "property_id":
+        return rowData.property_id || currentRow[i] || "";
+      case "auction_sale":
+        return rowData.auction_sale || "";
+      case "lot_number":
+        return rowData.lot_number || "";
+      case "postcode":
+        return rowData.postcode || "";
+      case "purchase_price":
+        return rowData.purchase_price || "";
+      case "sold_date":
+        return rowData.sold_date || "";
+      case "owner":
+        return rowData.owner || "";
+      case "guide_price":
+        return rowData.guide_price || "";
+      case "auction_url":
+        return rowData.auction_url || "";
+      case "source_url":
+        return rowData.source_url || "";
+      case "qa_status":
+        return rowData.qa_status || "enriched";
+      case "added_to_potential_trades":
+        return rowData.added_to_potential_trades || "";
+      case "ingested_at":
+        return rowData.ingested_at || new Date().toISOString();
+      default:
+        return currentRow[i] || "";
+    }
+  });
+}
+
+// Update many rows in one execution: the sheet is read once and each row
+// gets its own result, so one missing row does not fail the batch
+function handleUpdateRows(sheet, rows, tabName) {
   try {
-    Logger.log(`Deleting row from sheet: ${tabName}`);
+    Logger.log(`Updating ${rows.length} rows in sheet: ${tabName}`);
 
     const data = sheet.getDataRange().getValues();
     const headers = data[0];
-    const rows = data.slice(1);
+    const dataRows = data.slice(1);
 
-    const addressIndex = headers.indexOf("address");
-    const auctionNameIndex = headers.indexOf("auction_name");
-    const auctionDateIndex = headers.indexOf("auction_date");
+    const results = rows.map((rowData, index) => {
+      try {
+        const rowIndex = findRowIndex(sheet, headers, dataRows, rowData);
+        if (rowIndex === -1) {
+          return { index: index, ok: false, error: "Row not found" };
+        }
+        const updatedRow = updatedRowValues(headers, dataRows[rowIndex - 1], rowData);
+        sheet.getRange(rowIndex + 1, 1, 1, updatedRow.length).setValues([updatedRow]);
+        dataRows[rowIndex - 1] = updatedRow;
+        return { index: index, ok: true, rowIndex: rowIndex };
+      } catch (error) {
+        return { index: index, ok: false, error: error.toString() };
+      }
+    });
 
-    let rowIndex = -1;
+    const updatedCount = results.filter((result) => result.ok).length;
+    Logger.log(`Updated ${updatedCount} of ${rows.length} rows in ${tabName}`);
+
+    return ContentService.createTextOutput(
+      JSON.stringify({
+        ok: true,
+        count: updatedCount,
+        results: results,
+        sheet_name: tabName,
+      })
+    ).setMimeType(ContentService.MimeType.JSON);
+  } catch (error) {
+    Logger.log(`Error in handleUpdateRows: ${error.toString()}`);
+    return ContentService.createTextOutput(
+      JSON.stringify({ ok: false, error: error.toString() })
+    ).setMimeType(ContentService.MimeType.JSON);
+  }
+}
 
-    for (let i = 0; i < rows.length; i++) {
-      const row = rows[i];
+// Find a row by its property_id (canonical property key) plus auction, falling
+// back to address + auction for rows written before property_id existed.
+// Returns the 1-based index into the data rows (header excluded), or -1.
+function findRowIndex(sheet, headers, rows, rowData) {
+  const addressIndex = headers.indexOf("address");
+  const auctionNameIndex = headers.indexOf("auction_name");
+  const auctionDateIndex = headers.indexOf("auction_date");
+  const propertyIdIndex = headers.indexOf("property_id");
+
+  if (propertyIdIndex !== -1 && rowData.property_id && rows.length > 0) {
+    const matches = sheet
+      .getRange(2, propertyIdIndex + 1, rows.length, 1)
+      .createTextFinder(rowData.property_id)
+      .matchEntireCell(true)
+      .findAll();
+    for (const cell of matches) {
+      const i = cell.getRow() - 2;
       if (
-        row[addressIndex] === rowData.address &&
-        row[auctionNameIndex] === rowData.auction_name &&
-        row[auctionDateIndex] === rowData.auction_date
+        rows[i][auctionNameIndex] === rowData.auction_name &&
+        rows[i][auctionDateIndex] === rowData.auction_date
       ) {
-        rowIndex = i + 1; // Adjust for header
-        break;
+        return i + 1;
       }
     }
+  }
+
+  for (let i = 0; i < rows.length; i++) {
+    const row = rows[i];
+    if (
+      row[addressIndex] === rowData.address &&
+      row[auctionNameIndex] === rowData.auction_name &&
+      row[auctionDateIndex] === rowData.auction_date
+    ) {
+      return i + 1; // Adjust for header
+    }
+  }
+  return -1;
+}
+
+function handleDeleteRow(sheet, rowData, tabName) {
+  try {
+    Logger.log(`Deleting row from sheet: ${tabName}`);
+
+    const data = sheet.getDataRange().getValues();
+    const headers = data[0];
+    const rows = data.slice(1);
+
+    const rowIndex = findRowIndex(sheet, headers, rows, rowData);
 
     if (rowIndex === -1) {
       return ContentService.createTextOutput(
@@ -294,6 +392,18 @@ function handleDeleteRow(sheet, rowData, tabName) {
   }
 }
 
+// Run once by hand to add the property_id header to the existing tabs
+function migratePropertyIdHeaders() {
+  const ss = SpreadsheetApp.openById(SHEET_ID);
+  for (const tabName of [DEFAULT_TAB_NAME, "POTENTIAL_TRADES"]) {
+    const sheet = ss.getSheetByName(tabName);
+    if (sheet) {
+      ensurePropertyIdHeader(sheet);
+    }
+  }
+  return "property_id headers checked";
+}
+
 function doGet(e) {
   try {
     const ss = SpreadsheetApp.openById(SHEET_ID);
@@ -369,6 +479,7 @@ function createPotentialTradesTab() {
     // Check if POTENTIAL_TRADES tab already exists
     const existingSheet = ss.getSheetByName("POTENTIAL_TRADES");
     if (existingSheet) {
+      ensurePropertyIdHeader(existingSheet);
       Logger.log("POTENTIAL_TRADES tab already exists");
       return "POTENTIAL_TRADES tab already exists";
     }
@@ -381,6 +492,7 @@ function createPotentialTradesTab() {
       "auction_name",
       "auction_date",
       "address",
+      "property_id",
       "auction_sale",
       "lot_number",
       "postcode",
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Crash-safe journal of auction crawls
+
+Every auction a run starts is journaled with its discovered lot URLs, and
+every lot moves through the stages discovered -> extracted -> priced ->
+imported/skipped/rejected/failed as soon as it gets there. The journal is SQLite in WAL mode
+with a commit per step, so a Chromium crash or a killed process loses at
+most the lot in flight: the next run picks up unfinished auctions (even ones
+already partly in the sheet), reuses the lots already extracted or priced
+without navigating to them again, and re-extracts only lots that never made it.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+
+CRAWL_JOURNAL_PATH = os.getenv('CRAWL_JOURNAL_PATH', 'cache/crawl_journal.sqlite')
+CRAWL_JOURNAL_ENABLED = os.getenv('CRAWL_JOURNAL', 'true').lower() != 'false'
+
+# Lot stages in order; a lot only ever moves forward and keeps the first
+# terminal stage it reaches ('rejected': the sheets manager refused its row,
+# 'failed': its page could not be extracted)
+STAGES = ('discovered', 'extracted', 'priced', 'imported', 'skipped', 'rejected', 'failed')
+DONE_STAGES = ('imported', 'skipped', 'rejected', 'failed')
+
+
+def auction_key(auction):
+    """Journal key of an auction (the same name_date key the sheet dedup uses)"""
+    return f"{auction.get('name', 'Unknown')}_{auction.get('date', '')}"
+
+
+class CrawlJournal:
+    """SQLite (WAL) journal of auctions and the stage each of their lots has reached"""
+
+    def __init__(self, path=CRAWL_JOURNAL_PATH):
+        """
+        Open (or create) the journal
+
+        Args:
+            path: SQLite file (created with its directory if missing)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS auctions ("
+            " auction_key TEXT PRIMARY KEY,"
+            " auction TEXT NOT NULL,"
+            " finished INTEGER NOT NULL DEFAULT 0,"
+            " updated_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS lots ("
+            " lot_url TEXT PRIMARY KEY,"
+            " auction_key TEXT NOT NULL,"
+            " position INTEGER NOT NULL,"
+            " stage TEXT NOT NULL,"
+            " lot TEXT,"
+            " updated_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS ix_lots_auction ON lots (auction_key, position)")
+        self._db.commit()
+
+    def start_auction(self, auction):
+        """
+        Journal an auction as started (re-opening it if it was finished).
+
+        Returns:
+            The auction's journal key
+        """
+        key = auction_key(auction)
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO auctions (auction_key, auction, finished, updated_at) VALUES (?, ?, 0, ?)"
+                " ON CONFLICT(auction_key) DO UPDATE SET finished = 0, updated_at = excluded.updated_at",
+                (key, json.dumps(auction), time.time())
+            )
+            self._db.commit()
+        return key
+
+    def finish_auction(self, key):
+        """Mark an auction finished once every lot has reached a terminal stage"""
+        with self._lock:
+            self._db.execute("UPDATE auctions SET finished = 1, updated_at = ? WHERE auction_key = ?", (time.time(), key))
+            self._db.commit()
+
+    def unfinished_auctions(self):
+        """Auction dicts of every started but unfinished auction, oldest first"""
+        with self._lock:
+            rows = self._db.execute("SELECT auction FROM auctions WHERE finished = 0 ORDER BY updated_at").fetchall()
+        return [json.loads(auction) for auction, in rows]
+
+    def is_unfinished(self, auction):
+        """True if the auction was started by an earlier run and never finished"""
+        with self._lock:
+            row = self._db.execute("SELECT finished FROM auctions WHERE auction_key = ?", (auction_key(auction),)).fetchone()
+        return row is not None and not row[0]
+
+    def record_lot_urls(self, key, lot_urls):
+        """Journal an auction's discovered lot URLs (lots already journaled keep their stage)"""
+        now = time.time()
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR IGNORE INTO lots (lot_url, auction_key, position, stage, lot, updated_at)"
+                " VALUES (?, ?, ?, 'discovered', NULL, ?)",
+                [(lot_url, key, position, now) for position, lot_url in enumerate(lot_urls)]
+            )
+            self._db.commit()
+
+    def record_stage(self, lot, stage, key=None):
+        """
+        Move a lot (keyed by its source_url) forward to a stage, storing its current data.
+
+        Args:
+            lot: Lot dict
+            stage: One of STAGES
+            key: Auction key, for lots not journaled yet
+        """
+        lot_url = lot.get('source_url')
+        if not lot_url:
+            return
+        with self._lock:
+            row = self._db.execute("SELECT stage FROM lots WHERE lot_url = ?", (lot_url,)).fetchone()
+            if row is None:
+                self._db.execute(
+                    "INSERT INTO lots (lot_url, auction_key, position, stage, lot, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (lot_url, key or '', -1, stage, json.dumps(lot), time.time())
+                )
+            elif row[0] not in DONE_STAGES and STAGES.index(stage) >= STAGES.index(row[0]):
+                self._db.execute(
+                    "UPDATE lots SET stage = ?, lot = ?, updated_at = ? WHERE lot_url = ?",
+                    (stage, json.dumps(lot), time.time(), lot_url)
+                )
+            self._db.commit()
+
+    def lots(self, key):
+        """
+        Journaled lots of an auction that got past discovery.
+
+        Returns:
+            Dict of lot URL -> (stage, lot dict)
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT lot_url, stage, lot FROM lots WHERE auction_key = ? AND lot IS NOT NULL", (key,)
+            ).fetchall()
+        return {lot_url: (stage, json.loads(lot)) for lot_url, stage, lot in rows}
+
+    def open_lots(self, key):
+        """Number of an auction's journaled lots not yet in a terminal stage"""
+        placeholders = ', '.join('?' * len(DONE_STAGES))
+        with self._lock:
+            return self._db.execute(
+                f"SELECT COUNT(*) FROM lots WHERE auction_key = ? AND stage NOT IN ({placeholders})", (key, *DONE_STAGES)
+            ).fetchone()[0]
+
+    def stage(self, lot_url):
+        """Stage a lot has reached, or None if it was never journaled"""
+        with self._lock:
+            row = self._db.execute("SELECT stage FROM lots WHERE lot_url = ?", (lot_url,)).fetchone()
+        return row[0] if row else None
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_journal = None
+_journal_lock = threading.Lock()
+
+
+def get_crawl_journal():
+    """Return the process-wide CrawlJournal, or None when CRAWL_JOURNAL=false"""
+    global _journal
+    if not CRAWL_JOURNAL_ENABLED:
+        return None
+    with _journal_lock:
+        if _journal is None:
+            _journal = CrawlJournal()
+        return _journal
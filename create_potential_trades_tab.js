@@ -8,6 +8,19 @@ function createPotentialTradesTab() {
     // Check if POTENTIAL_TRADES tab already exists
     const existingSheet = ss.getSheetByName("POTENTIAL_TRADES");
     if (existingSheet) {
+      // Tabs created before property_id existed get the header added
+      const lastColumn = existingSheet.getLastColumn();
+      const headers =
+        lastColumn > 0
+          ? existingSheet.getRange(1, 1, 1, lastColumn).getValues()[0]
+          : [];
+      if (headers.length > 0 && headers.indexOf("property_id") === -1) {
+        existingSheet
+          .getRange(1, lastColumn + 1)
+          .setValue("property_id")
+          .setFontWeight("bold");
+        Logger.log("Added property_id header to POTENTIAL_TRADES");
+      }
       Logger.log("POTENTIAL_TRADES tab already exists");
       return "POTENTIAL_TRADES tab already exists";
     }
@@ -20,6 +33,7 @@ function createPotentialTradesTab() {
       "auction_name",
       "auction_date",
       "address",
+      "property_id",
       "auction_sale",
       "lot_number",
       "postcode",
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Single-round-trip DOM snapshots for Playwright pages
+
+Walking a table with query_selector_all / text_content costs one browser
+round trip per row and per cell. These helpers read a whole set of tables (or
+a list of elements) inside the page with one page.evaluate call and return
+plain JSON: cell text, tag and class, row text and the links in each row.
+
+snapshot_tables_from_html builds the same table snapshot from stored HTML,
+so parsers written against snapshots also run on saved pages.
+"""
+
+from bs4 import BeautifulSoup
+
+TABLE_SNAPSHOT_JS = """
+(selector) => Array.from(document.querySelectorAll(selector)).map(table => ({
+    classes: table.className || '',
+    rows: Array.from(table.querySelectorAll('tr')).map(tr => {
+        const firstLink = tr.querySelector('a');
+        return {
+            classes: tr.className || '',
+            text: (tr.textContent || '').trim(),
+            href: firstLink ? firstLink.getAttribute('href') : null,
+            cells: Array.from(tr.querySelectorAll('td, th')).map(cell => ({
+                tag: cell.tagName.toLowerCase(),
+                text: (cell.textContent || '').trim(),
+                classes: cell.className || ''
+            })),
+            links: Array.from(tr.querySelectorAll('a[href]')).map(a => ({
+                text: (a.textContent || '').trim(),
+                href: a.getAttribute('href')
+            }))
+        };
+    })
+}))
+"""
+
+ELEMENT_SNAPSHOT_JS = """
+(selector) => Array.from(document.querySelectorAll(selector)).map(el => ({
+    tag: el.tagName.toLowerCase(),
+    text: el.textContent || '',
+    href: el.getAttribute('href'),
+    classes: el.className || ''
+}))
+"""
+
+
+def snapshot_tables(page, selector="table"):
+    """
+    Read every table matching the selector in one round trip.
+
+    Returns:
+        List of {'classes', 'rows': [{'classes', 'text', 'href', 'cells': [{'tag', 'text', 'classes'}], 'links': [{'text', 'href'}]}]}
+    """
+    return page.evaluate(TABLE_SNAPSHOT_JS, selector)
+
+
+def snapshot_elements(page, selector):
+    """
+    Read every element matching the selector in one round trip.
+
+    Returns:
+        List of {'tag', 'text', 'href', 'classes'}
+    """
+    return page.evaluate(ELEMENT_SNAPSHOT_JS, selector)
+
+
+async def snapshot_tables_async(page, selector="table"):
+    """playwright.async_api version of snapshot_tables"""
+    return await page.evaluate(TABLE_SNAPSHOT_JS, selector)
+
+
+async def snapshot_elements_async(page, selector):
+    """playwright.async_api version of snapshot_elements"""
+    return await page.evaluate(ELEMENT_SNAPSHOT_JS, selector)
+
+
+def snapshot_tables_from_html(html, selector="table"):
+    """snapshot_tables for page HTML (e.g. a stored snapshot) instead of a live page"""
+    def classes(elem):
+        return " ".join(elem.get("class") or [])
+
+    tables = []
+    for table in BeautifulSoup(html, "lxml").select(selector):
+        rows = []
+        for tr in table.select("tr"):
+            first_link = tr.find("a")
+            rows.append({
+                'classes': classes(tr),
+                'text': tr.get_text().strip(),
+                'href': first_link.get("href") if first_link else None,
+                'cells': [{'tag': cell.name, 'text': cell.get_text().strip(), 'classes': classes(cell)}
+                          for cell in tr.find_all(["td", "th"])],
+                'links': [{'text': a.get_text().strip(), 'href': a.get("href")} for a in tr.select("a[href]")],
+            })
+        tables.append({'classes': classes(table), 'rows': rows})
+    return tables
+
+
+def table_rows_from_snapshot(tables):
+    """
+    Flatten a table snapshot into the {'cells', 'href'} rows used by
+    eig.auctions_from_table_rows (header row of each table skipped).
+    """
+    return [
+        {'cells': [cell['text'] for cell in row['cells']], 'href': row['href']}
+        for table in tables
+        for row in table['rows'][1:]
+    ]
+
+
+def first_data_cell(row):
+    """Text of the row's first <td> (None if it has none)"""
+    for cell in row['cells']:
+        if cell['tag'] == 'td':
+            return cell['text']
+    return None
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Persistent cache of English House Prices result tables
+
+Parsed EHP results pages are stored in SQLite keyed by normalized postcode, so
+lots sharing a postcode (or looked up on a previous run) do not reload
+englishhouseprices.com or pay its rate-limit waits again.
+
+Entries are fresh for EHP_CACHE_TTL_DAYS. Between that and
+EHP_CACHE_STALE_DAYS they are still served (stale-while-revalidate) and the
+postcode is queued so the caller can refresh it once the run's urgent work is
+done. Older entries count as misses.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+
+EHP_CACHE_PATH = os.getenv('EHP_CACHE_PATH', 'cache/ehp_cache.sqlite')
+EHP_CACHE_TTL_DAYS = float(os.getenv('EHP_CACHE_TTL_DAYS', '7'))
+EHP_CACHE_STALE_DAYS = float(os.getenv('EHP_CACHE_STALE_DAYS', '30'))
+
+
+def normalize_postcode(postcode):
+    """Cache key for a postcode: upper case, single space before the inward code"""
+    compact = "".join((postcode or "").split()).upper()
+    if len(compact) < 5:
+        return compact
+    return f"{compact[:-3]} {compact[-3:]}"
+
+
+class EHPCache:
+    """SQLite-backed postcode -> EHP result rows cache with TTL and stale-while-revalidate"""
+
+    def __init__(self, path=EHP_CACHE_PATH, ttl_days=EHP_CACHE_TTL_DAYS, stale_days=EHP_CACHE_STALE_DAYS):
+        """
+        Initialize the cache
+
+        Args:
+            path: SQLite file (created with its directory if missing)
+            ttl_days: Age until which an entry is fresh
+            stale_days: Age until which an expired entry is still served while it is refreshed
+        """
+        self.path = path
+        self.ttl = ttl_days * 86400
+        self.stale = max(stale_days, ttl_days) * 86400
+        self.stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'writes': 0}
+        self.pending_revalidation = set()
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS ehp_results ("
+            " postcode TEXT PRIMARY KEY,"
+            " rows TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    def get(self, postcode):
+        """
+        Look up a postcode's cached result rows.
+
+        Returns:
+            (rows, state) - state is 'fresh', 'stale' or None (rows is None on a miss)
+        """
+        key = normalize_postcode(postcode)
+        with self._lock:
+            row = self._db.execute("SELECT rows, fetched_at FROM ehp_results WHERE postcode = ?", (key,)).fetchone()
+            age = time.time() - row[1] if row else None
+
+            if row is None or age > self.stale:
+                self.stats['misses'] += 1
+                return None, None
+            if age > self.ttl:
+                self.stats['stale_hits'] += 1
+                self.pending_revalidation.add(key)
+                return json.loads(row[0]), 'stale'
+            self.stats['hits'] += 1
+            return json.loads(row[0]), 'fresh'
+
+    def put(self, postcode, rows):
+        """Store a postcode's parsed result rows (an empty list is a valid 'no sales' result)"""
+        key = normalize_postcode(postcode)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO ehp_results (postcode, rows, fetched_at) VALUES (?, ?, ?)",
+                (key, json.dumps(rows), time.time())
+            )
+            self._db.commit()
+            self.stats['writes'] += 1
+            self.pending_revalidation.discard(key)
+
+    def take_pending_revalidation(self):
+        """Return and clear the postcodes served stale since the last call"""
+        with self._lock:
+            pending, self.pending_revalidation = sorted(self.pending_revalidation), set()
+            return pending
+
+    def summary(self):
+        """One-line hit/miss summary"""
+        lookups = self.stats['hits'] + self.stats['stale_hits'] + self.stats['misses']
+        hit_rate = (self.stats['hits'] + self.stats['stale_hits']) / lookups * 100 if lookups else 0
+        return (f"EHP cache: {self.stats['hits']} hits, {self.stats['stale_hits']} stale hits, "
+                f"{self.stats['misses']} misses ({hit_rate:.0f}% hit rate), {self.stats['writes']} writes")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_ehp_cache():
+    """Return the process-wide EHPCache"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = EHPCache()
+        return _cache
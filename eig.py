@@ -1,27 +1,174 @@
-from playwright.sync_api import sync_playwright
 from datetime import datetime, timedelta
 import os
+import re
+import time
+import random
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import eig_http
+from eig_http import EIGHttpClient
+from page_pool import PagePool, DEFAULT_POOL_SIZE
+from rate_limit import get_host_limiter, get_adaptive_limiter, BlockedError
+from browser_manager import get_browser_manager, on_browser_thread, close_browser_thread
+from readiness import goto_ready, wait_ready
+from lot_rules import LOT_PAGE_RULES, GUIDE_PRICE_RULES, extract_fields, postcode_from_address
+from ehp_cache import get_ehp_cache, normalize_postcode
+from price_paid import get_price_paid_index
+from address_matching import AddressIndex, ResultsIndex, property_id
+from lot_triage import triage_lot, should_run, get_triage_stats, classify_outcome, outcome_needs
+from recheck_queue import get_recheck_queue
+from catalogue_pdf import apply_catalogue_guide_prices
+from crawl_journal import get_crawl_journal, auction_key, DONE_STAGES
+from lot_membership import get_ingested_lots
+from snapshot_store import get_snapshot_store, snapshot_page
+from lot_parser import parse_lot_pages
+from pipeline import Pipeline, Stage
+from sheet_writer import SHEET_BATCH_SIZE
+from dom_snapshot import snapshot_tables, snapshot_elements, snapshot_tables_from_html, table_rows_from_snapshot, first_data_cell
 
-def find_auctions(start_date: str, end_date: str):
+
+def auctions_from_table_rows(table_rows, source_url):
+    """
+    Turn results-table rows into auction dicts, keeping auctions from 3-12 months ago.
+    
+    Args:
+        table_rows: List of dicts with 'cells' (cell texts) and 'href' (first link in the row)
+        source_url: URL of the results page the rows came from
+        
+    Returns:
+        List of auction dicts
+    """
     auctions = []
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        
-        # Check if session file exists, otherwise create context without it
-        session_file = "sessions/eig.json"
-        if os.path.exists(session_file):
-            print("Using existing session file for authentication")
-            context = browser.new_context(storage_state=session_file)
-        else:
-            print("No session file found, creating new context")
-            context = browser.new_context()
+    for j, row in enumerate(table_rows, 1):
+        cells = row['cells']
+        if len(cells) < 6:  # Expecting Date, Venue, Lots Offered, Lots Sold, Percent Sold, Total Raised
+            continue
+        date_cell, venue_cell, lots_offered_cell, lots_sold_cell, percent_sold_cell, total_raised_cell = cells[:6]
+        
+        print(f"  Row {j}: {date_cell} | {venue_cell} | {lots_offered_cell} | {lots_sold_cell} | {percent_sold_cell} | {total_raised_cell}")
+        
+        # Try to parse the date
+        try:
+            # Handle different date formats
+            if "/" in date_cell:
+                auction_date = datetime.strptime(date_cell, "%d/%m/%Y")
+            else:
+                auction_date = datetime.strptime(date_cell, "%d %B %Y")
+            
+            # Check if auction date is in the past (not future)
+            today = datetime.now()
+            if auction_date > today:
+                # Skip future auctions
+                continue
+            
+            # Check if date is in range (3-12 months ago)
+            three_months_ago = today - timedelta(days=90)
+            twelve_months_ago = today - timedelta(days=365)
             
-        page = context.new_page()
+            if twelve_months_ago <= auction_date <= three_months_ago:
+                # Try to get the detail URL from the date cell
+                detail_url = eig_http.absolute_url(row.get('href')) if row.get('href') else None
+                
+                auctions.append({
+                    "name": "Auction House London",  # Add auction name
+                    "date": auction_date.strftime("%Y-%m-%d"),
+                    "venue": venue_cell,
+                    "lots_offered": lots_offered_cell,
+                    "lots_sold": lots_sold_cell,
+                    "percent_sold": percent_sold_cell,
+                    "total_raised": total_raised_cell,
+                    "source_url": source_url,
+                    "detail_url": detail_url
+                })
+                print(f"  ✅ Added auction for {auction_date.strftime('%Y-%m-%d')} with detail URL: {detail_url}")
+            else:
+                # Date is outside our 3-12 month range
+                if auction_date < twelve_months_ago:
+                    print(f"  ⏭️ Skipped auction {auction_date.strftime('%Y-%m-%d')} - too old (>12 months)")
+                elif auction_date > three_months_ago:
+                    print(f"  ⏭️ Skipped auction {auction_date.strftime('%Y-%m-%d')} - too recent (<3 months)")
+                    
+        except Exception as e:
+            print(f"  ❌ Error parsing date '{date_cell}': {e}")
+            continue
+    
+    return auctions
+
+
+def auctions_from_links(link_items, start_date, end_date):
+    """
+    Turn "Auction House London - <date>" links into auction dicts within the date range.
+    
+    Args:
+        link_items: List of (text, href) tuples
+        start_date: Start date in YYYY-MM-DD format
+        end_date: End date in YYYY-MM-DD format
+        
+    Returns:
+        List of auction dicts
+    """
+    auctions = []
+    for text, url in link_items:
+        if text and "Auction House London" in text:
+            date_text = text.split(" - ")[-1]
+            try:
+                auction_date = datetime.strptime(date_text, "%d %B %Y")
+                if datetime.strptime(start_date, "%Y-%m-%d") <= auction_date <= datetime.strptime(end_date, "%Y-%m-%d"):
+                    auctions.append({
+                        "name": text,
+                        "url": "https://www.eigpropertyauctions.co.uk" + url,
+                        "date": auction_date.strftime("%Y-%m-%d")
+                    })
+            except Exception as e:
+                print(f"Error parsing date '{date_text}': {e}")
+                continue
+    return auctions
+
+
+def find_auctions_http(start_date: str, end_date: str):
+    """
+    Find auctions by fetching the results page over plain HTTP.
+    
+    Returns:
+        List of auction dicts, or None if the page needs the browser
+        (login redirect or client-side rendering)
+    """
+    print("Fetching EIG auction results over HTTP...")
+    with EIGHttpClient() as client:
+        html, url = client.get_results_page()
+    
+    if html is None or eig_http.page_needs_javascript(html):
+        return None
+    
+    table_rows = eig_http.parse_results_table_rows(html)
+    if not table_rows:
+        print("No results table in the HTTP response")
+        return None
+    
+    print(f"Found {len(table_rows)} result rows over HTTP")
+    auctions = auctions_from_table_rows(table_rows, url)
+    auctions.extend(auctions_from_links(eig_http.parse_auction_links(html), start_date, end_date))
+    return auctions
+
+
+def find_auctions(start_date: str, end_date: str):
+    auctions = find_auctions_http(start_date, end_date)
+    if auctions is not None:
+        print(f"Found {len(auctions)} auctions in date range")
+        return auctions
+    
+    print("⚠️ Results page needs a browser, falling back to Playwright")
+    return find_auctions_browser(start_date, end_date)
 
+@on_browser_thread
+def find_auctions_browser(start_date: str, end_date: str):
+    """Read the auction results page in the shared browser"""
+    auctions = []
+    page = get_browser_manager().new_page('eig')
+    try:
         print(f"Navigating to EIG auction results...")
         # Navigate to the specific auctioneer results page that was working before
-        page.goto("https://www.eigpropertyauctions.co.uk/clients/auctions/results?SelectedAuctioneerId=680")
-        page.wait_for_timeout(3000)
+        goto_ready(page, "https://www.eigpropertyauctions.co.uk/clients/auctions/results?SelectedAuctioneerId=680", 'eig_results')
 
         print("Page title:", page.title())
         print("Page URL:", page.url)
@@ -40,8 +187,7 @@ def find_auctions(start_date: str, end_date: str):
             for alt_url in alternative_urls:
                 try:
                     print(f"Trying alternative URL: {alt_url}")
-                    page.goto(alt_url)
-                    page.wait_for_timeout(3000)
+                    goto_ready(page, alt_url, 'eig_results')
                     print(f"Page title: {page.title()}")
                     
                     if "login" not in page.title().lower():
@@ -65,7 +211,7 @@ def find_auctions(start_date: str, end_date: str):
         links = []
         for selector in selectors_to_try:
             try:
-                links = page.query_selector_all(selector)
+                links = snapshot_elements(page, selector)
                 if links:
                     print(f"Found {len(links)} links with selector: {selector}")
                     break
@@ -75,24 +221,14 @@ def find_auctions(start_date: str, end_date: str):
 
         if not links:
             print("No auction links found. Let's see what links are available:")
-            all_links = page.query_selector_all("a")
+            all_links = snapshot_elements(page, "a")
             for i, link in enumerate(all_links[:10]):  # Show first 10 links
-                try:
-                    href = link.get_attribute("href")
-                    text = link.text_content()
-                    print(f"Link {i}: {text} -> {href}")
-                except:
-                    pass
+                print(f"Link {i}: {link['text']} -> {link['href']}")
 
         # Debug: Show what auction links we found
         print(f"\nFound {len(links)} auction links. Let's see what they contain:")
         for i, link in enumerate(links[:10]):  # Show first 10 links
-            try:
-                text = link.text_content().strip()
-                href = link.get_attribute("href")
-                print(f"Auction link {i}: '{text}' -> {href}")
-            except Exception as e:
-                print(f"Error reading link {i}: {e}")
+            print(f"Auction link {i}: '{link['text'].strip()}' -> {link['href']}")
 
         # Let's also look for auction results in different ways
         print("\nLooking for auction results in different ways...")
@@ -113,16 +249,12 @@ def find_auctions(start_date: str, end_date: str):
         
         for selector in result_selectors:
             try:
-                results = page.query_selector_all(selector)
+                results = snapshot_elements(page, selector)
                 if results:
                     print(f"Found {len(results)} elements with selector: {selector}")
                     # Show first few results
                     for i, result in enumerate(results[:3]):
-                        try:
-                            text = result.text_content()
-                            print(f"  Result {i}: {text[:100]}...")
-                        except:
-                            pass
+                        print(f"  Result {i}: {result['text'][:100]}...")
             except Exception as e:
                 print(f"Selector {selector} failed: {e}")
 
@@ -148,148 +280,427 @@ def find_auctions(start_date: str, end_date: str):
 
         # Try to parse auction data from the page content
         try:
-            # Look for table data or structured content
-            tables = page.query_selector_all("table")
+            # Look for table data or structured content (all tables in one round trip)
+            tables = snapshot_tables(page)
             print(f"Found {len(tables)} tables on the page")
-            
             for i, table in enumerate(tables):
-                try:
-                    rows = table.query_selector_all("tr")
-                    print(f"Table {i} has {len(rows)} rows")
-                    
-                    # Skip header row and process data rows
-                    for j, row in enumerate(rows[1:], 1):  # Start from index 1 to skip header
-                        try:
-                            cells = row.query_selector_all("td, th")
-                            if len(cells) >= 6:  # Expecting Date, Venue, Lots Offered, Lots Sold, Percent Sold, Total Raised
-                                date_cell = cells[0].text_content().strip()
-                                venue_cell = cells[1].text_content().strip()
-                                lots_offered_cell = cells[2].text_content().strip()
-                                lots_sold_cell = cells[3].text_content().strip()
-                                percent_sold_cell = cells[4].text_content().strip()
-                                total_raised_cell = cells[5].text_content().strip()
-                                
-                                print(f"  Row {j}: {date_cell} | {venue_cell} | {lots_offered_cell} | {lots_sold_cell} | {percent_sold_cell} | {total_raised_cell}")
-                                
-                                # Try to parse the date
-                                try:
-                                    # Handle different date formats
-                                    if "/" in date_cell:
-                                        auction_date = datetime.strptime(date_cell, "%d/%m/%Y")
-                                    else:
-                                        auction_date = datetime.strptime(date_cell, "%d %B %Y")
-                                    
-                                    # Check if auction date is in the past (not future)
-                                    today = datetime.now()
-                                    if auction_date > today:
-                                        # Skip future auctions
-                                        continue
-                                    
-                                    # Check if date is in range (3-12 months ago)
-                                    three_months_ago = today - timedelta(days=90)
-                                    twelve_months_ago = today - timedelta(days=365)
-                                    
-                                    if twelve_months_ago <= auction_date <= three_months_ago:
-                                        # Try to get the detail URL from the date cell
-                                        date_link = row.query_selector("a")
-                                        detail_url = None
-                                        if date_link:
-                                            href = date_link.get_attribute("href")
-                                            if href:
-                                                if href.startswith("/"):
-                                                    detail_url = "https://www.eigpropertyauctions.co.uk" + href
-                                                else:
-                                                    detail_url = href
-                                        
-                                        auctions.append({
-                                            "name": "Auction House London",  # Add auction name
-                                            "date": auction_date.strftime("%Y-%m-%d"),
-                                            "venue": venue_cell,
-                                            "lots_offered": lots_offered_cell,
-                                            "lots_sold": lots_sold_cell,
-                                            "percent_sold": percent_sold_cell,
-                                            "total_raised": total_raised_cell,
-                                            "source_url": page.url,
-                                            "detail_url": detail_url
-                                        })
-                                        print(f"  ✅ Added auction for {auction_date.strftime('%Y-%m-%d')} with detail URL: {detail_url}")
-                                    else:
-                                        # Date is outside our 3-12 month range
-                                        if auction_date < twelve_months_ago:
-                                            print(f"  ⏭️ Skipped auction {auction_date.strftime('%Y-%m-%d')} - too old (>12 months)")
-                                        elif auction_date > three_months_ago:
-                                            print(f"  ⏭️ Skipped auction {auction_date.strftime('%Y-%m-%d')} - too recent (<3 months)")
-                                            
-                                except Exception as e:
-                                    print(f"  ❌ Error parsing date '{date_cell}': {e}")
-                                    continue
-                                    
-                        except Exception as e:
-                            print(f"Error processing row {j}: {e}")
-                            
-                except Exception as e:
-                    print(f"Error processing table {i}: {e}")
+                print(f"Table {i} has {len(table['rows'])} rows")
+            
+            auctions.extend(auctions_from_table_rows(table_rows_from_snapshot(tables), page.url))
                     
         except Exception as e:
             print(f"Error looking for tables: {e}")
 
-        for link in links:
-            try:
-                text = link.text_content()
-                if text and "Auction House London" in text:
-                    url = link.get_attribute("href")
-                    date_text = text.split(" - ")[-1]
-                    try:
-                        auction_date = datetime.strptime(date_text, "%d %B %Y")
-                        if datetime.strptime(start_date, "%Y-%m-%d") <= auction_date <= datetime.strptime(end_date, "%Y-%m-%d"):
-                            auctions.append({
-                                "name": text,
-                                "url": "https://www.eigpropertyauctions.co.uk" + url,
-                                "date": auction_date.strftime("%Y-%m-%d")
-                            })
-                    except Exception as e:
-                        print(f"Error parsing date '{date_text}': {e}")
-                        continue
-            except Exception as e:
-                print(f"Error processing link: {e}")
-                continue
-
-        context.close()
-        browser.close()
+        link_items = [(link['text'], link['href']) for link in links]
+        auctions.extend(auctions_from_links(link_items, start_date, end_date))
+    finally:
+        page.close()
     
     print(f"Found {len(auctions)} auctions in date range")
     return auctions
 
 
-def parse_event_days(event_url: str, auction_name: str = "", auction_date: str = ""):
-    lots = []
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        
-        # Check if session file exists, otherwise create context without it
-        session_file = "sessions/eig.json"
-        if os.path.exists(session_file):
-            context = browser.new_context(storage_state=session_file)
+def basic_lot_data(lot_index, lot_url, auction_name, auction_date):
+    """Placeholder lot row for lots whose page could not be extracted"""
+    return {
+        'address': f"Unknown Address - Lot {lot_index}",
+        'purchase_price': '',
+        'sale_date': '',
+        'lot_number': str(lot_index),
+        'auction_sale': '',
+        'postcode': '',
+        'source_url': lot_url,
+        'auction_name': auction_name,
+        'auction_date': auction_date,
+        'property_prices_status': 'extraction_failed',
+        'property_prices_postcode': '',
+        'property_prices_sale_date': '',
+        'property_prices_sale_price': '',
+        'searchland_status': 'pending'
+    }
+
+
+def assign_property_ids(lots):
+    """
+    Give every lot its canonical property_id, computed once here at ingestion
+    and carried on the sheet row for later joins (placeholder lots and lots
+    without a postcode get '', and are matched on their address instead).
+    """
+    for lot in lots:
+        if lot.get('property_id') is None:
+            has_address = lot.get('address') and lot.get('property_prices_status') != 'extraction_failed'
+            lot['property_id'] = property_id(lot['address'], lot.get('postcode')) if has_address else ''
+    return lots
+
+def lot_from_catalogue(entry, auction_name, auction_date):
+    """
+    Lot dict built from an auction catalogue listing entry alone.
+
+    Returns:
+        The lot, or None when the listing lacks something only the lot page has
+        (address with postcode, sale result, or a guide price the triage still wants)
+    """
+    if not entry['address'] or not entry['postcode'] or not entry['auction_sale']:
+        return None
+    if not entry['guide_price'] and outcome_needs(classify_outcome(entry['auction_sale']), 'catalogue'):
+        return None
+
+    lot = {
+        'lot_number': entry['lot_number'],
+        'address': entry['address'],
+        'auction_sale': entry['auction_sale'],
+        'guide_price': entry['guide_price'],
+        'purchase_price': '',
+        'sale_date': '',
+        'postcode': entry['postcode'],
+        'found_in_prices': False,
+        'auction_name': auction_name,
+        'auction_date': auction_date,
+        'source_url': entry['lot_url'],
+    }
+    if not lot['guide_price']:
+        should_run(lot, 'catalogue')  # Counts the catalogue click the triage saved
+    return lot
+
+
+def merge_catalogue_entry(lot_data, entry):
+    """
+    Fold a catalogue listing entry into a lot extracted from its page: the
+    listing's lot number, address and result win, the page fills the gaps.
+    """
+    if lot_data.get('property_prices_status') == 'extraction_failed':
+        return lot_data
+    for field in ('lot_number', 'address', 'postcode', 'auction_sale'):
+        if entry.get(field):
+            lot_data[field] = entry[field]
+    if not lot_data.get('guide_price'):
+        lot_data['guide_price'] = entry.get('guide_price')
+    return lot_data
+
+
+def split_catalogue(catalogue, auction_name, auction_date):
+    """
+    Build the lots the catalogue listing fully describes.
+
+    Returns:
+        (lots_by_index, pending) - lots keyed by catalogue position, and the
+        positions whose lot page still has to be opened
+    """
+    lots_by_index = {}
+    pending = []
+    for i, entry in enumerate(catalogue):
+        lot = lot_from_catalogue(entry, auction_name, auction_date)
+        if lot:
+            lots_by_index[i] = lot
         else:
-            context = browser.new_context()
+            pending.append(i)
+    print(f"📚 Catalogue listing covered {len(lots_by_index)}/{len(catalogue)} lots; "
+          f"{len(pending)} lot pages to open")
+    return lots_by_index, pending
+
+
+def journal_lot(journal_key, lot, stage='extracted'):
+    """
+    Record a lot's stage in the crawl journal (no-op without a journal key).
+    Failed extractions are journaled as 'failed', a terminal stage, so their
+    placeholder rows do not keep the auction open forever.
+    """
+    journal = get_crawl_journal() if journal_key else None
+    if journal:
+        failed = lot.get('property_prices_status') == 'extraction_failed'
+        journal.record_stage(lot, 'failed' if failed else stage, journal_key)
+
+
+def resume_from_journal(journal_key, lot_urls, lots_by_index, pending):
+    """
+    Journal an auction's lot URLs and take the lots an earlier run already
+    extracted from the journal instead of opening their pages again.
+    
+    Args:
+        journal_key: Auction key in the crawl journal (None to skip journaling)
+        lot_urls: The auction's lot URLs in catalogue order
+        lots_by_index: Lots built so far, keyed by position (updated in place)
+        pending: Positions whose lot page still has to be opened
+        
+    Returns:
+        The positions still to open
+    """
+    journal = get_crawl_journal() if journal_key else None
+    if journal is None:
+        return pending
+    journal.record_lot_urls(journal_key, lot_urls)
+    journaled = journal.lots(journal_key)
+    resumed = {i for i, lot_url in enumerate(lot_urls) if lot_url in journaled}
+    for i in resumed:
+        lots_by_index[i] = journaled[lot_urls[i]][1]
+    for i, lot in lots_by_index.items():
+        if i not in resumed:
+            journal.record_stage(lot, 'extracted', journal_key)
+    if resumed:
+        print(f"📒 Resumed {len(resumed)} lots from the crawl journal")
+    return [i for i in pending if i not in resumed]
+
+
+def skip_ingested_lots(journal_key, lot_urls, lots_by_index, pending):
+    """
+    Drop lots already ingested into the sheet before any lot page is opened,
+    so a partly processed or re-published auction only costs navigations for
+    its new lots.
+    
+    Returns:
+        The positions still to open
+    """
+    ingested = get_ingested_lots()
+    if ingested is None:
+        return pending
+    skipped = {i for i, lot_url in enumerate(lot_urls) if lot_url in ingested}
+    journal = get_crawl_journal() if journal_key else None
+    for i in skipped:
+        lots_by_index.pop(i, None)
+        if journal:
+            journal.record_stage({'source_url': lot_urls[i]}, 'imported', journal_key)
+    if skipped:
+        print(f"⏭️ {len(skipped)} lots are already in the sheet, not opening them")
+    return [i for i in pending if i not in skipped]
+
+
+def make_lot_page_handler(auction_results, auction_name, auction_date, total_lots, catalogue_guides=None,
+                          journal_key=None):
+    """
+    Build the PagePool handler that extracts one loaded lot page.
+    
+    catalogue_guides (lot number -> guide price from the catalogue PDF) is
+    passed on so lot pages skip opening their catalogue entry; with a
+    journal_key every extracted lot is journaled as soon as it is read.
+    
+    Returns:
+        Callable (page, index, url) -> lot dict (basic data if extraction failed)
+    """
+    def handle_lot_page(lot_page, i, lot_url):
+        print(f"Processing lot {i+1}/{total_lots}: {lot_url}")
+        snapshot_page(lot_url, lot_page.content(), 'lot')
+        
+        # Extract lot data - pass the auction results for price_bought lookup
+        # (English House Prices lookups are batched by postcode afterwards)
+        lot_data = extract_lot_data_from_page(lot_page, i + 1, auction_results, lookup_prices=False,
+                                              catalogue_guides=catalogue_guides)
+        
+        # Always add the lot data, even if property prices lookup failed
+        if lot_data:
+            # Add auction metadata
+            lot_data['auction_name'] = auction_name
+            lot_data['auction_date'] = auction_date
+            lot_data['source_url'] = lot_url
             
-        page = context.new_page()
+            if i < 5:  # Show first 5 lots for debugging
+                print(f"  ✅ Lot {i+1}: {lot_data.get('address', 'No address')} - {lot_data.get('purchase_price', 'No price')}")
+            journal_lot(journal_key, lot_data)
+            return lot_data
+        
+        # If extract_lot_data_from_page returns None, create basic lot data
+        print(f"  ⚠️ Lot {i+1}: extract_lot_data_from_page returned None, creating basic data")
+        print(f"  📝 Lot {i+1}: Created basic data due to extraction failure")
+        return basic_lot_data(i + 1, lot_url, auction_name, auction_date)
+    
+    return handle_lot_page
+
+
+def open_auction_crawl(detail_html, catalogue, auction_name="", auction_date="", catalogue_guides=None,
+                       journal_key=None, auction=None):
+    """
+    State shared by the lots of one auction being crawled.
+    
+    Args:
+        detail_html: Auction detail page HTML (the auction date is read from it if not given)
+        catalogue: Entries from eig_http.parse_auction_catalogue
+        auction_name: Auction name to record on each lot
+        auction_date: Auction date to record on each lot
+        catalogue_guides: Lot number -> guide price from the catalogue PDFs, or None
+        journal_key: Auction key in the crawl journal
+        auction: Auction dict from find_auctions, when crawling from the workflow
         
+    Returns:
+        Dict with the auction, its name, date, catalogue, lot_urls, auction_results
+        index, catalogue_guides and journal_key
+    """
+    auction_name = auction_name or "Auction House London"  # Default fallback
+    auction_date = auction_date or eig_http.extract_auction_date(detail_html or "")
+    auction_results = results_index_from_catalogue(catalogue)
+    print(f"    ✅ Indexed {len(auction_results)} auction results rows")
+    print(f"  Using auction name: '{auction_name}'")
+    print(f"  Using auction date: '{auction_date}'")
+    print(f"Extracted {len(catalogue)} lot URLs")
+    return {
+        'auction': auction or {'name': auction_name, 'date': auction_date},
+        'auction_name': auction_name,
+        'auction_date': auction_date,
+        'catalogue': catalogue,
+        'lot_urls': [entry['lot_url'] for entry in catalogue],
+        'auction_results': auction_results,
+        'catalogue_guides': catalogue_guides,
+        'journal_key': journal_key,
+    }
+
+
+def plan_auction_lots(crawl):
+    """
+    Work out which lots of an auction still need their page opened: lots the
+    catalogue listing describes, lots an earlier run journaled and lots already
+    in the sheet need none.
+    
+    Returns:
+        (lots_by_index, pending) as from split_catalogue
+    """
+    lots_by_index, pending = split_catalogue(crawl['catalogue'], crawl['auction_name'], crawl['auction_date'])
+    pending = resume_from_journal(crawl['journal_key'], crawl['lot_urls'], lots_by_index, pending)
+    pending = skip_ingested_lots(crawl['journal_key'], crawl['lot_urls'], lots_by_index, pending)
+    return lots_by_index, pending
+
+
+def finish_parsed_lot(crawl, i, lot_data):
+    """Auction metadata and catalogue fields for a lot parsed from its page HTML, journaled at once"""
+    lot_data['auction_name'] = crawl['auction_name']
+    lot_data['auction_date'] = crawl['auction_date']
+    lot_data['source_url'] = crawl['lot_urls'][i]
+    lot_data = merge_catalogue_entry(lot_data, crawl['catalogue'][i])
+    journal_lot(crawl['journal_key'], lot_data)
+    return lot_data
+
+
+def finish_browser_lot(crawl, i, lot_data):
+    """Catalogue fields for a lot read in the browser (basic data if that failed), journaled at once"""
+    lot_data = lot_data or basic_lot_data(i + 1, crawl['lot_urls'][i], crawl['auction_name'], crawl['auction_date'])
+    lot_data = merge_catalogue_entry(lot_data, crawl['catalogue'][i])
+    journal_lot(crawl['journal_key'], lot_data)
+    return lot_data
+
+
+def crawl_lot_page_handler(crawl):
+    """make_lot_page_handler for the lots of a crawl"""
+    return make_lot_page_handler(crawl['auction_results'], crawl['auction_name'], crawl['auction_date'],
+                                 len(crawl['lot_urls']), crawl['catalogue_guides'], crawl['journal_key'])
+
+
+def fetch_lot_over_http(client, limiter, lot_url, i, total_lots):
+    """
+    Fetch one lot page over HTTP within the per-host request ceiling
+    (parsing is left to lot_parser.parse_lot_pages).
+    
+    Returns:
+        Lot page HTML, or None if the lot needs the browser
+    """
+    with limiter.slot(lot_url):
+        print(f"Fetching lot {i+1}/{total_lots}: {lot_url}")
+        lot_html, _ = client.get_lot_page(lot_url)
+    
+    if lot_html and not eig_http.page_needs_javascript(lot_html):
+        return lot_html
+    return None
+
+
+def parse_event_days(event_url: str, auction_name: str = "", auction_date: str = "", concurrency: int = DEFAULT_POOL_SIZE,
+                     lookup_prices: bool = True, journal_key: str = None):
+    """
+    Extract every lot of an auction.
+    
+    The auction detail page and lot pages are fetched over plain HTTP, up to
+    `concurrency` lots at a time within the per-host request ceiling. A browser
+    is only used for lots whose page needs JavaScript (crawled through a
+    PagePool) and for the English House Prices lookups. If the detail page
+    itself needs JavaScript the whole auction goes through parse_event_days_browser.
+    
+    Args:
+        event_url: Auction detail page URL
+        auction_name: Auction name to record on each lot
+        auction_date: Auction date to record on each lot (read from the page if empty)
+        concurrency: Number of lots fetched at the same time
+        lookup_prices: Look the lots up in English House Prices (one page per postcode);
+                       False when the caller batches the lookups for a whole run
+        journal_key: Auction key in the crawl journal; lots already extracted by an
+                     earlier run are reused and new ones are journaled as they are read
+    """
+    with EIGHttpClient() as client:
+        print(f"Fetching auction details over HTTP: {event_url}")
+        detail_html, detail_url = client.get_auction_detail(event_url)
+        catalogue = eig_http.parse_auction_catalogue(detail_html) if detail_html else []
+        
+        if not catalogue:
+            print("⚠️ Auction detail page needs a browser, falling back to Playwright")
+            return parse_event_days_browser(event_url, auction_name, auction_date, concurrency, lookup_prices, journal_key)
+        
+        # Phase 0: lots the catalogue listing already describes need no lot page
+        catalogue_guides = apply_catalogue_guide_prices(detail_html, catalogue, client)
+        crawl = open_auction_crawl(detail_html, catalogue, auction_name, auction_date, catalogue_guides, journal_key)
+        lots_by_index, pending = plan_auction_lots(crawl)
+        lot_urls = crawl['lot_urls']
+        
+        # Phase 1: fetch the remaining lot pages over HTTP, several at a time
+        limiter = get_host_limiter()
+        fetched = {}  # index -> lot page HTML
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            futures = [
+                executor.submit(fetch_lot_over_http, client, limiter, lot_urls[i], i, len(lot_urls))
+                for i in pending
+            ]
+            for i, future in zip(pending, futures):
+                try:
+                    fetched[i] = future.result()
+                except Exception as e:
+                    print(f"    ⚠️ Error fetching lot {i+1}: {e}")
+                    fetched[i] = None
+    
+    # ... and parse them on the lot parser's process pool
+    parsed_indexes = [i for i in pending if fetched[i]]
+    parsed = dict(zip(parsed_indexes, parse_lot_pages([(fetched[i], i + 1, lot_urls[i]) for i in parsed_indexes])))
+    browser_lots = []  # (index, lot_url) pairs that need the browser
+    for i in pending:
+        lot_data = parsed.get(i)
+        if lot_data is None:
+            print(f"    ⚠️ Lot {i+1} needs the browser")
+            browser_lots.append((i, lot_urls[i]))
+        else:
+            lots_by_index[i] = finish_parsed_lot(crawl, i, lot_data)
+    
+    # Phase 2: the shared browser for JavaScript-only lots
+    if browser_lots:
+        browser_results = crawl_browser_lots(crawl, browser_lots, concurrency)
+        for position, (i, lot_url) in enumerate(browser_lots):
+            if position in browser_results:
+                lots_by_index[i] = finish_browser_lot(crawl, i, browser_results[position])
+    
+    lots = [lots_by_index[i] for i in sorted(lots_by_index)]
+    
+    # Phase 3: English House Prices, one results page per distinct postcode
+    assign_property_ids(lots)
+    if lookup_prices and lots:
+        lookup_prices_for_lots(lots)
+    
+    print(f"Successfully extracted {len(lots)} lots from auction")
+    return lots
+
+
+@on_browser_thread
+def crawl_browser_lots(crawl, browser_lots, concurrency=DEFAULT_POOL_SIZE):
+    """Load (index, lot_url) pairs on a PagePool of the shared browser; returns position -> lot data"""
+    pool = PagePool(get_browser_manager().context('eig'), size=concurrency)
+    handler = crawl_lot_page_handler(crawl)
+    try:
+        return pool.crawl([lot_url for _, lot_url in browser_lots],
+                          lambda page, position, lot_url: handler(page, browser_lots[position][0], lot_url))
+    finally:
+        pool.close()
+
+@on_browser_thread
+def parse_event_days_browser(event_url: str, auction_name: str = "", auction_date: str = "", concurrency: int = DEFAULT_POOL_SIZE,
+                             lookup_prices: bool = True, journal_key: str = None):
+    """Browser-only version of parse_event_days for auction pages that need JavaScript"""
+    lots = []
+    manager = get_browser_manager()
+    page = manager.new_page('eig')
+    try:
         # Navigate to the auction details page
         print(f"Navigating to auction details: {event_url}")
-        page.goto(event_url)
-        page.wait_for_timeout(3000)
-        
-        # First, extract the auction results table to get price_bought data
-        print("Extracting auction results table...")
-        auction_results = extract_auction_results_table(page)
-        print(f"Extracted auction results: {auction_results}")
-        print(f"Debug: auction_results type: {type(auction_results)}")
-        if isinstance(auction_results, dict):
-            print(f"Debug: auction_results keys: {list(auction_results.keys())}")
-        elif isinstance(auction_results, list):
-            print(f"Debug: auction_results length: {len(auction_results)}")
-            print(f"Debug: first few auction URLs: {auction_results[:3]}")
+        goto_ready(page, event_url, 'eig_auction_detail')
         
         print(f"Page title: {page.title()}")
         print(f"Page URL: {page.url}")
@@ -311,7 +722,6 @@ def parse_event_days(event_url: str, auction_name: str = "", auction_date: str =
                 # If still no date, try to extract from page content
                 if not auction_date:
                     page_text = page.locator("body").text_content()
-                    import re
                     date_patterns = [
                         r'\d{1,2}/\d{1,2}/\d{4}',
                         r'\d{1,2}\s+\w+\s+\d{4}',
@@ -329,97 +739,65 @@ def parse_event_days(event_url: str, auction_name: str = "", auction_date: str =
         print(f"  Using auction name: '{auction_name}'")
         print(f"  Using auction date: '{auction_date}'")
         
-        # Look for lot URLs - these are the individual property listings
-        print("Looking for lot URLs...")
-        lot_urls = []
-        
-        # Find all links that contain '/lot/' in their href
-        lot_links = page.query_selector_all("a[href*='/lot/']")
-        print(f"Found {len(lot_links)} lot links")
-        
-        for link in lot_links:
-            try:
-                href = link.get_attribute("href")
-                if href and "/lot/" in href:
-                    # Make sure it's a full URL
-                    if href.startswith("/"):
-                        href = "https://www.eigpropertyauctions.co.uk" + href
-                    lot_urls.append(href)
-            except Exception as e:
-                print(f"Error extracting lot URL: {e}")
-                continue
+        # Read the lot index from the catalogue listing in one pass
+        detail_html = page.content()
+        snapshot_page(event_url, detail_html, 'listing')
+        catalogue = eig_http.parse_auction_catalogue(detail_html)
+        lot_urls = [entry['lot_url'] for entry in catalogue]
+        catalogue_guides = None
+        auction_results = results_index_from_catalogue(catalogue)
+        print(f"Indexed {len(auction_results)} auction results rows")
+        if catalogue:
+            with EIGHttpClient() as client:
+                catalogue_guides = apply_catalogue_guide_prices(detail_html, catalogue, client)
+            lots_by_index, pending = split_catalogue(catalogue, auction_name, auction_date)
         
-        print(f"Extracted {len(lot_urls)} lot URLs")
+        # Look for lot URLs - these are the individual property listings
+        if not lot_urls:
+            print("Looking for lot URLs...")
         
-        # Process each lot URL to get property data
-        for i, lot_url in enumerate(lot_urls):  # Process ALL lots
-            try:
-                print(f"Processing lot {i+1}/{len(lot_urls)}: {lot_url}")
-                
-                # Navigate to the lot page with better error handling
-                lot_page = context.new_page()
+            
+            # Find all links that contain '/lot/' in their href
+            lot_links = page.query_selector_all("a[href*='/lot/']")
+            print(f"Found {len(lot_links)} lot links")
+            
+            for link in lot_links:
                 try:
-                    lot_page.goto(lot_url, wait_until="networkidle", timeout=30000)
-                    lot_page.wait_for_timeout(2000)
+                    href = link.get_attribute("href")
+                    if href and "/lot/" in href:
+                        # Make sure it's a full URL
+                        if href.startswith("/"):
+                            href = "https://www.eigpropertyauctions.co.uk" + href
+                        lot_urls.append(href)
                 except Exception as e:
-                    print(f"    ⚠️ Error navigating to lot page: {e}")
-                    lot_page.close()
+                    print(f"Error extracting lot URL: {e}")
                     continue
-                
-                # Extract lot data - pass the auction results for price_bought lookup
-                lot_data = extract_lot_data_from_page(lot_page, i + 1, auction_results)
-                
-                # Always add the lot data, even if property prices lookup failed
-                if lot_data:
-                    # Add auction metadata
-                    lot_data['auction_name'] = auction_name
-                    lot_data['auction_date'] = auction_date
-                    lot_data['source_url'] = lot_url
-                    
-                    lots.append(lot_data)
-                    
-                    if i < 5:  # Show first 5 lots for debugging
-                        print(f"  ✅ Lot {i+1}: {lot_data.get('address', 'No address')} - {lot_data.get('purchase_price', 'No price')}")
-                else:
-                    # If extract_lot_data_from_page returns None, create basic lot data
-                    print(f"  ⚠️ Lot {i+1}: extract_lot_data_from_page returned None, creating basic data")
-                    
-                    # Create basic lot data without property prices
-                    basic_lot_data = {
-                        'address': f"Unknown Address - Lot {i + 1}",
-                        'purchase_price': '',
-                        'sale_date': '',
-                        'lot_number': str(i + 1),
-                        'auction_sale': '',
-                        'postcode': '',
-                        'source_url': lot_url,
-                        'auction_name': auction_name,
-                        'auction_date': auction_date,
-                        'property_prices_status': 'extraction_failed',
-                        'property_prices_postcode': '',
-                        'property_prices_sale_date': '',
-                        'property_prices_sale_price': '',
-                        'searchland_status': 'pending'
-                    }
-                    
-                    lots.append(basic_lot_data)
-                    print(f"  📝 Lot {i+1}: Created basic data due to extraction failure")
-                
-                lot_page.close()
-                
-                # Add delay between lots to avoid rate limiting
-                import time
-                import random
-                delay = random.uniform(1, 3)
-                print(f"    ⏱️ Waiting {delay:.1f} seconds before next lot...")
-                time.sleep(delay)
-                
-            except Exception as e:
-                print(f"Error processing lot {i+1}: {e}")
-                continue
+            lots_by_index, pending = {}, list(range(len(lot_urls)))
+        pending = resume_from_journal(journal_key, lot_urls, lots_by_index, pending)
+        pending = skip_ingested_lots(journal_key, lot_urls, lots_by_index, pending)
+        
+        print(f"Extracted {len(lot_urls)} lot URLs")
         
-        context.close()
-        browser.close()
+        # Process the lots the listing left incomplete on a pool of reusable pages, several at a time
+        if pending:
+            pool = PagePool(manager.context('eig'), size=concurrency)
+            # Journaled below, once merged with the lot's catalogue entry
+            handler = make_lot_page_handler(auction_results, auction_name, auction_date, len(lot_urls), catalogue_guides)
+            results = pool.crawl([lot_urls[i] for i in pending],
+                                 lambda lot_page, position, lot_url: handler(lot_page, pending[position], lot_url))
+            pool.close()
+            for position, i in enumerate(pending):
+                if position in results:
+                    lot_data = results[position]
+                    lots_by_index[i] = merge_catalogue_entry(lot_data, catalogue[i]) if catalogue else lot_data
+                    journal_lot(journal_key, lots_by_index[i])
+        lots = [lots_by_index[i] for i in sorted(lots_by_index)]
+    finally:
+        page.close()
+    
+    assign_property_ids(lots)
+    if lookup_prices and lots:
+        lookup_prices_for_lots(lots)
     
     print(f"Successfully extracted {len(lots)} lots from auction")
     return lots
@@ -432,22 +810,22 @@ def extract_auction_results_table(page):
     auction_urls = []
     
     try:
-        # Look for tables with auction listings
-        tables = page.query_selector_all("table")
+        # Look for tables with auction listings (read in one round trip)
+        tables = snapshot_tables(page)
         print(f"    🔍 Found {len(tables)} tables on the auction page")
         for i, table in enumerate(tables):
             print(f"    📋 Processing table {i+1}/{len(tables)}")
             # Check if this table has auction data
-            headers = table.query_selector_all("th, td")
+            headers = [cell['text'] for row in table['rows'] for cell in row['cells']]
             
             # Find the "Lots" column (this indicates it's an auction listing)
             lots_column_index = -1
             date_column_index = -1
             
             # Find relevant columns
-            print(f"    📋 Table {i+1} headers: {[h.text_content().strip() for h in headers[:5]]}...")
+            print(f"    📋 Table {i+1} headers: {headers[:5]}...")
             for j, header in enumerate(headers):
-                header_text = header.text_content().strip().lower()
+                header_text = header.lower()
                 if "lots" in header_text:
                     lots_column_index = j
                     print(f"    ✅ Found 'Lots' column at index {j}")
@@ -457,24 +835,18 @@ def extract_auction_results_table(page):
             
             if lots_column_index >= 0:
                 # Extract auction URLs from each row
-                rows = table.query_selector_all("tr")
-                for row in rows:
-                    cells = row.query_selector_all("td")
-                    if len(cells) > lots_column_index:
+                for row in table['rows']:
+                    data_cells = [cell for cell in row['cells'] if cell['tag'] == 'td']
+                    if len(data_cells) > lots_column_index:
                         # Look for auction links in this row
-                        auction_links = row.query_selector_all("a[href*='auction']")
-                        for link in auction_links:
-                            try:
-                                href = link.get_attribute("href")
-                                if href and "/auction" in href:
-                                    # Make sure it's a full URL
-                                    if href.startswith("/"):
-                                        href = "https://www.eigpropertyauctions.co.uk" + href
-                                    auction_urls.append(href)
-                                    print(f"    📋 Found auction URL: {href}")
-                            except Exception as e:
-                                print(f"    ⚠️ Error extracting auction URL: {e}")
-                                continue
+                        for link in row['links']:
+                            href = link['href']
+                            if href and "/auction" in href:
+                                # Make sure it's a full URL
+                                if href.startswith("/"):
+                                    href = "https://www.eigpropertyauctions.co.uk" + href
+                                auction_urls.append(href)
+                                print(f"    📋 Found auction URL: {href}")
         
         print(f"    ✅ Extracted {len(auction_urls)} auction URLs from table")
         return auction_urls
@@ -484,220 +856,466 @@ def extract_auction_results_table(page):
         return []
 
 
-def lookup_property_in_prices_page(page, address):
+EHP_RECENT_SALE_DAYS = 180  # Only sales in the last ~6 months count as the purchase price
+EHP_BLOCK_RETRIES = int(os.getenv('EHP_BLOCK_RETRIES', '3'))  # Times a WAF-blocked postcode is requeued
+
+EHP_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+
+def lookup_postcode_from_address(address):
     """
-    Navigate to English House Prices website and search for the given address.
-    If found, extract postcode, sale date, and sale price.
+    Pull the trailing postcode out of an address and format it with a space
+    (e.g. "CT93EJ" -> "CT9 3EJ").
     
-    Args:
-        page: Playwright page object
-        address: Address to search for
-        
     Returns:
-        Dict with property data if found, None if not found
+        Postcode string, or None if the address does not end in a postcode
+    """
+    import re
+    postcode_match = re.search(r'([A-Z]{1,2}\d{1,2}\s?\d[A-Z]{2})$', address, re.IGNORECASE)
+    if not postcode_match:
+        return None
+    
+    postcode = postcode_match.group(1).upper()
+    # Format postcode properly (add space if missing)
+    if len(postcode) == 6:  # e.g., "CT93EJ"
+        postcode = postcode[:3] + " " + postcode[3:]  # "CT9 3EJ"
+    elif len(postcode) == 7 and postcode[3] != " ":  # e.g., "WD180ES"
+        postcode = postcode[:4] + " " + postcode[4:]  # "WD18 0ES"
+    return postcode
+
+
+def prices_page_url(postcode):
+    """English House Prices results URL for a postcode"""
+    import urllib.parse
+    return f"https://www.englishhouseprices.com/results.aspx?postcode={urllib.parse.quote(postcode)}"
+
+
+def prices_row_sale_date(row):
+    """Sale date of an EHP/Price Paid row as a sortable (year, month, day), for preferring the latest sale"""
+    date_match = re.search(r'(\d{1,2})/(\d{1,2})/(\d{4})', row['text'])
+    if not date_match:
+        return (0, 0, 0)
+    day, month, year = (int(part) for part in date_match.groups())
+    return (year, month, day)
+
+
+def prices_result_from_row(row_text, postcode):
+    """
+    Read sale date and price from a matched English House Prices row.
+    
+    Returns:
+        Dict with postcode, sale_date, sale_price and found_in_prices, or None
+        if the sale is not within the last EHP_RECENT_SALE_DAYS days
     """
+    import re
+    
+    # Look for date pattern (DD/MM/YYYY)
+    date_match = re.search(r'(\d{1,2}/\d{1,2}/\d{4})', row_text)
+    sale_date = date_match.group(1) if date_match else ''
+    
+    # Look for price pattern (£XXX,XXX)
+    price_match = re.search(r'£([\d,]+)', row_text)
+    sale_price = f"£{price_match.group(1)}" if price_match else ''
+    
+    print(f"    📅 Sale Date: {sale_date}")
+    print(f"    💰 Sale Price: {sale_price}")
+    
+    # Check if sale date is within 6 months from today
     try:
-        print(f"    🔍 Looking up address in English House Prices: {address}")
-        
-        # Extract postcode from address (last part)
-        import re
-        postcode_match = re.search(r'([A-Z]{1,2}\d{1,2}\s?\d[A-Z]{2})$', address, re.IGNORECASE)
-        if not postcode_match:
-            print(f"    ❌ Could not extract postcode from address: {address}")
-            return None
-        
-        postcode = postcode_match.group(1).upper()
-        # Format postcode properly (add space if missing)
-        if len(postcode) == 6:  # e.g., "CT93EJ"
-            postcode = postcode[:3] + " " + postcode[3:]  # "CT9 3EJ"
-        elif len(postcode) == 7 and postcode[3] != " ":  # e.g., "WD180ES"
-            postcode = postcode[:4] + " " + postcode[4:]  # "WD18 0ES"
-        
-        print(f"    📮 Using postcode: {postcode}")
-        
-        # Navigate to English House Prices with the postcode
-        import urllib.parse
-        encoded_postcode = urllib.parse.quote(postcode)
-        property_prices_url = f"https://www.englishhouseprices.com/results.aspx?postcode={encoded_postcode}"
-        
-        # Add random delay to avoid rate limiting (2-5 seconds)
-        import random
-        import time
-        delay = random.uniform(2, 5)
-        print(f"    ⏱️ Waiting {delay:.1f} seconds to avoid rate limiting...")
-        time.sleep(delay)
-        
-        print(f"    🌐 Navigating to: {property_prices_url}")
-        
-        # Set realistic user agent and headers
-        page.set_extra_http_headers({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        })
-        
-        # Navigate with retry logic
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                page.goto(property_prices_url, wait_until="networkidle", timeout=30000)
-                break
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    retry_delay = (attempt + 1) * 5  # Exponential backoff: 5s, 10s, 15s
-                    print(f"    ⚠️ Navigation failed (attempt {attempt + 1}/{max_retries}), retrying in {retry_delay}s: {e}")
-                    time.sleep(retry_delay)
-                else:
-                    print(f"    ❌ Navigation failed after {max_retries} attempts: {e}")
-                    return None
-        
-        # Check if page loaded successfully
-        page_title = page.title()
-        if "Azure WAF" in page_title or "Access Denied" in page_title:
-            print(f"    ❌ Blocked by WAF/Access Denied: {page_title}")
-            # Wait longer and try again
-            print(f"    ⏱️ Waiting 30 seconds before next request...")
-            time.sleep(30)
-            return None
+        # Parse the sale date (format: DD/MM/YYYY)
+        sale_date_obj = datetime.strptime(sale_date, "%d/%m/%Y")
+        today = datetime.now()
+        six_months_ago = today - timedelta(days=EHP_RECENT_SALE_DAYS)
+        
+        if six_months_ago <= sale_date_obj <= today:
+            print(f"    ✅ Sale date {sale_date} is within 6 months - INCLUDING")
+            return {
+                'postcode': postcode,
+                'sale_date': sale_date,
+                'sale_price': sale_price,
+                'found_in_prices': True
+            }
+        if sale_date_obj > today:
+            print(f"    ⏭️ Sale date {sale_date} is in the future - SKIPPING")
+        else:
+            print(f"    ⏭️ Sale date {sale_date} is older than 6 months - SKIPPING")
+        return None
+    
+    except Exception as e:
+        print(f"    ⚠️ Error parsing sale date {sale_date}: {e}")
+        # If we can't parse the date, skip it to be safe
+        return None
+
+
+def is_waf_block(page_title):
+    """True if an English House Prices page title is the WAF's rejection page"""
+    return "Azure WAF" in page_title or "Access Denied" in page_title
+
+
+def fetch_prices_rows(page, postcode):
+    """
+    Load a postcode's English House Prices results page and read its table.
+    
+    Args:
+        page: Playwright page object
+        postcode: Formatted postcode (e.g. "CT9 3EJ")
         
-        if "EHP" not in page_title and "house prices" not in page_title.lower():
-            print(f"    ❌ Page title doesn't match expected: {page_title}")
-            return None
+    Returns:
+        List of {'cell': first column (address), 'text': whole row} dicts, or
+        None if the page could not be loaded (wrong page, navigation failure)
         
-        print(f"    ✅ Page loaded: {page_title}")
-        
-        # Look for the address in the results table
-        # The table has columns: Address, Postcode, Type, Tenure, New Build, Sale Date, Sale Price
-        page_text = page.locator("body").text_content()
-        
-        # Normalize the address for comparison (remove extra spaces, make lowercase)
-        normalized_address = re.sub(r'\s+', ' ', address.strip()).lower()
-        
-        # Debug: Show some addresses from the page to understand the format
-        print(f"    🔍 Page contains {len(page_text)} characters")
-        
-        # Look for table rows to see what addresses are available
-        table_rows = page.query_selector_all("table tr, .table tr")
-        print(f"    📋 Found {len(table_rows)} table rows")
-        
-        # Show first few addresses from the page
-        address_lines = []
-        for row in table_rows[:5]:  # Show first 5 rows
-            try:
-                row_text = row.text_content().strip()
-                if row_text and len(row_text) > 20:  # Skip header rows
-                    address_lines.append(row_text[:100])
-            except:
+    Raises:
+        BlockedError: The WAF rejected the request (the domain's rate has been backed off)
+    """
+    # Navigate to English House Prices with the postcode
+    property_prices_url = prices_page_url(postcode)
+    
+    # Wait for the domain's adaptive rate limit instead of a fixed worst-case delay
+    limiter = get_adaptive_limiter()
+    limiter.acquire(property_prices_url)
+    
+    print(f"    🌐 Navigating to: {property_prices_url}")
+    
+    # Set realistic user agent and headers
+    page.set_extra_http_headers(EHP_HEADERS)
+    
+    # Navigate with retry logic
+    max_retries = 3
+    for attempt in range(max_retries):
+        try:
+            goto_ready(page, property_prices_url, 'ehp_results')
+            break
+        except Exception as e:
+            if attempt < max_retries - 1:
+                retry_delay = (attempt + 1) * 5  # Exponential backoff: 5s, 10s, 15s
+                print(f"    ⚠️ Navigation failed (attempt {attempt + 1}/{max_retries}), retrying in {retry_delay}s: {e}")
+                time.sleep(retry_delay)
+            else:
+                print(f"    ❌ Navigation failed after {max_retries} attempts: {e}")
+                return None
+    
+    # Check if page loaded successfully
+    page_title = page.title()
+    if is_waf_block(page_title):
+        print(f"    ❌ Blocked by WAF/Access Denied: {page_title}")
+        limiter.record_block(property_prices_url)
+        raise BlockedError(f"English House Prices blocked the lookup for {postcode}")
+    
+    if "EHP" not in page_title and "house prices" not in page_title.lower():
+        print(f"    ❌ Page title doesn't match expected: {page_title}")
+        return None
+    
+    limiter.record_success(property_prices_url)
+    print(f"    ✅ Page loaded: {page_title}")
+    snapshot_page(property_prices_url, page.content(), 'ehp')
+    
+    # The table has columns: Address, Postcode, Type, Tenure, New Build, Sale Date, Sale Price
+    # Every row is read in one round trip
+    return prices_rows_from_snapshot(snapshot_tables(page))
+
+def prices_rows_from_snapshot(tables):
+    """Keep the data rows of an EHP results table snapshot as {'cell', 'text'} dicts"""
+    rows = []
+    for table in tables:
+        for row in table['rows']:
+            if len(row['text']) <= 20:  # Skip header rows
                 continue
+            cell_text = first_data_cell(row)
+            if cell_text is not None:
+                rows.append({'cell': cell_text, 'text': row['text']})
+    return rows
+
+def prices_rows_from_html(html):
+    """EHP result rows from a stored results page (the rows fetch_prices_rows reads, without a browser)"""
+    return prices_rows_from_snapshot(snapshot_tables_from_html(html))
+
+def reparse_prices_snapshots():
+    """
+    Re-read every stored English House Prices results page with the current parser.
+    
+    Yields:
+        (postcode, rows, fetched_at) for the newest snapshot of each postcode
+    """
+    import urllib.parse
+    store = get_snapshot_store()
+    if store is None:
+        return
+    for url, html, fetched_at in store.latest_by_url('ehp'):
+        postcode = urllib.parse.parse_qs(urllib.parse.urlparse(url).query).get('postcode', [''])[0]
+        yield postcode, prices_rows_from_html(html), fetched_at
+
+def match_prices_rows(rows, address, postcode, index=None):
+    """
+    Find an address among a postcode's EHP result rows.
+    
+    Args:
+        rows: The postcode's {'cell', 'text'} rows
+        address: Lot address
+        postcode: Postcode the rows belong to
+        index: AddressIndex over the rows (built here if not given; pass one
+               when matching several addresses against the same rows)
+    
+    Returns:
+        Dict with property data if found, None if not found
+    """
+    index = index or AddressIndex(rows)
+    match = index.best_match(address, prefer=prices_row_sale_date)
+    if not match:
+        print(f"    ❌ {address} not found among {len(rows)} English House Prices rows")
+        return None
+    
+    print(f"    ✅ MATCH FOUND ({match.score:.2f}): {match.row['cell']}")
+    return prices_result_from_row(match.row['text'], postcode)
+
+def local_prices_rows(postcode):
+    """
+    A postcode's sales from the local Price Paid Data index, in EHP row format.
+    
+    Returns:
+        List of rows, or None if there is no index or it has no sales for the postcode
+    """
+    index = get_price_paid_index()
+    if index is None:
+        return None
+    try:
+        rows = index.prices_rows(postcode)
+    except Exception as e:
+        print(f"    ⚠️ Error querying Price Paid index for {postcode}: {e}")
+        return None
+    if rows is not None:
+        print(f"    🗄️ Using {len(rows)} Price Paid index sales for {postcode}")
+    return rows
+
+def local_prices_results(addresses, postcode):
+    """
+    Look addresses up among their postcode's sales in the local Price Paid index.
+    
+    Returns:
+        List of property data dicts (as from match_prices_rows) in address order,
+        None where the index has no recent enough sale for the address - those
+        fall back to English House Prices, which may know sales newer than the
+        last index load
+    """
+    rows = local_prices_rows(postcode)
+    if rows is None:
+        return [None] * len(addresses)
+    index = AddressIndex(rows)
+    results = []
+    for address in addresses:
+        match = index.best_match(address, prefer=prices_row_sale_date)
+        results.append(prices_result_from_row(match.row['text'], postcode) if match else None)
+    misses = results.count(None)
+    if misses:
+        print(f"    ↪️ {misses} address(es) in {postcode} have no recent Price Paid sale; asking English House Prices")
+    return results
+
+def lots_missing_local_prices(lots, postcode):
+    """Record the Price Paid index's sales on a postcode's lots; returns the lots still to look up in English House Prices"""
+    remaining = []
+    for lot, property_data in zip(lots, local_prices_results([lot['address'] for lot in lots], postcode)):
+        if property_data:
+            record_prices_result(lot, property_data)
+        else:
+            remaining.append(lot)
+    return remaining
+
+def groups_missing_local_prices(groups):
+    """Answer what the Price Paid index can for postcode -> lots groups; returns the groups left for English House Prices"""
+    missing = {}
+    for postcode, postcode_lots in groups.items():
+        remaining = lots_missing_local_prices(postcode_lots, postcode)
+        if remaining:
+            missing[postcode] = remaining
+    return missing
+
+def get_prices_rows(page, postcode, refresh=False):
+    """
+    A postcode's EHP result rows, from the EHP cache when possible.
+    
+    Fresh and stale cache entries are used as-is (stale ones are queued for
+    revalidate_stale_prices); misses load the results page and are cached.
+    refresh=True skips the cache (re-checks need data newer than the last check).
+    The local Price Paid index is consulted per address before this (see
+    local_prices_results).
+    """
+    cache = get_ehp_cache()
+    rows, state = cache.get(postcode) if not refresh else (None, None)
+    if rows is not None:
+        print(f"    💾 Using {state} cached English House Prices results for {postcode}")
+        return rows
+    
+    rows = fetch_prices_rows(page, postcode)
+    if rows is not None:
+        cache.put(postcode, rows)
+    return rows
+
+def revalidate_stale_prices(page):
+    """Reload every postcode that was served stale from the EHP cache"""
+    cache = get_ehp_cache()
+    pending = cache.take_pending_revalidation()
+    if pending:
+        print(f"🔄 Refreshing {len(pending)} stale English House Prices postcodes...")
+    for postcode in pending:
+        try:
+            rows = fetch_prices_rows(page, postcode)
+            if rows is not None:
+                cache.put(postcode, rows)
+        except Exception as e:
+            print(f"    ⚠️ Error refreshing {postcode}: {e}")
+
+def lookup_property_in_prices_page(page, address):
+    """
+    Look the given address up in the local Price Paid index, falling back to
+    the English House Prices website when the index has no recent sale for it.
+    If found, extract postcode, sale date, and sale price.
+    
+    Args:
+        page: Playwright page object
+        address: Address to search for
         
-        if address_lines:
-            print(f"    📋 Sample addresses from page:")
-            for i, line in enumerate(address_lines):
-                print(f"      {i+1}. {line}")
+    Returns:
+        Dict with property data if found, None if not found
+    """
+    try:
+        print(f"    🔍 Looking up address in English House Prices: {address}")
         
-        # Try to find the exact address match
-        print(f"    🔍 Looking for exact address: {address}")
+        # Extract postcode from address (last part)
+        postcode = lookup_postcode_from_address(address)
+        if not postcode:
+            print(f"    ❌ Could not extract postcode from address: {address}")
+            return None
         
-        # First, let's see what addresses are actually on the page
-        table_rows = page.query_selector_all("table tr")
-        print(f"    📋 Found {len(table_rows)} table rows")
+        print(f"    📮 Using postcode: {postcode}")
         
-        # Look through each row for an exact match
-        exact_match = None
-        for row in table_rows:
-            try:
-                row_text = row.text_content().strip()
-                if row_text and len(row_text) > 20:  # Skip header rows
-                    # Extract the address part (first column)
-                    address_cell = row.query_selector("td")
-                    if address_cell:
-                        cell_text = address_cell.text_content().strip()
-                        print(f"    📋 Checking: {cell_text}")
-                        
-                        # Compare with our target address
-                        if cell_text.lower() == address.lower():
-                            exact_match = row
-                            print(f"    ✅ EXACT MATCH FOUND: {cell_text}")
-                            break
-                        elif cell_text.lower().startswith(address.split(',')[0].lower()):
-                            # Partial match - street address matches
-                            print(f"    🔍 PARTIAL MATCH: {cell_text}")
-                            exact_match = row
-                            break
-            except Exception as e:
-                continue
+        property_data = local_prices_results([address], postcode)[0]
+        if property_data:
+            return property_data
         
-        if exact_match:
-            # Extract data from the exact match row
+        rows = None
+        for attempt in range(EHP_BLOCK_RETRIES + 1):
             try:
-                row_text = exact_match.text_content().strip()
-                print(f"    📋 Extracting from row: {row_text[:100]}...")
-                
-                # Extract sale date and price from the row
-                # Pattern: Sale Date | Sale Price (last two columns)
-                import re
-                
-                # Look for date pattern (DD/MM/YYYY)
-                date_match = re.search(r'(\d{1,2}/\d{1,2}/\d{4})', row_text)
-                sale_date = date_match.group(1) if date_match else ''
-                
-                # Look for price pattern (£XXX,XXX)
-                price_match = re.search(r'£([\d,]+)', row_text)
-                sale_price = f"£{price_match.group(1)}" if price_match else ''
-                
-                print(f"    📅 Sale Date: {sale_date}")
-                print(f"    💰 Sale Price: {sale_price}")
-                
-                # Check if sale date is within 6 months from today
-                from datetime import datetime, timedelta
-                try:
-                    # Parse the sale date (format: DD/MM/YYYY)
-                    sale_date_obj = datetime.strptime(sale_date, "%d/%m/%Y")
-                    today = datetime.now()
-                    six_months_ago = today - timedelta(days=180)  # 6 months = ~180 days
-                    
-                    if six_months_ago <= sale_date_obj <= today:
-                        print(f"    ✅ Sale date {sale_date} is within 6 months - INCLUDING")
-                        return {
-                            'postcode': postcode,
-                            'sale_date': sale_date,
-                            'sale_price': sale_price,
-                            'found_in_prices': True
-                        }
-                    else:
-                        if sale_date_obj > today:
-                            print(f"    ⏭️ Sale date {sale_date} is in the future - SKIPPING")
-                        else:
-                            print(f"    ⏭️ Sale date {sale_date} is older than 6 months - SKIPPING")
-                        return None
-                        
-                except Exception as e:
-                    print(f"    ⚠️ Error parsing sale date {sale_date}: {e}")
-                    # If we can't parse the date, skip it to be safe
-                    return None
-                
-            except Exception as e:
-                print(f"    ⚠️ Error extracting data from row: {e}")
-                return None
-        else:
-            print(f"    ❌ Address not found in English House Prices results")
+                rows = get_prices_rows(page, postcode)
+                break
+            except BlockedError as e:
+                print(f"    🔁 {e} (attempt {attempt + 1}/{EHP_BLOCK_RETRIES + 1})")
+        if rows is None:
             return None
+        return match_prices_rows(rows, address, postcode)
                 
     except Exception as e:
         print(f"    ⚠️ Error looking up property in English House Prices: {e}")
         return None
 
-def extract_lot_data_from_page(lot_page, lot_number, auction_results=None):
+def results_index_from_catalogue(catalogue):
+    """Inverted index over an auction's results, built once per auction from its catalogue listing"""
+    return ResultsIndex({
+        entry['lot_number']: f"{entry['address']} {entry['auction_sale']}"
+        for entry in catalogue
+        if entry.get('lot_number')
+    })
+
+
+def lot_number_from_results(address, auction_results):
+    """
+    Match a lot address against the auction results table to find its lot number.
+    
+    Args:
+        address: Lot address read from the lot page
+        auction_results: ResultsIndex of the auction (or a dict of lot number -> results row text)
+        
+    Returns:
+        Lot number string, or None if no row matches the address
+    """
+    if isinstance(auction_results, dict):
+        auction_results = ResultsIndex(auction_results)
+    if not isinstance(auction_results, ResultsIndex) or not auction_results or len(address) <= 10:
+        return None
+    return auction_results.match(address)
+
+def extract_lot_data_from_snapshot(lot_page, lot_url, lot_number=0, auction_results=None):
+    """
+    Run extract_lot_data_from_page against the newest stored snapshot of a lot
+    page instead of the live site (the HTML is loaded with set_content and the
+    catalogue entry is not opened).
+    
+    Args:
+        lot_page: Playwright page to render the snapshot in
+        lot_url: Lot page URL the snapshot was stored under
+        lot_number: Sequential lot number (fallback)
+        auction_results: Optional ResultsIndex of the auction
+        
+    Returns:
+        Dict with lot data, or None if there is no snapshot or extraction failed
+    """
+    store = get_snapshot_store()
+    html, fetched_at = store.latest(lot_url) if store else (None, None)
+    if html is None:
+        return None
+    lot_page.set_content(html)
+    lot_data = extract_lot_data_from_page(lot_page, lot_number, auction_results, lookup_prices=False, open_catalogue_entry=False)
+    if lot_data:
+        lot_data['source_url'] = lot_url
+        lot_data['snapshot_fetched_at'] = fetched_at
+    return lot_data
+
+REPARSE_BATCH_SIZE = 500
+
+def reparse_lot_snapshots():
+    """
+    Re-parse every stored lot page with the HTML lot parser (REPARSE_BATCH_SIZE
+    pages at a time on the process pool), e.g. to backfill a new field for
+    historical lots with no network requests.
+    
+    Yields:
+        Lot dicts (with source_url and snapshot_fetched_at)
+    """
+    store = get_snapshot_store()
+    if store is None:
+        return
+    batch = []
+    for snapshot in store.latest_by_url('lot'):
+        batch.append(snapshot)
+        if len(batch) == REPARSE_BATCH_SIZE:
+            yield from _reparse_lot_batch(batch)
+            batch = []
+    yield from _reparse_lot_batch(batch)
+
+def _reparse_lot_batch(batch):
+    """Parse a batch of (lot_url, html, fetched_at) snapshots across all cores"""
+    parsed = parse_lot_pages([(html, 0, lot_url) for lot_url, html, _ in batch])
+    for (lot_url, _, fetched_at), lot_data in zip(batch, parsed):
+        if lot_data:
+            lot_data['source_url'] = lot_url
+            lot_data['snapshot_fetched_at'] = fetched_at
+            yield lot_data
+
+def extract_lot_data_from_page(lot_page, lot_number, auction_results=None, lookup_prices=True, catalogue_guides=None,
+                               open_catalogue_entry=True):
     """
     Extract lot data from an individual lot page.
     NEW WORKFLOW: Extract basic info, then lookup in property prices page.
     
+    Every field is read by the declarative rules in lot_rules.LOT_PAGE_RULES in
+    one page.evaluate call; only the guide price is read again after opening
+    the catalogue entry, and not at all when the auction's catalogue PDF
+    already gave this lot's guide price.
+    
     Args:
         lot_page: Playwright page object for the lot page
         lot_number: Sequential lot number (fallback)
+        auction_results: Optional ResultsIndex of the auction for lot-number matching
+        lookup_prices: Run the English House Prices lookup on this page afterwards
+        catalogue_guides: Optional dict of lot number -> guide price from the catalogue PDF
+                          (lots it covers skip their catalogue entry)
+        open_catalogue_entry: Click through to the catalogue entry for a guide price
+                              (False for pages that cannot navigate, e.g. snapshots)
         
     Returns:
         Dict with lot data or None if extraction failed
@@ -714,546 +1332,59 @@ def extract_lot_data_from_page(lot_page, lot_number, auction_results=None):
             'found_in_prices': False
         }
         
-        # Try multiple selectors for each field
-        address_selectors = [
-            ".lot-address",
-            ".address",
-            ".property-address",
-            "[class*='address']",
-            "h1", "h2", "h3", "h4", "h5",
-            ".lot-title",
-            ".property-title",
-            ".lot-description",
-            ".property-description"
-        ]
-        
-        # First try to get lot number from auction results table by matching address
-        if auction_results:
-            # Extract address first to match with auction results
-            address_found = False
-            for selector in address_selectors:
-                try:
-                    if selector.startswith("text="):
-                        # Text-based selector
-                        text_value = selector[5:]  # Remove "text=" prefix
-                        elements = lot_page.query_selector_all(f"text={text_value}")
-                        for elem in elements:
-                            parent = elem.evaluate("el => el.parentElement")
-                            if parent:
-                                siblings = parent.query_selector_all("*")
-                                for sibling in siblings:
-                                    text = sibling.text_content().strip()
-                                    if text and len(text) > 10:  # Likely an address
-                                        lot_data['address'] = text
-                                        address_found = True
-                                        break
-                                if address_found:
-                                    break
-                    else:
-                        # CSS selector
-                        addr_elem = lot_page.query_selector(selector)
-                        if addr_elem:
-                            text = addr_elem.text_content().strip()
-                            if text and len(text) > 10:  # Likely an address
-                                lot_data['address'] = text
-                                address_found = True
-                                break
-                except:
-                    continue
-                
-                if address_found:
-                    break
-            
-            # Now try to match the address with auction results to get the correct lot number
-            if lot_data['address']:
-                address_to_find = lot_data['address'].lower()
-                for lot_num, result_text in auction_results.items():
-                    # Simple matching - look for key words from address in result text
-                    address_words = [word for word in address_to_find.split() if len(word) > 3]
-                    if any(word in result_text.lower() for word in address_words[:3]):
-                        lot_data['lot_number'] = lot_num
-                        print(f"    📍 Matched lot number {lot_num} from auction results for address: {lot_data['address'][:50]}...")
-                        break
-        
-        # If we couldn't match from auction results, extract from page
-        if not auction_results or lot_data['lot_number'] == str(lot_number):
-            lot_number_selectors = [
-                "text=Lot Number",
-                "text=lot number",
-                "text=LOT NUMBER",
-                ".lot-number",
-                "[class*='lot-number']",
-                ".lot-no",
-                "[class*='lot-no']",
-                ".lot",
-                "[class*='lot']",
-                "h1", "h2", "h3", "h4", "h5"  # Check headers for lot numbers
-            ]
-        
-        actual_lot_number_found = False
-        for selector in lot_number_selectors:
-            try:
-                if selector.startswith("text="):
-                    # Text-based selector - look for "Lot Number" and get the next element
-                    text_value = selector[5:]  # Remove "text=" prefix
-                    elements = lot_page.query_selector_all(f"text={text_value}")
-                    for elem in elements:
-                        # Get the parent element and look for the lot number in siblings or children
-                        parent = elem.evaluate("el => el.parentElement")
-                        if parent:
-                            # Look for the lot number in the same container
-                            siblings = parent.query_selector_all("*")
-                            for sibling in siblings:
-                                text = sibling.text_content().strip()
-                                # Check for alphanumeric lot numbers (like "156A", "157B")
-                                lot_match = re.search(r'(\d+[A-Za-z]*)', text)
-                                if lot_match and len(text) <= 6:  # Reasonable lot number length
-                                    lot_data['lot_number'] = lot_match.group(1)
-                                    actual_lot_number_found = True
-                                    break
-                        if actual_lot_number_found:
-                            break
-                else:
-                    # CSS selector
-                    lot_elem = lot_page.query_selector(selector)
-                    if lot_elem:
-                        text = lot_elem.text_content().strip()
-                        if text and text.isdigit() and len(text) <= 4:
-                            lot_data['lot_number'] = text
-                            actual_lot_number_found = True
-                            break
-            except:
-                continue
-            
-            if actual_lot_number_found:
-                break
-        
-        # If we couldn't find the lot number with selectors, try searching the page text
-        if not actual_lot_number_found:
-            try:
-                page_text = lot_page.locator("body").text_content()
-                import re
-                # Look for patterns like "Lot Number 162" or "Lot 162"
-                lot_patterns = [
-                    r'Lot Number\s+(\d+)',
-                    r'Lot\s+(\d+)',
-                    r'LOT NUMBER\s+(\d+)',
-                    r'LOT\s+(\d+)',
-                    r'lot\s+(\d+)',
-                    r'lot number\s+(\d+)'
-                ]
-                
-                for pattern in lot_patterns:
-                    match = re.search(pattern, page_text, re.IGNORECASE)
-                    if match:
-                        lot_data['lot_number'] = match.group(1)
-                        actual_lot_number_found = True
-                        print(f"    📍 Found lot number from text: {lot_data['lot_number']}")
-                        break
-                
-                # If still not found, try to extract from URL
-                if not actual_lot_number_found:
-                    url = lot_page.url
-                    # Look for lot number in URL
-                    lot_match = re.search(r'/lot/([^/?]+)', url)
-                    if lot_match:
-                        # Try to extract a number from the URL
-                        url_part = lot_match.group(1)
-                        number_match = re.search(r'(\d+)', url_part)
-                        if number_match:
-                            lot_data['lot_number'] = number_match.group(1)
-                            actual_lot_number_found = True
-                            print(f"    📍 Found lot number from URL: {lot_data['lot_number']}")
-            except Exception as e:
-                print(f"    ⚠️ Error extracting lot number from text: {e}")
-                pass
+        fields, matched, page_info = extract_fields(lot_page, LOT_PAGE_RULES)
+        for field, rule in matched.items():
+            print(f"    📍 {field}: {fields[field]!r} (from {rule})")
         
-        # Extract address with better error handling
-        address_found = False
-        for selector in address_selectors:
-            try:
-                if selector.startswith("text="):
-                    # Text-based selector
-                    text_value = selector[5:]  # Remove "text=" prefix
-                    elements = lot_page.query_selector_all(f"text={text_value}")
-                    for elem in elements:
-                        try:
-                            address = elem.text_content().strip()
-                            if address and len(address) > 5:
-                                lot_data['address'] = address
-                                # Extract postcode from address using regex pattern
-                                import re
-                                postcode_match = re.search(r'([A-Z]{1,2}\d{1,2}\s?\d[A-Z]{2})$', address, re.IGNORECASE)
-                                if postcode_match:
-                                    lot_data['postcode'] = postcode_match.group(1).upper()
-                                else:
-                                    # Fallback: use last part of address
-                                    parts = address.split()
-                                    if len(parts) >= 2:
-                                        lot_data['postcode'] = parts[-1]
-                                address_found = True
-                                break
-                        except Exception as e:
-                            print(f"    ⚠️ Error extracting text from element: {e}")
-                            continue
-                else:
-                    # CSS selector
-                    address_elem = lot_page.query_selector(selector)
-                    if address_elem:
-                        try:
-                            address = address_elem.text_content().strip()
-                            if address and len(address) > 5:
-                                lot_data['address'] = address
-                                # Extract postcode from address using regex pattern
-                                import re
-                                postcode_match = re.search(r'([A-Z]{1,2}\d{1,2}\s?\d[A-Z]{2})$', address, re.IGNORECASE)
-                                if postcode_match:
-                                    lot_data['postcode'] = postcode_match.group(1).upper()
-                                else:
-                                    # Fallback: use last part of address
-                                    parts = address.split()
-                                    if len(parts) >= 2:
-                                        lot_data['postcode'] = parts[-1]
-                                address_found = True
-                                break
-                        except Exception as e:
-                            print(f"    ⚠️ Error extracting text from {selector}: {e}")
-                            continue
-            except Exception as e:
-                print(f"    ⚠️ Error with selector {selector}: {e}")
-                continue
-            
-            if address_found:
-                break
+        if fields['address']:
+            lot_data['address'] = fields['address']
+            lot_data['postcode'] = postcode_from_address(fields['address'])
         
-        # If no address found with selectors, try to get it from page title or URL
-        if not address_found:
-            try:
-                # Try to get address from page title
-                page_title = lot_page.title()
-                if page_title and "lot" in page_title.lower():
-                    # Extract address from title if possible
-                    title_parts = page_title.split(" - ")
-                    if len(title_parts) > 1:
-                        potential_address = title_parts[-1].strip()
-                        if len(potential_address) > 5:
-                            lot_data['address'] = potential_address
-                            address_found = True
-                            print(f"    📍 Using address from page title: {potential_address}")
-            except Exception as e:
-                print(f"    ⚠️ Error extracting address from page title: {e}")
-        
-        # If still no address, try to extract from URL or page content
-        if not address_found:
-            try:
-                # Try to get any text that looks like an address from the page
-                page_text = lot_page.locator("body").text_content()
-                if page_text:
-                    # Look for patterns that might be addresses
-                    import re
-                    # Look for postcode patterns
-                    postcode_match = re.search(r'([A-Z]{1,2}\d{1,2}\s?\d[A-Z]{2})', page_text, re.IGNORECASE)
-                    if postcode_match:
-                        postcode = postcode_match.group(1)
-                        # Try to find the address around the postcode
-                        postcode_index = page_text.find(postcode)
-                        if postcode_index > 0:
-                            # Get text before postcode (likely the address)
-                            before_postcode = page_text[max(0, postcode_index-100):postcode_index].strip()
-                            # Find the last line that might be the address
-                            lines = before_postcode.split('\n')
-                            for line in reversed(lines):
-                                line = line.strip()
-                                if line and len(line) > 10 and ',' in line:
-                                    lot_data['address'] = f"{line}, {postcode}"
-                                    lot_data['postcode'] = postcode
-                                    address_found = True
-                                    print(f"    📍 Using address from page content: {lot_data['address']}")
-                                    break
-            except Exception as e:
-                print(f"    ⚠️ Error extracting address from page content: {e}")
+        # Lot number: auction results table first, then the page itself
+        results_lot_number = lot_number_from_results(lot_data['address'], auction_results)
+        if results_lot_number:
+            lot_data['lot_number'] = results_lot_number
+            print(f"    📍 Matched lot number {results_lot_number} from auction results for address: {lot_data['address'][:50]}...")
+        elif fields['lot_number']:
+            lot_data['lot_number'] = fields['lot_number']
         
         # If still no address found, create a generic one
-        if not address_found:
+        if not lot_data['address']:
             # Check if we're on a login page
-            try:
-                page_title = lot_page.title()
-                if 'login' in page_title.lower() or 'sign in' in page_title.lower():
-                    print(f"    ⚠️ Session expired - on login page")
-                    return None
-            except:
-                pass
+            page_title = page_info.get('title', '').lower()
+            if 'login' in page_title or 'sign in' in page_title:
+                print(f"    ⚠️ Session expired - on login page")
+                return None
             
             lot_data['address'] = f"Unknown Address - Lot {lot_data['lot_number']}"
             print(f"    ⚠️ No address found, using generic: {lot_data['address']}")
         
-        # Extract auction sale from the individual lot page
-        # Look for auction sale information in h2/h3 elements with text-end class
-        auction_sale_selectors = [
-            ".text-end h2",  # Primary selector - h2 inside text-end div
-            ".text-end h3",  # Secondary selector - h3 inside text-end div
-            ".text-end",  # Any element with text-end class
-            "h2", "h3",  # Fallback to any h2 or h3 headers
-            ".auction-result",
-            ".lot-result", 
-            ".sale-status",
-            ".auction-status",
-            "[class*='result']",
-            "[class*='sale']",
-            "[class*='status']",
-            ".price",
-            ".sold-price",
-            ".auction-price"
-        ]
-        
-        auction_sale_found = False
-        for selector in auction_sale_selectors:
-            try:
-                # Look for elements that might contain auction sale information
-                elements = lot_page.query_selector_all(selector)
-                for element in elements:
-                    text = element.text_content().strip()
-                    if text and len(text) > 3:  # Reasonable length for auction sale info
-                        # Check if this looks like auction sale information
-                        # Look for price patterns or status keywords
-                        import re
-                        
-                        # Check for price patterns
-                        price_patterns = [
-                            r'Sold\s+for\s+£([\d,]+(?:,\d{3})*)',  # "Sold for £X"
-                            r'Sold\s+at\s+£([\d,]+(?:,\d{3})*)',   # "Sold at £X"
-                            r'£([\d,]+(?:,\d{3})*)',               # Standard price format
-                        ]
-                        
-                        # Check for status keywords
-                        status_keywords = ['sold', 'unsold', 'withdrawn', 'reserved', 'auctioneer']
-                        
-                        # If it contains price patterns or status keywords, it's likely auction sale info
-                        is_price = any(re.search(pattern, text, re.IGNORECASE) for pattern in price_patterns)
-                        is_status = any(keyword in text.lower() for keyword in status_keywords)
-                        
-                        if is_price or is_status:
-                            lot_data['auction_sale'] = text
-                            auction_sale_found = True
-                            print(f"    📍 Captured auction sale from {selector}: {lot_data['auction_sale']}")
-                            break
-                
-                if auction_sale_found:
-                    break
-                    
-            except Exception as e:
-                print(f"    ⚠️ Error processing selector {selector}: {e}")
-                continue
-        
-        # If no auction sale found with selectors, try to extract from page text
-        if not auction_sale_found:
-            try:
-                page_text = lot_page.locator("body").text_content()
-                if page_text:
-                    import re
-                    # Look for price patterns first, then capture any text as-is
-                    price_patterns = [
-                        r'Sold\s+for\s+£([\d,]+(?:,\d{3})*)',  # "Sold for £306,000"
-                        r'Sold\s+at\s+£([\d,]+(?:,\d{3})*)',   # "Sold at £X"
-                        r'Price\s+£([\d,]+(?:,\d{3})*)',       # "Price £X"
-                        r'£([\d,]+(?:,\d{3})*)',               # Standard price format like £185,000
-                        r'Guide.*?£([\d,]+(?:,\d{3})*)',
-                        r'Estimate.*?£([\d,]+(?:,\d{3})*)',
-                    ]
-                    
-                    price_found = False
-                    for pattern in price_patterns:
-                        match = re.search(pattern, page_text, re.IGNORECASE)
-                        if match:
-                            lot_data['auction_sale'] = f"£{match.group(1)}"
-                            price_bought_found = True
-                            print(f"    📍 Found auction sale from page text: {lot_data['auction_sale']}")
-                            price_found = True
-                            break
-                    
-                    # If no price found, look for auction-related text to capture as-is
-                    if not price_found:
-                        auction_keywords = ['sold', 'withdrawn', 'reserved', 'unsold', 'passed', 'cancelled', 'postponed', 'adjourned', 'auction', 'lot']
-                        for keyword in auction_keywords:
-                            # Look for any text containing these keywords
-                            keyword_pattern = rf'([^.]*{keyword}[^.]*)'
-                            matches = re.findall(keyword_pattern, page_text, re.IGNORECASE)
-                            for match in matches:
-                                match_text = match.strip()
-                                if len(match_text) > 5 and len(match_text) < 100:  # Reasonable length
-                                    lot_data['auction_sale'] = match_text
-                                    price_bought_found = True
-                                    print(f"    📍 Captured auction-related text: {lot_data['auction_sale']}")
-                                    break
-                            if price_bought_found:
-                                break
-            except Exception as e:
-                print(f"    ⚠️ Error extracting price bought from page text: {e}")
-        
-        # Extract guide price from the catalogue entry PDF
-        print(f"    📄 Looking for Catalogue Entry link to get guide price...")
-        
-        # First, find and click the "Catalogue Entry" link
-        catalogue_entry_selectors = [
-            "text=Catalogue Entry",
-            "text=catalogue entry",
-            "text=CATALOGUE ENTRY",
-            "a:has-text('Catalogue Entry')",
-            "a:has-text('catalogue entry')",
-            "[href*='pdf']",
-            "[href*='catalogue']",
-            "a[href*='pdf']",
-            "a[href*='catalogue']"
-        ]
-        
-        catalogue_clicked = False
-        for selector in catalogue_entry_selectors:
-            try:
-                elements = lot_page.query_selector_all(selector)
-                for element in elements:
-                    try:
-                        text = element.text_content().strip()
-                        if "catalogue entry" in text.lower():
-                            print(f"    📄 Found Catalogue Entry link: {text}")
-                            # Click the link to open the catalogue entry
-                            element.click()
-                            print(f"    ✅ Clicked Catalogue Entry link")
-                            lot_page.wait_for_timeout(3000)  # Wait for page to load
-                            catalogue_clicked = True
-                            break
-                    except Exception as e:
-                        print(f"    ⚠️ Error clicking element: {e}")
-                        continue
-                
-                if catalogue_clicked:
-                    break
-            except Exception as e:
-                print(f"    ⚠️ Error with selector {selector}: {e}")
-                continue
+        if fields['auction_sale']:
+            lot_data['auction_sale'] = fields['auction_sale']
         
-        # Now extract guide price from the catalogue entry page
-        if catalogue_clicked:
-            print(f"    💰 Extracting guide price from catalogue entry...")
-            guide_price_selectors = [
-                "text=Guide Price",
-                "text=guide price", 
-                "text=GUIDE PRICE",
-                "text=Estimate",
-                "text=estimate",
-                "text=ESTIMATE",
-                ".guide-price",
-                ".estimate",
-                "[class*='guide']",
-                "[class*='estimate']",
-                ".price",
-                "[class*='price']",
-                "h2", "h3", "h4", "h5", "h6",
-                ".lot-description",
-                ".property-description"
-            ]
-        else:
-            print(f"    ⚠️ Could not find Catalogue Entry link, trying main page...")
-            guide_price_selectors = [
-                "text=Guide Price",
-                "text=guide price",
-                "text=GUIDE PRICE", 
-                "text=Estimate",
-                "text=estimate",
-                "text=ESTIMATE",
-                ".guide-price",
-                ".estimate",
-                "[class*='guide']",
-                "[class*='estimate']",
-                ".price",
-                "[class*='price']",
-                "h2", "h3", "h4", "h5", "h6",
-                ".lot-description",
-                ".property-description"
-            ]
+        # Triage the outcome (results row first, then the lot header) before the expensive steps
+        results_text = auction_results.get(results_lot_number) if results_lot_number else None
+        print(f"    🏷️ Outcome: {triage_lot(lot_data, results_text)}")
         
-        guide_price_found = False
-        for selector in guide_price_selectors:
+        # Guide price: from the catalogue PDF or the catalogue entry if there is one, else from the lot page
+        lot_data['guide_price'] = fields['guide_price']
+        pdf_guide = (catalogue_guides or {}).get(lot_data['lot_number'].upper())
+        if pdf_guide:
+            lot_data['guide_price'] = pdf_guide
+        elif open_catalogue_entry and fields['catalogue_entry'] and should_run(lot_data, 'catalogue'):
             try:
-                if selector.startswith("text="):
-                    # Text-based selector - look for "Guide Price" and get the value
-                    text_value = selector[5:]  # Remove "text=" prefix
-                    elements = lot_page.query_selector_all(f"text={text_value}")
-                    for elem in elements:
-                        # Get the parent element and look for the guide price in siblings or children
-                        parent = elem.evaluate("el => el.parentElement")
-                        if parent:
-                            # Look for the guide price in the same container
-                            siblings = parent.query_selector_all("*")
-                            for sibling in siblings:
-                                text = sibling.text_content().strip()
-                                # Look for price patterns including the "+" symbol
-                                import re
-                                price_match = re.search(r'£([\d,]+(?:,\d{3})*)\+?', text)
-                                if price_match:
-                                    # Include the "+" if it exists
-                                    full_match = re.search(r'£([\d,]+(?:,\d{3})*\+?)', text)
-                                    if full_match:
-                                        lot_data['guide_price'] = f"£{full_match.group(1)}"
-                                    else:
-                                        lot_data['guide_price'] = f"£{price_match.group(1)}"
-                                    guide_price_found = True
-                                    print(f"    📍 Found guide price: {lot_data['guide_price']}")
-                                    break
-                        if guide_price_found:
-                            break
-                else:
-                    # CSS selector
-                    guide_elem = lot_page.query_selector(selector)
-                    if guide_elem:
-                        text = guide_elem.text_content().strip()
-                        if text:
-                            # Look for price patterns in the text including the "+" symbol
-                            import re
-                            price_match = re.search(r'£([\d,]+(?:,\d{3})*\+?)', text)
-                            if price_match:
-                                # Include the "+" if it exists
-                                full_match = re.search(r'£([\d,]+(?:,\d{3})*\+?)', text)
-                                if full_match:
-                                    lot_data['guide_price'] = f"£{full_match.group(1)}"
-                                else:
-                                    lot_data['guide_price'] = f"£{price_match.group(1)}"
-                                guide_price_found = True
-                                print(f"    📍 Found guide price from {selector}: {lot_data['guide_price']}")
-                                break
-            except Exception as e:
-                print(f"    ⚠️ Error processing guide price selector {selector}: {e}")
-                continue
-            
-            if guide_price_found:
-                break
-        
-        # If no guide price found with selectors, try to extract from page text
-        if not guide_price_found:
-            try:
-                page_text = lot_page.locator("body").text_content()
-                if page_text:
-                    import re
-                    # Look for guide price patterns including the "+" symbol
-                    guide_patterns = [
-                        r'Guide\s+Price.*?£([\d,]+(?:,\d{3})*\+?)',
-                        r'Estimate.*?£([\d,]+(?:,\d{3})*\+?)',
-                        r'Guide.*?£([\d,]+(?:,\d{3})*\+?)',
-                        r'Est.*?£([\d,]+(?:,\d{3})*\+?)',
-                        r'\*Guide\s+Price.*?£([\d,]+(?:,\d{3})*\+?)',  # With asterisk as shown in image
-                    ]
-                    
-                    for pattern in guide_patterns:
-                        match = re.search(pattern, page_text, re.IGNORECASE)
-                        if match:
-                            lot_data['guide_price'] = f"£{match.group(1)}"
-                            guide_price_found = True
-                            print(f"    📍 Found guide price from page text: {lot_data['guide_price']}")
-                            break
+                print(f"    📄 Found Catalogue Entry link: {fields['catalogue_entry']}")
+                lot_page.locator("a:has-text('Catalogue Entry'), button:has-text('Catalogue Entry')").first.click()
+                wait_ready(lot_page, 'eig_catalogue')
+                catalogue_fields, catalogue_matched, _ = extract_fields(lot_page, {'guide_price': GUIDE_PRICE_RULES})
+                if catalogue_fields['guide_price']:
+                    lot_data['guide_price'] = catalogue_fields['guide_price']
+                    print(f"    📍 guide_price from catalogue entry: {lot_data['guide_price']} (from {catalogue_matched['guide_price']})")
             except Exception as e:
-                print(f"    ⚠️ Error extracting guide price from page text: {e}")
+                print(f"    ⚠️ Error opening catalogue entry: {e}")
         
         # If no guide price found, log it
-        if not guide_price_found:
+        if not lot_data['guide_price']:
             print(f"    ⚠️ No guide price found for this lot")
             lot_data['guide_price'] = None  # Ensure it's explicitly None
         
@@ -1263,32 +1394,8 @@ def extract_lot_data_from_page(lot_page, lot_number, auction_results=None):
             return None
         
         # NEW WORKFLOW: If we have an address, lookup in property prices page
-        if lot_data['address']:
-            # Lookup the address in property prices page
-            property_data = lookup_property_in_prices_page(lot_page, lot_data['address'])
-            
-            if property_data and property_data.get('found_in_prices'):
-                # Update lot data with property prices data
-                lot_data['postcode'] = property_data.get('postcode', lot_data['postcode'])
-                lot_data['sale_date'] = property_data.get('sale_date', '')
-                lot_data['purchase_price'] = property_data.get('sale_price', '')  # Actual purchase price from property prices database
-                
-                # Keep the original price_bought from the auction listing
-                # The sold_price from property prices database is separate
-                # Only set to "Sold prior to auction" if the auction listing itself shows that status
-                
-                lot_data['property_prices_status'] = 'found'
-                lot_data['property_prices_postcode'] = property_data.get('postcode', '')
-                lot_data['property_prices_sale_date'] = property_data.get('sale_date', '')
-                lot_data['property_prices_sale_price'] = property_data.get('sale_price', '')
-                print(f"  ✅ Lot {lot_data['lot_number']}: {lot_data['address']} - Auction Sale: {lot_data['auction_sale']}, Purchase Price: {lot_data['purchase_price']} (found in property prices)")
-            else:
-                # Address not found in property prices - still return the lot data
-                lot_data['property_prices_status'] = 'not_found'
-                lot_data['property_prices_postcode'] = ''
-                lot_data['property_prices_sale_date'] = ''
-                lot_data['property_prices_sale_price'] = ''
-                print(f"  📝 Lot {lot_data['lot_number']}: {lot_data['address']} - Auction Sale: {lot_data['auction_sale']}, Purchase Price: Not found")
+        if lookup_prices and lot_data['address'] and should_run(lot_data, 'ehp'):
+            apply_property_prices_lookup(lot_data, lot_page)
         
         # Always return the lot data, regardless of property prices status
         return lot_data
@@ -1297,6 +1404,250 @@ def extract_lot_data_from_page(lot_page, lot_number, auction_results=None):
         print(f"Error extracting lot data from page: {e}")
         return None
 
+def apply_property_prices_lookup(lot_data, page):
+    """
+    Look up a lot's address in English House Prices and record the result on the lot.
+    
+    Args:
+        lot_data: Lot dict with at least 'address', 'postcode', 'lot_number' and 'auction_sale'
+        page: Playwright page used for the English House Prices navigation
+        
+    Returns:
+        The updated lot dict
+    """
+    property_data = lookup_property_in_prices_page(page, lot_data['address'])
+    return record_prices_result(lot_data, property_data)
+
+def record_prices_result(lot_data, property_data):
+    """
+    Record an English House Prices match (or the lack of one) on a lot.
+    
+    Args:
+        lot_data: Lot dict
+        property_data: Result of match_prices_rows / lookup_property_in_prices_page (None if not found)
+        
+    Returns:
+        The updated lot dict
+    """
+    if property_data and property_data.get('found_in_prices'):
+        # Update lot data with property prices data
+        lot_data['postcode'] = property_data.get('postcode', lot_data['postcode'])
+        lot_data['sale_date'] = property_data.get('sale_date', '')
+        lot_data['purchase_price'] = property_data.get('sale_price', '')  # Actual purchase price from property prices database
+        
+        # Keep the original price_bought from the auction listing
+        # The sold_price from property prices database is separate
+        # Only set to "Sold prior to auction" if the auction listing itself shows that status
+        
+        lot_data['property_prices_status'] = 'found'
+        lot_data['property_prices_postcode'] = property_data.get('postcode', '')
+        lot_data['property_prices_sale_date'] = property_data.get('sale_date', '')
+        lot_data['property_prices_sale_price'] = property_data.get('sale_price', '')
+        print(f"  ✅ Lot {lot_data['lot_number']}: {lot_data['address']} - Auction Sale: {lot_data['auction_sale']}, Purchase Price: {lot_data['purchase_price']} (found in property prices)")
+    else:
+        # Address not found in property prices - still return the lot data
+        lot_data['property_prices_status'] = 'not_found'
+        lot_data['property_prices_postcode'] = ''
+        lot_data['property_prices_sale_date'] = ''
+        lot_data['property_prices_sale_price'] = ''
+        print(f"  📝 Lot {lot_data['lot_number']}: {lot_data['address']} - Auction Sale: {lot_data['auction_sale']}, Purchase Price: Not found")
+    
+    return lot_data
+
+def group_lots_by_postcode(lots):
+    """
+    Group the lots that need an English House Prices lookup by postcode.
+    
+    Lots whose triaged outcome (withdrawn, unsold, ...) makes the lookup
+    pointless are marked property_prices_status 'skipped' and left out.
+    
+    Returns:
+        (groups, unmatched) - dict of postcode -> lots, and lots with no usable postcode
+    """
+    groups = {}
+    unmatched = []
+    for lot in lots:
+        if not lot.get('address') or lot.get('property_prices_status') == 'extraction_failed':
+            continue
+        if not should_run(lot, 'ehp'):
+            lot['property_prices_status'] = 'skipped'
+            continue
+        postcode = lookup_postcode_from_address(lot['address'])
+        if postcode:
+            groups.setdefault(normalize_postcode(postcode), []).append(lot)
+        else:
+            unmatched.append(lot)
+    return groups, unmatched
+
+def apply_property_prices_batch(lots, page, refresh=False):
+    """
+    Look up many lots in English House Prices, loading each distinct postcode once.
+    
+    Every lot's address is matched against its postcode's single parsed results
+    table (from the cache or one page load), so requests scale with distinct
+    postcodes rather than lots. Postcodes blocked by the WAF are retried later
+    in the run rather than dropped.
+    
+    Args:
+        lots: Lot dicts (lots without an address or whose extraction failed are left alone)
+        page: Playwright page used for the English House Prices navigations
+        refresh: Load every postcode from EHP even if it is cached or in the
+                 Price Paid index (used for re-checks)
+    """
+    groups, unmatched = group_lots_by_postcode(lots)
+    
+    for lot in unmatched:
+        print(f"    ❌ Could not extract postcode from address: {lot['address']}")
+        record_prices_result(lot, None)
+    
+    # The local Price Paid index answers first; re-checks (refresh) always ask
+    # English House Prices, since they are after sales newer than the index
+    if not refresh:
+        groups = groups_missing_local_prices(groups)
+    print(f"🏠 English House Prices: {sum(len(group) for group in groups.values())} lots in {len(groups)} distinct postcodes")
+    
+    # Postcodes the WAF blocked go to the back of the queue, by which time the
+    # adaptive limiter has backed off; they are only given up on after EHP_BLOCK_RETRIES
+    queue = deque(groups.items())
+    blocks = {}
+    while queue:
+        postcode, postcode_lots = queue.popleft()
+        try:
+            rows = get_prices_rows(page, postcode, refresh)
+        except BlockedError as e:
+            blocks[postcode] = blocks.get(postcode, 0) + 1
+            if blocks[postcode] <= EHP_BLOCK_RETRIES:
+                print(f"    🔁 {e}, requeued ({blocks[postcode]}/{EHP_BLOCK_RETRIES})")
+                queue.append((postcode, postcode_lots))
+                continue
+            print(f"    ❌ Giving up on {postcode} after {blocks[postcode]} blocks")
+            rows = None
+        except Exception as e:
+            print(f"    ⚠️ Error loading English House Prices for {postcode}: {e}")
+            rows = None
+        index = AddressIndex(rows) if rows is not None else None
+        for lot in postcode_lots:
+            property_data = match_prices_rows(rows, lot['address'], postcode, index) if rows is not None else None
+            record_prices_result(lot, property_data)
+
+@on_browser_thread
+def lookup_prices_for_lots(lots):
+    """Run apply_property_prices_batch on a page from the shared browser"""
+    prices_page = get_browser_manager().new_page('eig')
+    try:
+        apply_property_prices_batch(lots, prices_page)
+    finally:
+        prices_page.close()
+
+@on_browser_thread
+def lookup_rechecks(due_rechecks):
+    """Look the due re-checks up in English House Prices and refresh postcodes served stale from the cache"""
+    prices_page = get_browser_manager().new_page('eig')
+    try:
+        if due_rechecks:
+            apply_property_prices_batch([entry['lot'] for entry in due_rechecks], prices_page, refresh=True)
+        # Refresh postcodes that were served stale from the cache while the page is open
+        if get_ehp_cache().pending_revalidation:
+            revalidate_stale_prices(prices_page)
+    finally:
+        prices_page.close()
+
+def queue_rechecks(auction_lots):
+    """
+    Queue every not-found lot for a later English House Prices re-check, since
+    recent completions take months to reach the price data.
+    
+    Args:
+        auction_lots: List of (auction, lots) pairs from this run
+    """
+    queue = get_recheck_queue()
+    queued = 0
+    for auction, lots in auction_lots:
+        for lot in lots:
+            if lot.get('property_prices_status') == 'not_found' and lookup_postcode_from_address(lot.get('address', '')):
+                queue.add(lot, auction)
+                queued += 1
+    if queued:
+        print(f"🗓️ Queued {queued} not-found lots for a later price re-check ({len(queue)} waiting)")
+
+def settle_rechecks(due, sheets_manager):
+    """
+    Import the re-checked lots whose sale has now been found and reschedule the
+    rest (including found lots whose row could not be written).
+    
+    Args:
+        due: Entries from RecheckQueue.due() that have been looked up again
+        sheets_manager: PropertyDataManager used for the imports
+        
+    Returns:
+        Number of lots imported
+    """
+    queue = get_recheck_queue()
+    imported = given_up = 0
+    found = []
+    for j, entry in enumerate(due):
+        lot = entry['lot']
+        if lot.get('property_prices_status') == 'found':
+            property_data = build_import_row(entry['auction'], lot, j)
+            found.append((entry, property_data, j, queue_lot_row(sheets_manager, property_data, j) if property_data else None))
+        elif not queue.reschedule(entry):
+            given_up += 1
+    # The found lots go to the sheet together
+    if found:
+        sheets_manager.flush()
+    for entry, property_data, j, result in found:
+        if property_data and lot_row_outcome(result, property_data, j) == 'imported':
+            imported += 1
+            queue.remove(entry['key'])
+        # A failed write keeps the lot queued, so it is imported on a later re-check
+        elif not queue.reschedule(entry):
+            given_up += 1
+    print(f"🗓️ Re-checks: {imported} imported, {len(due) - imported - given_up} rescheduled, {given_up} given up")
+    return imported
+
+def queue_lot_row(sheets_manager, property_data, j):
+    """
+    Queue one import row for the sheet (it goes out with the sheet writer's next batch).
+    
+    Returns:
+        The result of process_property_data, or None if the row could not be queued
+    """
+    try:
+        print(f"   📤 Queueing for Google Sheet - Guide Price: {property_data.get('guide_price', 'NOT FOUND')}")
+        return sheets_manager.process_property_data(property_data)
+    except Exception as e:
+        print(f"   ❌ Error importing lot {j+1}: {e}")
+        return None
+
+def lot_row_outcome(result, property_data, j):
+    """
+    Wait for a row queued by queue_lot_row to be written.
+    
+    Returns:
+        'imported' if it reached the sheet, 'rejected' if the sheets manager
+        refused it (missing required fields, so trying again will not help),
+        or None if it could not be written and should be tried again
+    """
+    from sheets_webapp import wait_for_write
+    if result is None:
+        return None
+    if result.get('status') == 'error':
+        print(f"   ⏭️ Lot {j+1} rejected: {result.get('message', 'Unknown error')}")
+        return 'rejected'
+    try:
+        result = wait_for_write(result)
+        # 'added_local' is also reported as success, but the row only reached the local backup
+        if result.get('status') == 'success' and result.get('action') in ('added', 'updated'):
+            print(f"   ✅ Lot {j+1} imported successfully with property prices data")
+            ingested = get_ingested_lots()
+            if ingested is not None:
+                ingested.add(property_data.get('auction_url'))
+            return 'imported'
+        print(f"   ⏭️ Lot {j+1} import failed: {result.get('message', 'Unknown error')}")
+    except Exception as e:
+        print(f"   ❌ Error importing lot {j+1}: {e}")
+    return None
+
 def get_processed_auctions(sheets_manager):
     """
     Get list of auctions that have already been processed
@@ -1309,6 +1660,7 @@ def get_processed_auctions(sheets_manager):
         Set of auction dates that have been processed
     """
     processed_auctions = set()
+    lot_urls = []  # Lot URLs of the sheet rows, to seed the ingested lots index
     
     try:
         # Get existing data from the sheet
@@ -1322,6 +1674,7 @@ def get_processed_auctions(sheets_manager):
                 # Create a unique key for each auction
                 auction_key = f"{auction_name}_{auction_date}"
                 processed_auctions.add(auction_key)
+            lot_urls.append(property_data.get('auction_url', ''))
         
         # Also try to read from Google Sheet directly if available
         try:
@@ -1346,12 +1699,18 @@ def get_processed_auctions(sheets_manager):
                             if auction_date and auction_name:
                                 auction_key = f"{auction_name}_{auction_date}"
                                 processed_auctions.add(auction_key)
+                            lot_urls.append(row.get('auction_url', ''))
                         print(f"📊 Also found {len(result.get('rows', []))} rows from Google Sheet")
         except Exception as e:
             print(f"⚠️ Could not read from Google Sheet directly: {e}")
         
         print(f"📊 Found {len(processed_auctions)} already processed auctions")
         
+        ingested = get_ingested_lots()
+        if ingested is not None:
+            ingested.add_many(lot_urls)
+            print(f"📇 {len(ingested)} lots in the ingested lots index")
+        
         # Show some examples of processed auctions
         if processed_auctions:
             print(f"📋 Examples of processed auctions:")
@@ -1366,14 +1725,415 @@ def get_processed_auctions(sheets_manager):
         print(f"⚠️ Error getting processed auctions: {e}")
         return set()
 
+def split_new_auctions(auctions, processed_auctions):
+    """
+    Split auctions into those still to process and those already in the sheet.
+    
+    Returns:
+        Tuple of (new_auctions, skipped_auctions)
+    """
+    new_auctions = []
+    skipped_auctions = []
+    
+    for auction in auctions:
+        auction_key = f"{auction.get('name', 'Unknown')}_{auction.get('date', '')}"
+        if auction_key in processed_auctions:
+            skipped_auctions.append(auction)
+            print(f"   ⏭️ Skipping already processed auction: {auction.get('name', 'Unknown')} on {auction.get('date', 'Unknown')}")
+        else:
+            new_auctions.append(auction)
+    
+    return new_auctions, skipped_auctions
+
+def resume_unfinished_auctions(new_auctions, skipped_auctions):
+    """
+    Put auctions an earlier run started but never finished back into this run,
+    including ones already partly in the sheet (which the sheet dedup skips).
+    
+    Returns:
+        Tuple of (new_auctions, skipped_auctions)
+    """
+    journal = get_crawl_journal()
+    if journal is None:
+        return new_auctions, skipped_auctions
+    
+    resumed = [auction for auction in skipped_auctions if journal.is_unfinished(auction)]
+    skipped_auctions = [auction for auction in skipped_auctions if auction not in resumed]
+    seen = {auction_key(auction) for auction in new_auctions + resumed + skipped_auctions}
+    resumed += [auction for auction in journal.unfinished_auctions() if auction_key(auction) not in seen]
+    
+    for auction in resumed:
+        print(f"   📒 Resuming unfinished auction: {auction.get('name', 'Unknown')} on {auction.get('date', 'Unknown')}")
+    return new_auctions + resumed, skipped_auctions
+
+def journal_stage(lot):
+    """Stage the crawl journal has for a lot, or None"""
+    journal = get_crawl_journal()
+    return journal.stage(lot['source_url']) if journal and lot.get('source_url') else None
+
+def finish_journaled_auction(auction):
+    """Mark an auction finished in the crawl journal once none of its lots is left open"""
+    journal = get_crawl_journal()
+    if journal is None:
+        return
+    key = auction_key(auction)
+    open_lots = journal.open_lots(key)
+    if open_lots:
+        print(f"   📒 {open_lots} lots not imported yet; the next run resumes this auction")
+    else:
+        journal.finish_auction(key)
+
+def prune_snapshots():
+    """Apply the page snapshot retention policy at the end of a run"""
+    store = get_snapshot_store()
+    if store is not None:
+        removed = store.prune()
+        if removed['snapshots'] or removed['objects']:
+            print(f"🧹 Pruned {removed['snapshots']} old page snapshots ({removed['objects']} stored pages)")
+
+def build_import_row(auction, lot, j):
+    """
+    Decide whether a lot is worth importing and build its sheet row.
+    
+    Lots are imported when they have BOTH auction_sale and purchase_price data,
+    OR guide_price data (even without both prices).
+    
+    Args:
+        auction: Auction dict from find_auctions
+        lot: Lot dict from parse_event_days
+        j: Index of the lot within the auction (for logging)
+        
+    Returns:
+        Row dict for the sheets manager, or None if the lot should be skipped
+    """
+    print(f"   Processing lot {j+1}: {lot.get('address', 'No address')}")
+    print(f"   Lot property_prices_status: {lot.get('property_prices_status', 'NOT SET')}")
+    
+    has_both_prices = lot.get('auction_sale') and lot.get('auction_sale').strip() and lot.get('purchase_price') and lot.get('purchase_price').strip()
+    has_guide_price = lot.get('guide_price') and lot.get('guide_price').strip()
+    
+    if not (has_both_prices or has_guide_price):
+        if not has_guide_price:
+            print(f"   ⏭️ Lot {j+1} skipped - no guide_price data found")
+        elif not has_both_prices:
+            print(f"   ⏭️ Lot {j+1} skipped - missing both auction_sale and purchase_price data")
+        else:
+            print(f"   ⏭️ Lot {j+1} skipped - no importable data found")
+        return None
+    
+    if has_both_prices:
+        print(f"   🎯 BOTH PRICES FOUND! Importing lot {j+1} with auction_sale: {lot.get('auction_sale')} and purchase_price: {lot.get('purchase_price')}...")
+    else:
+        print(f"   🎯 GUIDE PRICE FOUND! Importing lot {j+1} with guide_price: {lot.get('guide_price')}...")
+    print(f"   📍 Guide price found: {lot.get('guide_price', 'NOT FOUND')}")
+    
+    property_data = {
+        'auction_name': auction.get('name', ''),
+        'auction_date': auction.get('date', ''),
+        'address': lot.get('address', ''),
+        'auction_sale': lot.get('auction_sale', ''),  # Auction sale price from auction listing
+        'guide_price': lot.get('guide_price', ''),  # Guide price from EIG catalogue entry
+        'lot_number': lot.get('lot_number', ''),
+        'postcode': lot.get('postcode', ''),
+        'purchase_price': lot.get('purchase_price', ''),
+        'sold_date': lot.get('sale_date', ''),  # Sale date from property prices
+        'auction_url': lot.get('source_url', ''),  # Individual lot URL
+        'property_id': assign_property_ids([lot])[0]['property_id'],  # Canonical property key
+        # Additional metadata fields
+        'source_url': lot.get('source_url', ''),
+        'property_prices_status': 'found',
+        'property_prices_postcode': lot.get('property_prices_postcode', ''),
+        'property_prices_sale_date': lot.get('property_prices_sale_date', ''),
+        'property_prices_sale_price': lot.get('property_prices_sale_price', ''),
+        'searchland_status': 'pending'
+    }
+    
+    # Ensure all required fields have at least empty string values
+    for field in ['auction_name', 'auction_date', 'address', 'auction_sale', 'lot_number', 'postcode', 'purchase_price', 'sold_date', 'auction_url']:
+        if field not in property_data or property_data[field] is None:
+            property_data[field] = ''
+    
+    return property_data
+
+def summarize_run(total_imported, total_skipped, total_lots_found, new_auctions, skipped_auctions):
+    """Print the final summary of a pipeline run and build its result dict"""
+    print(f"\n📊 Final Summary:")
+    print(f"   ✅ Total imported: {total_imported}")
+    print(f"   ⏭️ Total skipped: {total_skipped}")
+    print(f"   🎯 Auctions processed: {len(new_auctions)}")
+    print(f"   ⏭️ Auctions skipped (already processed): {len(skipped_auctions)}")
+    print(f"   📈 Success rate: {total_imported/(total_imported+total_skipped)*100:.1f}%" if (total_imported+total_skipped) > 0 else "   📈 Success rate: 0%")
+    
+    return {
+        "status": "success",
+        "total_imported": total_imported,
+        "total_skipped": total_skipped,
+        "total_lots_found": total_lots_found,
+        "auctions_processed": len(new_auctions),
+        "auctions_skipped": len(skipped_auctions),
+        "message": f"Imported {total_imported} properties, processed {len(new_auctions)} auctions, skipped {len(skipped_auctions)} already processed auctions"
+    }
+
+# Lots per English House Prices batch in the pipeline's price stage (each batch
+# loads one page per distinct postcode in it)
+EHP_PIPELINE_BATCH_SIZE = int(os.getenv('EHP_PIPELINE_BATCH_SIZE', '25'))
+LOT_PARSE_BATCH_SIZE = 16
+
+def lot_task(crawl, i, lot=None):
+    """Unit of work flowing through the lot pipeline: one lot of a crawl, and its lot dict once known"""
+    return {'crawl': crawl, 'index': i, 'lot_url': crawl['lot_urls'][i], 'html': None, 'lot': lot, 'outcome': None}
+
+def paced_auctions(auctions):
+    """Yield the auctions with a pause between them, so auction detail pages are not fetched back to back"""
+    for i, auction in enumerate(auctions):
+        if i:
+            delay = random.uniform(3, 8)
+            print(f"   ⏱️ Waiting {delay:.1f} seconds before the next auction...")
+            time.sleep(delay)
+        yield auction
+
+def discover_lot_tasks(auction, client, discovered=None):
+    """
+    Pipeline discover stage: read an auction's catalogue listing and yield a task per lot.
+    
+    Lots the listing or the crawl journal already describe come first and pass
+    straight through the fetch and parse stages; the rest follow with only
+    their URL. An auction whose detail page needs JavaScript is crawled whole by
+    parse_event_days_browser on this stage's thread.
+    
+    Args:
+        auction: Auction dict from find_auctions
+        client: EIGHttpClient shared with the fetch stage
+        discovered: List the auction is appended to once its lots are known
+        
+    Yields:
+        Lot tasks (see lot_task)
+    """
+    journal = get_crawl_journal()
+    journal_key = journal.start_auction(auction) if journal else None
+    auction_name = auction.get('name', 'Auction House London')
+    print(f"\n🔎 Discovering lots of {auction_name} ({auction.get('date', 'Unknown')})")
+    
+    detail_html, _ = client.get_auction_detail(auction['detail_url'])
+    catalogue = eig_http.parse_auction_catalogue(detail_html) if detail_html else []
+    if not catalogue:
+        print("⚠️ Auction detail page needs a browser, falling back to Playwright")
+        lots = parse_event_days_browser(auction['detail_url'], auction_name,
+                                        auction.get('date', ''), lookup_prices=False, journal_key=journal_key)
+        crawl = {'auction': auction, 'journal_key': journal_key, 'lot_urls': [lot.get('source_url', '') for lot in lots]}
+        if discovered is not None:
+            discovered.append(auction)
+        for i, lot in enumerate(lots):
+            yield lot_task(crawl, i, lot)
+        return
+    
+    catalogue_guides = apply_catalogue_guide_prices(detail_html, catalogue, client)
+    crawl = open_auction_crawl(detail_html, catalogue, auction_name, auction.get('date', ''), catalogue_guides,
+                               journal_key, auction)
+    lots_by_index, pending = plan_auction_lots(crawl)
+    if discovered is not None:
+        discovered.append(auction)
+    for i in sorted(lots_by_index):
+        yield lot_task(crawl, i, lots_by_index[i])
+    for i in pending:
+        yield lot_task(crawl, i)
+
+def fetch_lot_task(task, client, limiter):
+    """Pipeline fetch stage: fetch the page of a lot not known yet over HTTP"""
+    if task['lot'] is None:
+        try:
+            task['html'] = fetch_lot_over_http(client, limiter, task['lot_url'], task['index'], len(task['crawl']['lot_urls']))
+        except Exception as e:
+            print(f"    ⚠️ Error fetching lot {task['index']+1}: {e}")
+    return [task]
+
+def parse_lot_tasks(tasks):
+    """Pipeline parse stage: parse a batch of fetched lot pages on the lot parser's process pool"""
+    fetched = [task for task in tasks if task['lot'] is None and task['html']]
+    parsed = parse_lot_pages([(task['html'], task['index'] + 1, task['lot_url']) for task in fetched])
+    for task, lot_data in zip(fetched, parsed):
+        task['html'] = None
+        if lot_data:
+            task['lot'] = finish_parsed_lot(task['crawl'], task['index'], lot_data)
+    for task in tasks:
+        if task['lot'] is None:
+            print(f"    ⚠️ Lot {task['index']+1} needs the browser")
+    return tasks
+
+_lot_pages = None  # The browser stage's PagePool (lives on the browser thread)
+
+def lot_page_pool():
+    """
+    The browser stage's PagePool, kept for the whole run instead of opened per
+    batch. It is replaced once its pages have loaded context_max_uses lots, so
+    the 'eig' context can still be recycled, or when the browser was relaunched.
+    """
+    global _lot_pages
+    manager = get_browser_manager()
+    if _lot_pages is not None and (_lot_pages.navigations >= manager.context_max_uses
+                                   or manager.browser is None or not manager.browser.is_connected()):
+        close_lot_page_pool()
+    if _lot_pages is None:
+        _lot_pages = PagePool(manager.context('eig'))
+    return _lot_pages
+
+@on_browser_thread
+def close_lot_page_pool():
+    """Close the browser stage's PagePool"""
+    global _lot_pages
+    if _lot_pages is not None:
+        _lot_pages.close()
+        _lot_pages = None
+
+@on_browser_thread
+def crawl_lot_tasks(browser_tasks):
+    """Load a batch of lot pages on the browser stage's PagePool; returns position -> lot data"""
+    handlers = [crawl_lot_page_handler(task['crawl']) for task in browser_tasks]
+    return lot_page_pool().crawl(
+        [task['lot_url'] for task in browser_tasks],
+        lambda page, position, url: handlers[position](page, browser_tasks[position]['index'], url)
+    )
+
+def load_lot_tasks_in_browser(tasks):
+    """Pipeline browser stage: load the lots whose page needs JavaScript on the browser thread's PagePool"""
+    browser_tasks = [task for task in tasks if task['lot'] is None]
+    if browser_tasks:
+        results = crawl_lot_tasks(browser_tasks)
+        for position, task in enumerate(browser_tasks):
+            task['lot'] = finish_browser_lot(task['crawl'], task['index'], results.get(position))
+    return tasks
+
+def lots_to_price(tasks):
+    """Lots of a batch of tasks that still need an English House Prices lookup (not priced by an earlier run)"""
+    lots = assign_property_ids([task['lot'] for task in tasks])
+    return [lot for lot in lots if journal_stage(lot) not in ('priced',) + DONE_STAGES]
+
+def journal_priced(tasks, lots):
+    """Journal the looked up lots of a batch of tasks as priced"""
+    priced = {id(lot) for lot in lots}
+    for task in tasks:
+        if id(task['lot']) in priced:
+            journal_lot(task['crawl']['journal_key'], task['lot'], 'priced')
+
+def price_lot_tasks(tasks):
+    """
+    Pipeline price stage: look a batch of lots up in English House Prices on a
+    page of the browser thread, one results page per distinct postcode in the batch.
+    """
+    lots = lots_to_price(tasks)
+    if lots:
+        lookup_prices_for_lots(lots)
+        journal_priced(tasks, lots)
+    return tasks
+
+def write_lot_tasks(tasks, sheets_manager):
+    """
+    Pipeline write stage: queue a batch of lots for the sheet (or skip them),
+    send them as one batch and journal each lot's outcome once its row is written.
+    
+    Returns:
+        The tasks, with task['outcome'] set to 'imported', 'skipped' or 'earlier'
+        (handled by an earlier run)
+    """
+    queued = []
+    for task in tasks:
+        lot, j = task['lot'], task['index']
+        if lot.get('property_prices_status') == 'extraction_failed':
+            # Journaled 'failed' when it was read; nothing to import
+            task['outcome'] = 'skipped'
+            continue
+        if journal_stage(lot) in DONE_STAGES:
+            print(f"   📒 Lot {j+1} was handled by an earlier run")
+            task['outcome'] = 'earlier'
+            continue
+        property_data = build_import_row(task['crawl']['auction'], lot, j)
+        if not property_data:
+            task['outcome'] = 'skipped'
+            journal_lot(task['crawl']['journal_key'], lot, 'skipped')
+            continue
+        queued.append((task, property_data, queue_lot_row(sheets_manager, property_data, j)))
+    
+    # Send the batch now rather than on the writer's timer; lots reaching the
+    # stage while it is in flight make up the next, larger batch
+    if queued:
+        sheets_manager.flush()
+    for task, property_data, result in queued:
+        outcome = lot_row_outcome(result, property_data, task['index'])
+        task['outcome'] = 'imported' if outcome == 'imported' else 'skipped'
+        # Rows that could not be written stay 'priced', so the next run tries them again
+        if outcome:
+            journal_lot(task['crawl']['journal_key'], task['lot'], outcome)
+    return tasks
+
+def forget_discovered(discovered, auction):
+    """
+    Pipeline on_error of the discover stage: an auction whose lots could not all
+    be listed is not finished in the journal at the end of the run, so the next
+    run discovers it again.
+    """
+    print(f"   ❌ Could not list the lots of {auction.get('name', 'Unknown')}; the next run tries it again")
+    if auction in discovered:
+        discovered.remove(auction)
+    return []
+
+def fail_lot_task(task, error):
+    """
+    Pipeline on_error of the lot stages: report a lot a stage failed on
+    instead of dropping it. Its journal stage is left as it was, so the
+    auction stays open and the next run picks the lot up again.
+    """
+    print(f"   ❌ Lot {task['index']+1} failed in the pipeline: {error}")
+    task['outcome'] = 'failed'
+    return [task]
+
+def tally_lot_tasks(tasks):
+    """
+    Totals of a pipeline run from the tasks that came out of the write stage
+    (or failed on the way, see fail_lot_task).
+    
+    Returns:
+        (auction_lots, imported, skipped) - auction_lots as (auction, lots) pairs
+    """
+    by_auction = {}
+    for task in tasks:
+        auction = task['crawl']['auction']
+        lots = by_auction.setdefault(auction_key(auction), (auction, []))[1]
+        if task['lot']:
+            lots.append(task['lot'])
+    imported = sum(task['outcome'] == 'imported' for task in tasks)
+    skipped = sum(task['outcome'] == 'skipped' for task in tasks)
+    failed = sum(task['outcome'] == 'failed' for task in tasks)
+    if failed:
+        print(f"   ❌ {failed} lots failed in the pipeline; the next run tries them again")
+    return list(by_auction.values()), imported, skipped
+
+def print_run_stats():
+    """Print the shared caches' and limiters' summaries"""
+    print(f"💾 {get_ehp_cache().summary()}")
+    print(f"🚦 {get_adaptive_limiter().summary()}")
+    print(f"🏷️ {get_triage_stats().summary()}")
+    if get_ingested_lots() is not None:
+        print(f"📇 {get_ingested_lots().summary()}")
+    if get_snapshot_store() is not None:
+        print(f"📸 {get_snapshot_store().summary()}")
+
 def process_auctions_to_sheets(start_date: str, end_date: str):
     """
     Main workflow function that:
     1. Finds auctions in the date range
     2. Checks which auctions have already been processed
-    3. Extracts property listings from new auctions only
-    4. Imports each lot immediately to sheets after processing
-    5. Provides real-time progress tracking
+    3. Streams the lots of new auctions only through a staged pipeline
+       (discover → fetch → parse → English House Prices → batched sheet write) with
+       bounded queues between the stages, so lots are priced and imported
+       while later lots are still being fetched
+    4. Looks up earlier not-found lots whose re-check is due
+    5. Queues this run's not-found lots for a later re-check
+    
+    Stage worker counts default to one, DEFAULT_POOL_SIZE for fetch and two
+    for parse, and can be set with PIPELINE_<STAGE>_WORKERS. Every stage's
+    Playwright work (discover's fallback, browser, price and the re-checks)
+    runs on the one browser thread, so the run has a single Chromium whatever
+    the worker counts.
     
     Args:
         start_date: Start date in YYYY-MM-DD format
@@ -1405,22 +2165,19 @@ def process_auctions_to_sheets(start_date: str, end_date: str):
         }
     
     # Step 3: Filter out already processed auctions
-    new_auctions = []
-    skipped_auctions = []
-    
-    for auction in auctions:
-        auction_key = f"{auction.get('name', 'Unknown')}_{auction.get('date', '')}"
-        if auction_key in processed_auctions:
-            skipped_auctions.append(auction)
-            print(f"   ⏭️ Skipping already processed auction: {auction.get('name', 'Unknown')} on {auction.get('date', 'Unknown')}")
-        else:
-            new_auctions.append(auction)
+    new_auctions, skipped_auctions = split_new_auctions(auctions, processed_auctions)
+    new_auctions, skipped_auctions = resume_unfinished_auctions(new_auctions, skipped_auctions)
     
     print(f"\n📊 Auction Summary:")
     print(f"   ✅ New auctions to process: {len(new_auctions)}")
     print(f"   ⏭️ Already processed (skipped): {len(skipped_auctions)}")
     
-    if not new_auctions:
+    # Earlier lots whose purchase price may have been registered since
+    due_rechecks = get_recheck_queue().due()
+    if due_rechecks:
+        print(f"   🗓️ Price re-checks due: {len(due_rechecks)}")
+    
+    if not new_auctions and not due_rechecks:
         print("🎉 All auctions in this date range have already been processed!")
         return {
             "status": "already_processed",
@@ -1430,126 +2187,49 @@ def process_auctions_to_sheets(start_date: str, end_date: str):
             "total_lots_found": 0
         }
     
-    # Step 4: Process each new auction and import lots immediately
-    total_imported = 0
-    total_skipped = 0
-    total_lots_found = 0
+    # Step 4: Stream the lots of every new auction through the pipeline, so
+    # price lookups and sheet writes start while later lots are still being fetched
+    print(f"\n3. Streaming {len(new_auctions)} auctions: discover → fetch → parse → price lookup → sheet write")
+    for auction in new_auctions:
+        if not auction.get('detail_url'):
+            print(f"   No detail URL available for auction: {auction.get('name', 'Unknown')}")
+    discovered = []
+    with EIGHttpClient() as client:
+        limiter = get_host_limiter()
+        pipeline = Pipeline([
+            Stage('discover', lambda auction: discover_lot_tasks(auction, client, discovered), queue_size=1,
+                  on_error=lambda auction, error: forget_discovered(discovered, auction)),
+            Stage('fetch', lambda task: fetch_lot_task(task, client, limiter), workers=DEFAULT_POOL_SIZE,
+                  on_error=fail_lot_task),
+            Stage('parse', parse_lot_tasks, workers=2, batch_size=LOT_PARSE_BATCH_SIZE, on_error=fail_lot_task),
+            Stage('browser', load_lot_tasks_in_browser, batch_size=DEFAULT_POOL_SIZE,
+                  on_worker_exit=close_lot_page_pool, on_error=fail_lot_task),
+            Stage('price', price_lot_tasks, batch_size=EHP_PIPELINE_BATCH_SIZE, on_error=fail_lot_task),
+            Stage('write', lambda tasks: write_lot_tasks(tasks, sheets_manager), batch_size=SHEET_BATCH_SIZE,
+                  on_error=fail_lot_task),
+        ])
+        tasks = pipeline.run(paced_auctions([auction for auction in new_auctions if auction.get('detail_url')]))
+    print(f"🧵 {pipeline.summary()}")
     
-    for i, auction in enumerate(new_auctions):
-        print(f"\n2.{i+1}. Processing auction {i+1}/{len(new_auctions)}: {auction.get('name', 'Unknown')}")
-        
-        if auction.get('detail_url'):
-            try:
-                lots = parse_event_days(
-                    auction['detail_url'], 
-                    auction.get('name', 'Auction House London'),
-                    auction.get('date', '')
-                )
-                total_lots_found += len(lots)
-                
-                print(f"   Found {len(lots)} lots in this auction")
-                
-                # Process each lot individually and import immediately when match found
-                for j, lot in enumerate(lots):
-                    print(f"   Processing lot {j+1}/{len(lots)}: {lot.get('address', 'No address')}")
-                    print(f"   Lot property_prices_status: {lot.get('property_prices_status', 'NOT SET')}")
-                    
-                    # Import lots that have BOTH auction_sale data AND purchase_price data
-                    # OR lots that have guide_price data (even without both prices)
-                    has_both_prices = lot.get('auction_sale') and lot.get('auction_sale').strip() and lot.get('purchase_price') and lot.get('purchase_price').strip()
-                    has_guide_price = lot.get('guide_price') and lot.get('guide_price').strip()
-                    
-                    if has_both_prices or has_guide_price:
-                        if has_both_prices:
-                            print(f"   🎯 BOTH PRICES FOUND! Importing lot {j+1} with auction_sale: {lot.get('auction_sale')} and purchase_price: {lot.get('purchase_price')}...")
-                        elif has_guide_price:
-                            print(f"   🎯 GUIDE PRICE FOUND! Importing lot {j+1} with guide_price: {lot.get('guide_price')}...")
-                        else:
-                            print(f"   🎯 IMPORTING lot {j+1}...")
-                        print(f"   📍 Guide price found: {lot.get('guide_price', 'NOT FOUND')}")
-                        
-                        property_data = {
-                            'auction_name': auction.get('name', ''),
-                            'auction_date': auction.get('date', ''),
-                            'address': lot.get('address', ''),
-                            'auction_sale': lot.get('auction_sale', ''),  # Auction sale price from auction listing
-                            'guide_price': lot.get('guide_price', ''),  # Guide price from EIG catalogue entry
-                            'lot_number': lot.get('lot_number', ''),
-                            'postcode': lot.get('postcode', ''),
-                            'purchase_price': lot.get('purchase_price', ''),
-                            'sold_date': lot.get('sale_date', ''),  # Sale date from property prices
-                            'auction_url': lot.get('source_url', ''),  # Individual lot URL
-                            # Additional metadata fields
-                            'source_url': lot.get('source_url', ''),
-                            'property_prices_status': 'found',
-                            'property_prices_postcode': lot.get('property_prices_postcode', ''),
-                            'property_prices_sale_date': lot.get('property_prices_sale_date', ''),
-                            'property_prices_sale_price': lot.get('property_prices_sale_price', ''),
-                            'searchland_status': 'pending'
-                        }
-                        
-                        # Ensure all required fields have at least empty string values
-                        for field in ['auction_name', 'auction_date', 'address', 'auction_sale', 'lot_number', 'postcode', 'purchase_price', 'sold_date', 'auction_url']:
-                            if field not in property_data or property_data[field] is None:
-                                property_data[field] = ''
-                        
-                        # Import this lot immediately to sheets
-                        try:
-                            print(f"   📤 Sending to Google Sheet - Guide Price: {property_data.get('guide_price', 'NOT FOUND')}")
-                            result = sheets_manager.process_property_data(property_data)
-                            if result.get('status') == 'success':
-                                total_imported += 1
-                                print(f"   ✅ Lot {j+1} imported successfully with property prices data")
-                            else:
-                                total_skipped += 1
-                                print(f"   ⏭️ Lot {j+1} import failed: {result.get('message', 'Unknown error')}")
-                        except Exception as e:
-                            total_skipped += 1
-                            print(f"   ❌ Error importing lot {j+1}: {e}")
-                    else:
-                        if not has_guide_price:
-                            print(f"   ⏭️ Lot {j+1} skipped - no guide_price data found")
-                        elif not has_both_prices:
-                            print(f"   ⏭️ Lot {j+1} skipped - missing both auction_sale and purchase_price data")
-                        else:
-                            print(f"   ⏭️ Lot {j+1} skipped - no importable data found")
-                        total_skipped += 1
-                    
-                    # Add small delay between lots
-                    import time
-                    import random
-                    delay = random.uniform(0.5, 1.5)
-                    time.sleep(delay)
-                
-                print(f"   ✅ Completed auction {i+1}: {len(lots)} lots processed")
-                
-                # Add delay between auctions to avoid rate limiting
-                import time
-                import random
-                delay = random.uniform(3, 8)
-                print(f"   ⏱️ Waiting {delay:.1f} seconds before next auction...")
-                time.sleep(delay)
-                
-            except Exception as e:
-                print(f"   Error processing auction {i+1}: {e}")
-                continue
-        else:
-            print(f"   No detail URL available for auction {i+1}")
+    auction_lots, total_imported, total_skipped = tally_lot_tasks(tasks)
+    total_lots_found = len(tasks)
+    for auction in discovered:
+        finish_journaled_auction(auction)
     
-    # Summary
-    print(f"\n📊 Final Summary:")
-    print(f"   ✅ Total imported: {total_imported}")
-    print(f"   ⏭️ Total skipped: {total_skipped}")
-    print(f"   🎯 Auctions processed: {len(new_auctions)}")
-    print(f"   ⏭️ Auctions skipped (already processed): {len(skipped_auctions)}")
-    print(f"   📈 Success rate: {total_imported/(total_imported+total_skipped)*100:.1f}%" if (total_imported+total_skipped) > 0 else "   📈 Success rate: 0%")
+    # Step 5: English House Prices for the due re-checks
+    try:
+        if due_rechecks or get_ehp_cache().pending_revalidation:
+            print(f"\n4. Looking up {len(due_rechecks)} re-checks in English House Prices...")
+            lookup_rechecks(due_rechecks)
+    finally:
+        close_browser_thread()
+    print_run_stats()
     
-    return {
-        "status": "success",
-        "total_imported": total_imported,
-        "total_skipped": total_skipped,
-        "total_lots_found": total_lots_found,
-        "auctions_processed": len(new_auctions),
-        "auctions_skipped": len(skipped_auctions),
-        "message": f"Imported {total_imported} properties, processed {len(new_auctions)} auctions, skipped {len(skipped_auctions)} already processed auctions"
-    }
+    # Step 6: Settle the due re-checks and queue this run's not-found lots
+    if due_rechecks:
+        total_imported += settle_rechecks(due_rechecks, sheets_manager)
+    queue_rechecks(auction_lots)
+    prune_snapshots()
+    print(f"📤 {sheets_manager.writer.summary()}")
+    
+    return summarize_run(total_imported, total_skipped, total_lots_found, new_auctions, skipped_auctions)
@@ -0,0 +1,662 @@
+#!/usr/bin/env python3
+"""
+Asyncio port of the EIG scraping pipeline
+
+Async versions of find_auctions, parse_event_days, extract_lot_data_from_page
+and lookup_property_in_prices_page built on playwright.async_api and httpx's
+AsyncClient. Lot fetches, lot navigations and English House Prices lookups
+(one per distinct postcode) are kept in flight concurrently, bounded by
+semaphores and the per-host limiter.
+
+process_auctions_to_sheets is the async entry point awaited by main.py; it
+streams lots through the same stages as eig.process_auctions_to_sheets on a
+pipeline.AsyncPipeline. The pure parsing and import rules are shared with
+eig.py so both paths behave the same.
+
+The SQLite stores (crawl journal, ingested lots, EHP cache, price paid
+index, snapshots) and snapshot compression block, so they are called through
+asyncio.to_thread to keep the event loop free for the pages and fetches.
+"""
+
+import os
+import random
+import asyncio
+
+import eig
+import eig_http
+from eig_http import AsyncEIGHttpClient
+from rate_limit import AsyncHostRateLimiter, get_adaptive_limiter, BlockedError
+from page_pool import DEFAULT_POOL_SIZE
+from browser_manager import get_async_browser_manager, close_async_browser_manager
+from readiness import goto_ready_async, wait_ready_async
+from lot_rules import LOT_PAGE_RULES, GUIDE_PRICE_RULES, extract_fields_async, postcode_from_address
+from dom_snapshot import snapshot_tables_async, snapshot_elements_async, table_rows_from_snapshot
+from ehp_cache import get_ehp_cache
+from address_matching import AddressIndex
+from lot_triage import triage_lot, should_run
+from recheck_queue import get_recheck_queue
+from catalogue_pdf import apply_catalogue_guide_prices_async
+from crawl_journal import get_crawl_journal
+from snapshot_store import snapshot_page
+from lot_parser import parse_lot_pages
+from pipeline import AsyncPipeline, Stage
+from sheet_writer import SHEET_BATCH_SIZE
+
+EHP_CONCURRENCY = int(os.getenv('EHP_CONCURRENCY', '2'))
+
+
+# ----------------------------
+# Auction discovery
+# ----------------------------
+
+async def find_auctions(start_date: str, end_date: str):
+    """
+    Async version of eig.find_auctions: plain HTTP first, browser only if the
+    results page needs it.
+    """
+    print("Fetching EIG auction results over HTTP...")
+    async with AsyncEIGHttpClient() as client:
+        html, url = await client.get_results_page()
+
+    if html and not eig_http.page_needs_javascript(html):
+        table_rows = eig_http.parse_results_table_rows(html)
+        if table_rows:
+            auctions = eig.auctions_from_table_rows(table_rows, url)
+            auctions.extend(eig.auctions_from_links(eig_http.parse_auction_links(html), start_date, end_date))
+            print(f"Found {len(auctions)} auctions in date range")
+            return auctions
+
+    print("⚠️ Results page needs a browser, falling back to Playwright")
+    page = await get_async_browser_manager().new_page('eig')
+    auctions = []
+    try:
+        await goto_ready_async(page, eig_http.EIG_RESULTS_URL, 'eig_results')
+
+        title = await page.title()
+        if "login" in title.lower() or "log-in" in page.url.lower():
+            print("Redirected to login page. Trying alternative URLs...")
+            for alt_url in [
+                "https://www.eigpropertyauctions.co.uk/auction-results",
+                "https://www.eigpropertyauctions.co.uk/search/auction-results",
+                "https://www.eigpropertyauctions.co.uk/auctions/results"
+            ]:
+                try:
+                    await goto_ready_async(page, alt_url, 'eig_results')
+                    if "login" not in (await page.title()).lower():
+                        print("Found public page!")
+                        break
+                except Exception as e:
+                    print(f"Error with {alt_url}: {e}")
+
+        tables = await snapshot_tables_async(page)
+        auctions.extend(eig.auctions_from_table_rows(table_rows_from_snapshot(tables), page.url))
+
+        for selector in eig_http.AUCTION_LINK_SELECTORS:
+            links = await snapshot_elements_async(page, selector)
+            if links:
+                link_items = [(link['text'], link['href']) for link in links]
+                auctions.extend(eig.auctions_from_links(link_items, start_date, end_date))
+                break
+    finally:
+        await page.close()
+
+    print(f"Found {len(auctions)} auctions in date range")
+    return auctions
+
+
+# ----------------------------
+# English House Prices lookup
+# ----------------------------
+
+async def fetch_prices_rows(page, postcode):
+    """
+    Async version of eig.fetch_prices_rows.
+
+    Returns:
+        List of {'cell', 'text'} rows, or None if the page could not be loaded
+
+    Raises:
+        BlockedError: The WAF rejected the request
+    """
+    property_prices_url = eig.prices_page_url(postcode)
+
+    limiter = get_adaptive_limiter()
+    await limiter.acquire_async(property_prices_url)
+
+    print(f"    🌐 Navigating to: {property_prices_url}")
+    await page.set_extra_http_headers(eig.EHP_HEADERS)
+
+    # Navigate with retry logic
+    max_retries = 3
+    for attempt in range(max_retries):
+        try:
+            await goto_ready_async(page, property_prices_url, 'ehp_results')
+            break
+        except Exception as e:
+            if attempt < max_retries - 1:
+                retry_delay = (attempt + 1) * 5
+                print(f"    ⚠️ Navigation failed (attempt {attempt + 1}/{max_retries}), retrying in {retry_delay}s: {e}")
+                await asyncio.sleep(retry_delay)
+            else:
+                print(f"    ❌ Navigation failed after {max_retries} attempts: {e}")
+                return None
+
+    page_title = await page.title()
+    if eig.is_waf_block(page_title):
+        print(f"    ❌ Blocked by WAF/Access Denied: {page_title}")
+        limiter.record_block(property_prices_url)
+        raise BlockedError(f"English House Prices blocked the lookup for {postcode}")
+
+    if "EHP" not in page_title and "house prices" not in page_title.lower():
+        print(f"    ❌ Page title doesn't match expected: {page_title}")
+        return None
+
+    limiter.record_success(property_prices_url)
+    await asyncio.to_thread(snapshot_page, property_prices_url, await page.content(), 'ehp')
+
+    return eig.prices_rows_from_snapshot(await snapshot_tables_async(page))
+
+
+async def get_prices_rows(page, postcode, refresh=False):
+    """Async version of eig.get_prices_rows (same persistent cache, read and written off the event loop)"""
+    cache = get_ehp_cache()
+    rows, state = await asyncio.to_thread(cache.get, postcode) if not refresh else (None, None)
+    if rows is not None:
+        print(f"    💾 Using {state} cached English House Prices results for {postcode}")
+        return rows
+
+    rows = await fetch_prices_rows(page, postcode)
+    if rows is not None:
+        await asyncio.to_thread(cache.put, postcode, rows)
+    return rows
+
+
+async def revalidate_stale_prices(page):
+    """Async version of eig.revalidate_stale_prices"""
+    cache = get_ehp_cache()
+    for postcode in cache.take_pending_revalidation():
+        try:
+            rows = await fetch_prices_rows(page, postcode)
+            if rows is not None:
+                await asyncio.to_thread(cache.put, postcode, rows)
+        except Exception as e:
+            print(f"    ⚠️ Error refreshing {postcode}: {e}")
+
+
+async def lookup_property_in_prices_page(page, address):
+    """
+    Async version of eig.lookup_property_in_prices_page.
+
+    Returns:
+        Dict with property data if found, None if not found
+    """
+    try:
+        print(f"    🔍 Looking up address in English House Prices: {address}")
+
+        postcode = eig.lookup_postcode_from_address(address)
+        if not postcode:
+            print(f"    ❌ Could not extract postcode from address: {address}")
+            return None
+
+        property_data = (await asyncio.to_thread(eig.local_prices_results, [address], postcode))[0]
+        if property_data:
+            return property_data
+
+        rows = None
+        for attempt in range(eig.EHP_BLOCK_RETRIES + 1):
+            try:
+                rows = await get_prices_rows(page, postcode)
+                break
+            except BlockedError as e:
+                print(f"    🔁 {e} (attempt {attempt + 1}/{eig.EHP_BLOCK_RETRIES + 1})")
+        if rows is None:
+            return None
+        return eig.match_prices_rows(rows, address, postcode)
+
+    except Exception as e:
+        print(f"    ⚠️ Error looking up property in English House Prices: {e}")
+        return None
+
+
+async def apply_property_prices_lookup(lot_data, page):
+    """Async version of eig.apply_property_prices_lookup"""
+    property_data = await lookup_property_in_prices_page(page, lot_data['address'])
+    return eig.record_prices_result(lot_data, property_data)
+
+
+async def apply_property_prices_batch(lots, context, refresh=False):
+    """
+    Async version of eig.apply_property_prices_batch.
+
+    Each distinct postcode is loaded once by EHP_CONCURRENCY workers, each with
+    its own page from the context. Postcodes the WAF blocks go back on the
+    queue (up to EHP_BLOCK_RETRIES times) instead of being dropped.
+    """
+    groups, unmatched = eig.group_lots_by_postcode(lots)
+
+    for lot in unmatched:
+        print(f"    ❌ Could not extract postcode from address: {lot['address']}")
+        eig.record_prices_result(lot, None)
+
+    if not refresh:
+        groups = await asyncio.to_thread(eig.groups_missing_local_prices, groups)
+    print(f"🏠 English House Prices: {sum(len(group) for group in groups.values())} lots in {len(groups)} distinct postcodes")
+
+    if not groups:
+        return
+
+    queue = asyncio.Queue()
+    for postcode, postcode_lots in groups.items():
+        queue.put_nowait((postcode, postcode_lots, 0))
+
+    async def worker():
+        # Workers stop once the queue is empty; a requeued postcode is picked up
+        # by the worker that requeued it at the latest
+        page = await context.new_page()
+        try:
+            while not queue.empty():
+                postcode, postcode_lots, blocks = queue.get_nowait()
+                try:
+                    rows = await get_prices_rows(page, postcode, refresh)
+                except BlockedError as e:
+                    if blocks < eig.EHP_BLOCK_RETRIES:
+                        print(f"    🔁 {e}, requeued ({blocks + 1}/{eig.EHP_BLOCK_RETRIES})")
+                        queue.put_nowait((postcode, postcode_lots, blocks + 1))
+                        continue
+                    print(f"    ❌ Giving up on {postcode} after {blocks + 1} blocks")
+                    rows = None
+                except Exception as e:
+                    print(f"    ⚠️ Error loading English House Prices for {postcode}: {e}")
+                    rows = None
+                index = AddressIndex(rows) if rows is not None else None
+                for lot in postcode_lots:
+                    property_data = eig.match_prices_rows(rows, lot['address'], postcode, index) if rows is not None else None
+                    eig.record_prices_result(lot, property_data)
+        finally:
+            await page.close()
+
+    await asyncio.gather(*[worker() for _ in range(min(max(1, EHP_CONCURRENCY), len(groups)))])
+
+
+# ----------------------------
+# Lot page extraction
+# ----------------------------
+
+async def extract_lot_data_from_page(lot_page, lot_number, auction_results=None, lookup_prices=True,
+                                     catalogue_guides=None):
+    """
+    Async version of eig.extract_lot_data_from_page (same lot_rules spec, one evaluate per page state).
+
+    Args:
+        lot_page: playwright.async_api Page showing the lot
+        lot_number: Sequential lot number (fallback)
+        auction_results: Optional ResultsIndex of the auction for lot-number matching
+        lookup_prices: Run the English House Prices lookup on this page afterwards
+        catalogue_guides: Optional dict of lot number -> guide price from the catalogue PDF
+                          (lots it covers skip their catalogue entry)
+
+    Returns:
+        Dict with lot data or None if extraction failed
+    """
+    try:
+        lot_data = {
+            'lot_number': str(lot_number),
+            'address': '',
+            'auction_sale': '',
+            'guide_price': None,
+            'purchase_price': '',
+            'sale_date': '',
+            'postcode': '',
+            'found_in_prices': False
+        }
+
+        fields, matched, page_info = await extract_fields_async(lot_page, LOT_PAGE_RULES)
+
+        if fields['address']:
+            lot_data['address'] = fields['address']
+            lot_data['postcode'] = postcode_from_address(fields['address'])
+
+        results_lot_number = eig.lot_number_from_results(lot_data['address'], auction_results)
+        lot_data['lot_number'] = results_lot_number or fields['lot_number'] or lot_data['lot_number']
+
+        if not lot_data['address']:
+            page_title = page_info.get('title', '').lower()
+            if 'login' in page_title or 'sign in' in page_title:
+                print(f"    ⚠️ Session expired - on login page")
+                return None
+            lot_data['address'] = f"Unknown Address - Lot {lot_data['lot_number']}"
+
+        lot_data['auction_sale'] = fields['auction_sale'] or ''
+        triage_lot(lot_data, auction_results.get(results_lot_number) if results_lot_number else None)
+
+        # Guide price: from the catalogue PDF or the catalogue entry if there is one, else from the lot page
+        lot_data['guide_price'] = fields['guide_price']
+        pdf_guide = (catalogue_guides or {}).get(lot_data['lot_number'].upper())
+        if pdf_guide:
+            lot_data['guide_price'] = pdf_guide
+        elif fields['catalogue_entry'] and should_run(lot_data, 'catalogue'):
+            try:
+                await lot_page.locator("a:has-text('Catalogue Entry'), button:has-text('Catalogue Entry')").first.click()
+                await wait_ready_async(lot_page, 'eig_catalogue')
+                catalogue_fields, _, _ = await extract_fields_async(lot_page, {'guide_price': GUIDE_PRICE_RULES})
+                lot_data['guide_price'] = catalogue_fields['guide_price'] or lot_data['guide_price']
+            except Exception as e:
+                print(f"    ⚠️ Error opening catalogue entry: {e}")
+
+        if 'login' in lot_data['address'].lower() or 'sign in' in lot_data['address'].lower():
+            print(f"    ⚠️ Session expired - redirected to login page")
+            return None
+
+        if lookup_prices and lot_data['address'] and should_run(lot_data, 'ehp'):
+            await apply_property_prices_lookup(lot_data, lot_page)
+
+        return lot_data
+
+    except Exception as e:
+        print(f"Error extracting lot data from page: {e}")
+        return None
+
+
+# ----------------------------
+# Auction crawling
+# ----------------------------
+
+async def _fetch_lot_over_http(client, limiter, semaphore, lot_url, i, total_lots):
+    """Async version of eig.fetch_lot_over_http (returns the page HTML, or None if it needs the browser)"""
+    async with semaphore:
+        async with limiter.slot(lot_url):
+            print(f"Fetching lot {i+1}/{total_lots}: {lot_url}")
+            lot_html, _ = await client.get_lot_page(lot_url)
+    if lot_html and not eig_http.page_needs_javascript(lot_html):
+        return lot_html
+    return None
+
+
+async def _detail_page_in_browser(context, event_url):
+    """Read the catalogue listing and rendered HTML of a detail page that needs JavaScript"""
+    page = await context.new_page()
+    try:
+        await goto_ready_async(page, event_url, 'eig_auction_detail')
+        html = await page.content()
+    finally:
+        await page.close()
+    await asyncio.to_thread(snapshot_page, event_url, html, 'listing')
+    return eig_http.parse_auction_catalogue(html), html
+
+
+async def _open_auction_crawl(client, context, event_url, auction_name, auction_date, journal_key, auction=None):
+    """
+    Read an auction's catalogue listing (in the browser if the page needs
+    JavaScript) and its catalogue PDFs, and plan which lot pages to open.
+
+    Returns:
+        (crawl, lots_by_index, pending) - see eig.open_auction_crawl and eig.plan_auction_lots
+    """
+    print(f"Fetching auction details over HTTP: {event_url}")
+    detail_html, _ = await client.get_auction_detail(event_url)
+    catalogue = eig_http.parse_auction_catalogue(detail_html) if detail_html else []
+    if not catalogue:
+        print("⚠️ Auction detail page needs a browser, loading it in Playwright")
+        catalogue, detail_html = await _detail_page_in_browser(context, event_url)
+
+    # Lots the catalogue listing already describes need no lot page
+    catalogue_guides = await apply_catalogue_guide_prices_async(detail_html, catalogue, client)
+    crawl = eig.open_auction_crawl(detail_html, catalogue, auction_name, auction_date, catalogue_guides, journal_key,
+                                   auction)
+    # Reads the crawl journal and the ingested lots, both SQLite
+    lots_by_index, pending = await asyncio.to_thread(eig.plan_auction_lots, crawl)
+    return crawl, lots_by_index, pending
+
+
+async def _load_lot_in_browser(context, limiter, semaphore, crawl, i):
+    """Load a lot page that needs JavaScript and extract it (basic data if that fails), journaled at once"""
+    lot_url = crawl['lot_urls'][i]
+    lot_data = None
+    async with semaphore:
+        page = await context.new_page()
+        try:
+            async with limiter.slot(lot_url):
+                await goto_ready_async(page, lot_url, 'eig_lot')
+            await asyncio.to_thread(snapshot_page, lot_url, await page.content(), 'lot')
+            lot_data = await extract_lot_data_from_page(page, i + 1, crawl['auction_results'], lookup_prices=False,
+                                                        catalogue_guides=crawl['catalogue_guides'])
+        except Exception as e:
+            print(f"    ⚠️ Error processing lot {i+1} in browser: {e}")
+        finally:
+            await page.close()
+    if lot_data:
+        return await asyncio.to_thread(eig.finish_parsed_lot, crawl, i, lot_data)
+    return await asyncio.to_thread(eig.finish_browser_lot, crawl, i, None)
+
+
+async def parse_event_days(event_url: str, auction_name: str = "", auction_date: str = "",
+                           concurrency: int = DEFAULT_POOL_SIZE, limiter=None, lookup_prices=True, journal_key=None):
+    """
+    Async version of eig.parse_event_days.
+
+    Lot pages are fetched over HTTP concurrently; lots that need JavaScript are
+    loaded on up to `concurrency` browser pages at once, then English House
+    Prices is loaded once per distinct postcode on EHP_CONCURRENCY pages.
+
+    Args:
+        event_url: Auction detail page URL
+        auction_name: Auction name to record on each lot
+        auction_date: Auction date to record on each lot (read from the page if empty)
+        concurrency: Lots in flight at the same time
+        limiter: AsyncHostRateLimiter shared across the run
+        lookup_prices: Look the lots up in English House Prices; False when the
+                       caller batches the lookups for a whole run
+        journal_key: Auction key in the crawl journal (see eig.parse_event_days)
+    """
+    limiter = limiter or AsyncHostRateLimiter()
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    context = await get_async_browser_manager().context('eig')
+    async with AsyncEIGHttpClient() as client:
+        crawl, lots_by_index, pending = await _open_auction_crawl(client, context, event_url, auction_name,
+                                                                  auction_date, journal_key)
+        lot_urls = crawl['lot_urls']
+        http_results = await asyncio.gather(*[
+            _fetch_lot_over_http(client, limiter, semaphore, lot_urls[i], i, len(lot_urls))
+            for i in pending
+        ], return_exceptions=True)
+
+    lots = [lots_by_index.get(i) for i in range(len(lot_urls))]
+    # Parse the fetched pages on the lot parser's process pool, off the event loop
+    fetched = [(i, html) for i, html in zip(pending, http_results) if isinstance(html, str)]
+    parsed = await asyncio.to_thread(parse_lot_pages, [(html, i + 1, lot_urls[i]) for i, html in fetched])
+    for (i, _), lot_data in zip(fetched, parsed):
+        lots[i] = await asyncio.to_thread(eig.finish_parsed_lot, crawl, i, lot_data) if lot_data else None
+    browser_indexes = [i for i in pending if lots[i] is None]
+    if browser_indexes:
+        print(f"    ⚠️ {len(browser_indexes)} lots need the browser")
+        browser_results = await asyncio.gather(*[
+            _load_lot_in_browser(context, limiter, semaphore, crawl, i) for i in browser_indexes
+        ])
+        for i, lot_data in zip(browser_indexes, browser_results):
+            lots[i] = lot_data
+    lots = [lot for lot in lots if lot]  # Lots already in the sheet were dropped
+
+    eig.assign_property_ids(lots)
+    if lookup_prices and lots:
+        await apply_property_prices_batch(lots, context)
+
+    print(f"Successfully extracted {len(lots)} lots from auction")
+    return lots
+
+
+# ----------------------------
+# Pipeline stages
+# ----------------------------
+
+async def _paced_auctions(auctions):
+    """Async version of eig.paced_auctions"""
+    for i, auction in enumerate(auctions):
+        if i:
+            delay = random.uniform(3, 8)
+            print(f"   ⏱️ Waiting {delay:.1f} seconds before the next auction...")
+            await asyncio.sleep(delay)
+        yield auction
+
+
+async def discover_lot_tasks(auction, client, context, discovered=None):
+    """Async version of eig.discover_lot_tasks (returns the auction's lot tasks)"""
+    journal = get_crawl_journal()
+    journal_key = await asyncio.to_thread(journal.start_auction, auction) if journal else None
+    auction_name = auction.get('name', 'Auction House London')
+    print(f"\n🔎 Discovering lots of {auction_name} ({auction.get('date', 'Unknown')})")
+
+    crawl, lots_by_index, pending = await _open_auction_crawl(client, context, auction['detail_url'], auction_name,
+                                                              auction.get('date', ''), journal_key, auction)
+    if discovered is not None:
+        discovered.append(auction)
+    return ([eig.lot_task(crawl, i, lots_by_index[i]) for i in sorted(lots_by_index)]
+            + [eig.lot_task(crawl, i) for i in pending])
+
+
+async def fetch_lot_task(task, client, limiter, semaphore):
+    """Async version of eig.fetch_lot_task"""
+    if task['lot'] is None:
+        try:
+            task['html'] = await _fetch_lot_over_http(client, limiter, semaphore, task['lot_url'], task['index'],
+                                                      len(task['crawl']['lot_urls']))
+        except Exception as e:
+            print(f"    ⚠️ Error fetching lot {task['index']+1}: {e}")
+    return [task]
+
+
+async def parse_lot_tasks(tasks):
+    """Async version of eig.parse_lot_tasks (the batch is handed to the process pool off the event loop)"""
+    return await asyncio.to_thread(eig.parse_lot_tasks, tasks)
+
+
+async def load_lot_tasks_in_browser(tasks, context, limiter, semaphore):
+    """Async version of eig.load_lot_tasks_in_browser (the lots load on concurrent pages)"""
+    browser_tasks = [task for task in tasks if task['lot'] is None]
+    lots = await asyncio.gather(*[
+        _load_lot_in_browser(context, limiter, semaphore, task['crawl'], task['index']) for task in browser_tasks
+    ])
+    for task, lot in zip(browser_tasks, lots):
+        task['lot'] = lot
+    return tasks
+
+
+async def price_lot_tasks(tasks, context):
+    """Async version of eig.price_lot_tasks (postcodes load on EHP_CONCURRENCY pages, journal updates off the loop)"""
+    lots = await asyncio.to_thread(eig.lots_to_price, tasks)
+    if lots:
+        await apply_property_prices_batch(lots, context)
+        await asyncio.to_thread(eig.journal_priced, tasks, lots)
+    return tasks
+
+
+async def write_lot_tasks(tasks, sheets_manager):
+    """Async version of eig.write_lot_tasks (the blocking Google Sheets calls run in a worker thread)"""
+    return await asyncio.to_thread(eig.write_lot_tasks, tasks, sheets_manager)
+
+
+# ----------------------------
+# Pipeline entry point
+# ----------------------------
+
+async def process_auctions_to_sheets(start_date: str, end_date: str):
+    """
+    Async entry point for the EIG pipeline (same result dict as eig.process_auctions_to_sheets).
+
+    Browser work runs on the event loop; the blocking Google Sheets calls run
+    in worker threads so the caller's loop is never tied up.
+    """
+    from sheets_webapp import PropertyDataManagerWebApp as PropertyDataManager
+
+    print(f"=== PROCESSING AUCTIONS FROM {start_date} TO {end_date} ===")
+
+    sheets_manager = await asyncio.to_thread(PropertyDataManager)
+
+    print("\n1. Checking already processed auctions...")
+    processed_auctions = await asyncio.to_thread(eig.get_processed_auctions, sheets_manager)
+
+    print("\n2. Finding auctions...")
+    auctions = await find_auctions(start_date, end_date)
+    print(f"Found {len(auctions)} auctions")
+
+    if not auctions:
+        return {
+            "status": "no_auctions",
+            "message": "No auctions found in the specified date range"
+        }
+
+    new_auctions, skipped_auctions = eig.split_new_auctions(auctions, processed_auctions)
+    new_auctions, skipped_auctions = await asyncio.to_thread(eig.resume_unfinished_auctions, new_auctions,
+                                                             skipped_auctions)
+    print(f"\n📊 Auction Summary:")
+    print(f"   ✅ New auctions to process: {len(new_auctions)}")
+    print(f"   ⏭️ Already processed (skipped): {len(skipped_auctions)}")
+
+    due_rechecks = await asyncio.to_thread(get_recheck_queue().due)
+    if due_rechecks:
+        print(f"   🗓️ Price re-checks due: {len(due_rechecks)}")
+
+    if not new_auctions and not due_rechecks:
+        print("🎉 All auctions in this date range have already been processed!")
+        return {
+            "status": "already_processed",
+            "message": "All auctions in the specified date range have already been processed",
+            "total_imported": 0,
+            "total_skipped": 0,
+            "total_lots_found": 0
+        }
+
+    # Stream the lots of every new auction through the pipeline (see eig.process_auctions_to_sheets)
+    print(f"\n3. Streaming {len(new_auctions)} auctions: discover → fetch → parse → price lookup → sheet write")
+    for auction in new_auctions:
+        if not auction.get('detail_url'):
+            print(f"   No detail URL available for auction: {auction.get('name', 'Unknown')}")
+    limiter = AsyncHostRateLimiter()
+    semaphore = asyncio.Semaphore(max(1, DEFAULT_POOL_SIZE))
+    manager = get_async_browser_manager()
+    context = await manager.context('eig')
+    discovered = []
+    async with AsyncEIGHttpClient() as client:
+        pipeline = AsyncPipeline([
+            Stage('discover', lambda auction: discover_lot_tasks(auction, client, context, discovered), queue_size=1,
+                  on_error=lambda auction, error: eig.forget_discovered(discovered, auction)),
+            Stage('fetch', lambda task: fetch_lot_task(task, client, limiter, semaphore), workers=DEFAULT_POOL_SIZE,
+                  on_error=eig.fail_lot_task),
+            Stage('parse', parse_lot_tasks, workers=2, batch_size=eig.LOT_PARSE_BATCH_SIZE, on_error=eig.fail_lot_task),
+            Stage('browser', lambda tasks: load_lot_tasks_in_browser(tasks, context, limiter, semaphore),
+                  batch_size=DEFAULT_POOL_SIZE, on_error=eig.fail_lot_task),
+            Stage('price', lambda tasks: price_lot_tasks(tasks, context), batch_size=eig.EHP_PIPELINE_BATCH_SIZE,
+                  on_error=eig.fail_lot_task),
+            Stage('write', lambda tasks: write_lot_tasks(tasks, sheets_manager), batch_size=SHEET_BATCH_SIZE,
+                  on_error=eig.fail_lot_task),
+        ])
+        tasks = await pipeline.run(_paced_auctions([auction for auction in new_auctions if auction.get('detail_url')]))
+    print(f"🧵 {pipeline.summary()}")
+
+    auction_lots, total_imported, total_skipped = eig.tally_lot_tasks(tasks)
+    total_lots_found = len(tasks)
+    for auction in discovered:
+        await asyncio.to_thread(eig.finish_journaled_auction, auction)
+
+    # English House Prices for the due re-checks
+    try:
+        if due_rechecks:
+            print(f"\n4. Looking up {len(due_rechecks)} re-checks in English House Prices...")
+            await apply_property_prices_batch([entry['lot'] for entry in due_rechecks], context, refresh=True)
+        if get_ehp_cache().pending_revalidation:
+            prices_page = await manager.new_page('eig')
+            try:
+                await revalidate_stale_prices(prices_page)
+            finally:
+                await prices_page.close()
+    finally:
+        await close_async_browser_manager()
+    eig.print_run_stats()
+
+    if due_rechecks:
+        total_imported += await asyncio.to_thread(eig.settle_rechecks, due_rechecks, sheets_manager)
+    await asyncio.to_thread(eig.queue_rechecks, auction_lots)
+    await asyncio.to_thread(eig.prune_snapshots)
+    print(f"📤 {sheets_manager.writer.summary()}")
+
+    return eig.summarize_run(total_imported, total_skipped, total_lots_found, new_auctions, skipped_auctions)
@@ -0,0 +1,480 @@
+#!/usr/bin/env python3
+"""
+Browserless EIG client
+
+Fetches the EIG auction results page, auction detail pages and lot pages as
+plain HTTP using the cookies saved in sessions/eig.json, and parses them with
+BeautifulSoup (lot pages are parsed by lot_parser). eig.py only falls back to
+Playwright when a page comes back without the content we need (login
+redirect or a JavaScript-rendered shell).
+"""
+
+import os
+import re
+import json
+
+import httpx
+from bs4 import BeautifulSoup
+
+from snapshot_store import snapshot_page
+
+EIG_BASE_URL = "https://www.eigpropertyauctions.co.uk"
+EIG_RESULTS_URL = EIG_BASE_URL + "/clients/auctions/results?SelectedAuctioneerId=680"
+EIG_SESSION_FILE = "sessions/eig.json"
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-GB,en;q=0.5',
+}
+
+POSTCODE_PATTERN = r'([A-Z]{1,2}\d{1,2}\s?\d[A-Z]{2})'
+
+
+def load_session_cookies(session_file=EIG_SESSION_FILE):
+    """
+    Load cookies from a Playwright storage_state file into an httpx cookie jar
+
+    Args:
+        session_file: Path to the storage_state JSON saved by login_eig.py
+
+    Returns:
+        httpx.Cookies (empty if the file is missing or unreadable)
+    """
+    cookies = httpx.Cookies()
+    if not os.path.exists(session_file):
+        print(f"⚠️ No session file found at {session_file}, fetching without cookies")
+        return cookies
+
+    try:
+        with open(session_file, 'r') as f:
+            state = json.load(f)
+        for cookie in state.get('cookies', []):
+            cookies.set(
+                cookie['name'],
+                cookie['value'],
+                domain=cookie.get('domain', ''),
+                path=cookie.get('path', '/'),
+            )
+        print(f"📁 Loaded {len(state.get('cookies', []))} cookies from {session_file}")
+    except Exception as e:
+        print(f"⚠️ Error loading session cookies: {e}")
+    return cookies
+
+
+def absolute_url(href):
+    """Turn a relative EIG href into a full URL"""
+    if href and href.startswith("/"):
+        return EIG_BASE_URL + href
+    return href
+
+
+def is_login_page(html, url=""):
+    """Check whether a response is the EIG login page rather than the content we asked for"""
+    if "log-in" in (url or "").lower():
+        return True
+    soup = BeautifulSoup(html, "lxml")
+    title = soup.title.get_text(strip=True) if soup.title else ""
+    return "login" in title.lower() or "log in" in title.lower()
+
+
+def page_needs_javascript(html):
+    """
+    Heuristic for pages that are rendered client-side.
+
+    Server-rendered EIG pages carry their tables and lot details in the HTML;
+    a JavaScript shell has almost no body text.
+    """
+    soup = BeautifulSoup(html, "lxml")
+    for tag in soup(["script", "style", "noscript"]):
+        tag.decompose()
+    body = soup.body
+    body_text = body.get_text(" ", strip=True) if body else ""
+    return len(body_text) < 200
+
+
+def read_page_response(url, response):
+    """
+    Turn an httpx response into (html, final_url).
+
+    Returns (None, final_url) for non-200 responses and login redirects.
+    """
+    final_url = str(response.url)
+    if response.status_code != 200:
+        print(f"    ⚠️ HTTP {response.status_code} for {url}")
+        return None, final_url
+
+    html = response.text
+    if is_login_page(html, final_url):
+        print(f"    ⚠️ Redirected to login page for {url}")
+        return None, final_url
+
+    return html, final_url
+
+
+class EIGHttpClient:
+    """Plain-HTTP client for EIG pages, reusing the saved Playwright session cookies"""
+
+    def __init__(self, session_file=EIG_SESSION_FILE, timeout=30):
+        """
+        Initialize the client
+
+        Args:
+            session_file: Playwright storage_state file with the EIG login cookies
+            timeout: Per-request timeout in seconds
+        """
+        self.client = httpx.Client(
+            headers=DEFAULT_HEADERS,
+            cookies=load_session_cookies(session_file),
+            follow_redirects=True,
+            timeout=timeout,
+        )
+
+    def fetch(self, url):
+        """
+        Fetch a page over HTTP
+
+        Returns:
+            Tuple of (html, final_url), or (None, url) if the request failed
+            or we were redirected to the login page
+        """
+        try:
+            response = self.client.get(url)
+        except Exception as e:
+            print(f"    ⚠️ HTTP error fetching {url}: {e}")
+            return None, url
+        html, final_url = read_page_response(url, response)
+        snapshot_page(url, html)
+        return html, final_url
+
+    def get_results_page(self, url=EIG_RESULTS_URL):
+        """Fetch the auctioneer results page"""
+        return self.fetch(url)
+
+    def get_auction_detail(self, url):
+        """Fetch an auction detail page"""
+        return self.fetch(url)
+
+    def get_lot_page(self, url):
+        """Fetch an individual lot page"""
+        return self.fetch(url)
+
+    def get_document(self, url):
+        """
+        Download a binary document (e.g. a catalogue PDF)
+
+        Returns:
+            The response body, or None if the request failed
+        """
+        try:
+            response = self.client.get(url)
+            response.raise_for_status()
+        except Exception as e:
+            print(f"    ⚠️ HTTP error downloading {url}: {e}")
+            return None
+        return response.content
+
+    def close(self):
+        """Close the underlying HTTP connection pool"""
+        self.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class AsyncEIGHttpClient:
+    """asyncio counterpart of EIGHttpClient for eig_async"""
+
+    def __init__(self, session_file=EIG_SESSION_FILE, timeout=30):
+        self.client = httpx.AsyncClient(
+            headers=DEFAULT_HEADERS,
+            cookies=load_session_cookies(session_file),
+            follow_redirects=True,
+            timeout=timeout,
+        )
+
+    async def fetch(self, url):
+        """Fetch a page over HTTP, returning (html, final_url) like EIGHttpClient.fetch"""
+        try:
+            response = await self.client.get(url)
+        except Exception as e:
+            print(f"    ⚠️ HTTP error fetching {url}: {e}")
+            return None, url
+        html, final_url = read_page_response(url, response)
+        snapshot_page(url, html)
+        return html, final_url
+
+    async def get_results_page(self, url=EIG_RESULTS_URL):
+        return await self.fetch(url)
+
+    async def get_auction_detail(self, url):
+        return await self.fetch(url)
+
+    async def get_lot_page(self, url):
+        return await self.fetch(url)
+
+    async def get_document(self, url):
+        """Download a binary document, returning its body or None like EIGHttpClient.get_document"""
+        try:
+            response = await self.client.get(url)
+            response.raise_for_status()
+        except Exception as e:
+            print(f"    ⚠️ HTTP error downloading {url}: {e}")
+            return None
+        return response.content
+
+    async def close(self):
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+
+# ----------------------------
+# Results page parsing
+# ----------------------------
+
+AUCTION_LINK_SELECTORS = [
+    "a.catalogue-link",
+    "a[href*='auction']",
+    ".auction-link",
+    "a[href*='catalogue']",
+    "a[href*='results']",
+    ".auction-result a",
+    ".result-item a"
+]
+
+
+def parse_results_table_rows(html):
+    """
+    Extract the data rows of every table on the results page.
+
+    Returns:
+        List of dicts with 'cells' (stripped cell texts) and 'href' (first link in the row)
+    """
+    soup = BeautifulSoup(html, "lxml")
+    rows = []
+    for table in soup.find_all("table"):
+        for row in table.find_all("tr")[1:]:  # Skip header row
+            cells = [cell.get_text(strip=True) for cell in row.find_all(["td", "th"])]
+            link = row.find("a")
+            rows.append({
+                'cells': cells,
+                'href': link.get("href") if link else None
+            })
+    return rows
+
+
+def parse_auction_links(html):
+    """
+    Find auction links on the results page using the same selector cascade as
+    the browser path.
+
+    Returns:
+        List of (text, href) tuples from the first selector that matches
+    """
+    soup = BeautifulSoup(html, "lxml")
+    for selector in AUCTION_LINK_SELECTORS:
+        links = soup.select(selector)
+        if links:
+            print(f"Found {len(links)} links with selector: {selector}")
+            return [(link.get_text(), link.get("href")) for link in links]
+    return []
+
+
+# ----------------------------
+# Auction detail page parsing
+# ----------------------------
+
+def extract_lot_urls(html):
+    """Extract every lot URL linked from an auction detail page"""
+    soup = BeautifulSoup(html, "lxml")
+    lot_urls = []
+    for link in soup.select("a[href*='/lot/']"):
+        href = link.get("href")
+        if href and "/lot/" in href:
+            lot_urls.append(absolute_url(href))
+    return lot_urls
+
+
+CATALOGUE_RESULT_PATTERN = (
+    r'(sold\s+prior[^.|\n]*|sold\s+(?:post|after)[^.|\n]*|sold(?:\s+for|\s+at)?\s+£[\d,]+|unsold[^.|\n]*|'
+    r'not\s+sold[^.|\n]*|withdrawn[^.|\n]*|postponed[^.|\n]*)'
+)
+CATALOGUE_LOT_NUMBER_PATTERN = r'\bLot\s*(?:No\.?|Number)?\s*:?\s*(\d{1,4}[A-Za-z]?)\b'
+
+
+def _lot_block(link):
+    """Largest ancestor of a lot link that contains no other lot's link (the lot's card/row)"""
+    own_url = absolute_url(link.get("href"))
+    block = link
+    while block.parent is not None and block.parent.name not in ("body", "html", "[document]"):
+        urls = {absolute_url(a.get("href")) for a in block.parent.select("a[href*='/lot/']")}
+        if urls - {own_url}:
+            break
+        block = block.parent
+    return block
+
+
+def _catalogue_address(block, link):
+    """Address of a lot card: an address-like element with a postcode, else the element ending in one, else the link text"""
+    for selector in LOT_ADDRESS_SELECTORS:
+        for elem in block.select(selector):
+            text = elem.get_text(" ", strip=True)
+            if len(text) > 5 and re.search(POSTCODE_PATTERN, text, re.IGNORECASE):
+                return text
+    for string in block.find_all(string=re.compile(POSTCODE_PATTERN, re.IGNORECASE)):
+        # The element holding the postcode line, its lines joined ("3 Mill Lane<br>York YO1 7HH")
+        lines = [" ".join(part.split()) for part in string.parent.stripped_strings]
+        text = ", ".join(line for line in lines if line)
+        if len(text) > 5 and len(text) < 200 and re.search(POSTCODE_PATTERN + r'$', text, re.IGNORECASE):
+            return text
+    text = link.get_text(" ", strip=True)
+    return text if len(text) > 10 else ""
+
+
+def parse_auction_catalogue(html):
+    """
+    Build the lot index of an auction from its detail page in one pass.
+
+    Each lot link's card (the largest element around it holding no other
+    lot's link) is read for the lot number, address, result and guide price,
+    so lot pages only need opening for whatever the listing leaves out.
+
+    Returns:
+        List of {'lot_number', 'address', 'postcode', 'auction_sale', 'guide_price', 'lot_url',
+        'document_url'} dicts in page order, one per distinct lot URL ('' / None for fields the listing lacks)
+    """
+    soup = BeautifulSoup(html, "lxml")
+    entries = {}
+    for link in soup.select("a[href*='/lot/']"):
+        lot_url = absolute_url(link.get("href"))
+        if not lot_url or "/lot/" not in lot_url:
+            continue
+        entry = entries.setdefault(lot_url, {
+            'lot_number': '', 'address': '', 'postcode': '', 'auction_sale': '', 'guide_price': None, 'lot_url': lot_url,
+            'document_url': ''
+        })
+
+        block = _lot_block(link)
+        text = " ".join(block.get_text(" ").split())
+
+        if not entry['lot_number']:
+            match = re.search(CATALOGUE_LOT_NUMBER_PATTERN, text, re.IGNORECASE)
+            if match:
+                entry['lot_number'] = match.group(1)
+        if not entry['address']:
+            address = _catalogue_address(block, link)
+            address = re.sub(r'^Lot\s*\d+[A-Za-z]?\s*[-:.]?\s*', '', address, flags=re.IGNORECASE)
+            postcode_match = re.search(POSTCODE_PATTERN + r'$', address, re.IGNORECASE)
+            if postcode_match:
+                entry['address'] = address
+                entry['postcode'] = postcode_match.group(1).upper()
+        if not entry['auction_sale']:
+            match = re.search(CATALOGUE_RESULT_PATTERN, text, re.IGNORECASE)
+            if match:
+                entry['auction_sale'] = match.group(1).strip()
+        if not entry['guide_price']:
+            for pattern in GUIDE_PRICE_PATTERNS:
+                match = re.search(pattern, text, re.IGNORECASE)
+                if match:
+                    entry['guide_price'] = f"£{match.group(1)}"
+                    break
+        if not entry['document_url']:
+            document = block.select_one("a[href$='.pdf'], a[href*='.pdf?']")
+            if document:
+                entry['document_url'] = absolute_url(document.get("href"))
+    return list(entries.values())
+
+
+def extract_auction_results(html):
+    """
+    HTML equivalent of eig.extract_auction_results_table: auction URLs from
+    tables that have a 'Lots' column.
+    """
+    soup = BeautifulSoup(html, "lxml")
+    auction_urls = []
+    for table in soup.find_all("table"):
+        headers = [cell.get_text(strip=True).lower() for cell in table.find_all(["th", "td"])]
+        lots_column_index = next((j for j, text in enumerate(headers) if "lots" in text), -1)
+        if lots_column_index < 0:
+            continue
+        for row in table.find_all("tr"):
+            if len(row.find_all("td")) > lots_column_index:
+                for link in row.select("a[href*='auction']"):
+                    href = link.get("href")
+                    if href and "/auction" in href:
+                        auction_urls.append(absolute_url(href))
+    return auction_urls
+
+
+def extract_auction_date(html):
+    """Find an auction date on the detail page when the caller did not supply one"""
+    soup = BeautifulSoup(html, "lxml")
+    for elem in soup.select(".auction-date, .date, [class*='date'], .event-date"):
+        text = elem.get_text(strip=True)
+        if text and any(char.isdigit() for char in text):
+            return text
+
+    page_text = soup.get_text()
+    for pattern in [r'\d{1,2}/\d{1,2}/\d{4}', r'\d{1,2}\s+\w+\s+\d{4}', r'\d{4}-\d{2}-\d{2}']:
+        match = re.search(pattern, page_text)
+        if match:
+            return match.group(0)
+    return ""
+
+
+# ----------------------------
+# Lot page parsing
+# ----------------------------
+
+LOT_ADDRESS_SELECTORS = [
+    ".lot-address",
+    ".address",
+    ".property-address",
+    "[class*='address']",
+    "h1", "h2", "h3", "h4", "h5",
+    ".lot-title",
+    ".property-title",
+    ".lot-description",
+    ".property-description"
+]
+
+LOT_NUMBER_SELECTORS = [
+    ".lot-number",
+    "[class*='lot-number']",
+    ".lot-no",
+    "[class*='lot-no']",
+    ".lot",
+    "[class*='lot']",
+    "h1", "h2", "h3", "h4", "h5"
+]
+
+AUCTION_SALE_SELECTORS = [
+    ".text-end h2",
+    ".text-end h3",
+    ".text-end",
+    "h2", "h3",
+    ".auction-result",
+    ".lot-result",
+    ".sale-status",
+    ".auction-status",
+    "[class*='result']",
+    "[class*='sale']",
+    "[class*='status']",
+    ".price",
+    ".sold-price",
+    ".auction-price"
+]
+
+GUIDE_PRICE_PATTERNS = [
+    r'Guide\s+Price.*?£([\d,]+(?:,\d{3})*\+?)',
+    r'Estimate.*?£([\d,]+(?:,\d{3})*\+?)',
+    r'Guide.*?£([\d,]+(?:,\d{3})*\+?)',
+]
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Membership index of lots already ingested into the sheet
+
+Auction-level dedup (auction_name_auction_date) cannot tell which lots of a
+partly processed or re-published auction are new. IngestedLots keeps every
+imported lot URL in an exact SQLite set, fronted by an in-memory Bloom filter
+so the common "never seen" answer costs a few bit lookups and no query.
+parse_event_days drops ingested lots before any lot page is opened.
+"""
+
+import os
+import math
+import time
+import sqlite3
+import hashlib
+import threading
+
+INGESTED_LOTS_PATH = os.getenv('INGESTED_LOTS_PATH', 'cache/ingested_lots.sqlite')
+INGESTED_LOTS_ENABLED = os.getenv('INGESTED_LOTS', 'true').lower() != 'false'
+
+BLOOM_FALSE_POSITIVE_RATE = 0.001
+BLOOM_MIN_CAPACITY = 10_000
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing of one SHA-1 digest)"""
+
+    def __init__(self, capacity, false_positive_rate=BLOOM_FALSE_POSITIVE_RATE):
+        """
+        Size the filter
+
+        Args:
+            capacity: Number of items it is sized for
+            false_positive_rate: Target false positive rate at capacity
+        """
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        digest = hashlib.sha1(item.encode('utf-8')).digest()
+        first = int.from_bytes(digest[:8], 'big')
+        second = int.from_bytes(digest[8:16], 'big') | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class IngestedLots:
+    """Persisted set of ingested lot URLs with a Bloom filter in front"""
+
+    def __init__(self, path=INGESTED_LOTS_PATH):
+        """
+        Open (or create) the index and build its Bloom filter
+
+        Args:
+            path: SQLite file (created with its directory if missing)
+        """
+        self.path = path
+        self.stats = {'checked': 0, 'bloom_negative': 0, 'ingested': 0}
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS ingested_lots (lot_url TEXT PRIMARY KEY, ingested_at REAL NOT NULL)")
+        self._db.commit()
+        self._rebuild_bloom()
+
+    def _rebuild_bloom(self):
+        """Size a new Bloom filter for twice the current set and load every URL into it"""
+        urls = [url for url, in self._db.execute("SELECT lot_url FROM ingested_lots")]
+        self._bloom = BloomFilter(max(BLOOM_MIN_CAPACITY, 2 * len(urls)))
+        for url in urls:
+            self._bloom.add(url)
+
+    def add_many(self, lot_urls):
+        """Record lot URLs as ingested (empty and already known URLs are ignored)"""
+        now = time.time()
+        with self._lock:
+            new = [url for url in set(lot_urls) if url and (url not in self._bloom or not self._exact(url))]
+            if not new:
+                return
+            self._db.executemany(
+                "INSERT OR IGNORE INTO ingested_lots (lot_url, ingested_at) VALUES (?, ?)", [(url, now) for url in new]
+            )
+            self._db.commit()
+            if self._bloom.count + len(new) > self._bloom.capacity:
+                self._rebuild_bloom()
+            else:
+                for url in new:
+                    self._bloom.add(url)
+
+    def add(self, lot_url):
+        """Record one lot URL as ingested"""
+        self.add_many([lot_url])
+
+    def _exact(self, lot_url):
+        return self._db.execute("SELECT 1 FROM ingested_lots WHERE lot_url = ?", (lot_url,)).fetchone() is not None
+
+    def __contains__(self, lot_url):
+        with self._lock:
+            self.stats['checked'] += 1
+            if not lot_url or lot_url not in self._bloom:
+                self.stats['bloom_negative'] += 1
+                return False
+            found = self._exact(lot_url)
+            self.stats['ingested'] += found
+            return found
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM ingested_lots").fetchone()[0]
+
+    def summary(self):
+        """One-line human readable summary"""
+        with self._lock:
+            return (f"Ingested lots index: {self.stats['checked']} checked, {self.stats['ingested']} already ingested "
+                    f"({self.stats['bloom_negative']} answered by the Bloom filter alone)")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_ingested_lots():
+    """Return the process-wide IngestedLots, or None when INGESTED_LOTS=false"""
+    global _index
+    if not INGESTED_LOTS_ENABLED:
+        return None
+    with _index_lock:
+        if _index is None:
+            _index = IngestedLots()
+        return _index
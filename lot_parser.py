@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Pure-HTML lot page parser
+
+Runs the declarative lot_rules spec (the same rules extract_fields evaluates
+inside the browser) over an HTML string with BeautifulSoup/lxml, so lot
+pages fetched over HTTP or read back from the snapshot store are parsed
+without a browser tab. parse_lot_pages() spreads a batch of pages over a
+process pool, leaving the scraper itself to just fetch bytes.
+"""
+
+import os
+import re
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from bs4 import BeautifulSoup, Comment, NavigableString
+
+from lot_rules import LOT_PAGE_RULES, expand_rules, resolve_fields, postcode_from_address
+
+LOT_PARSER_WORKERS = int(os.getenv('LOT_PARSER_WORKERS', str(os.cpu_count() or 1)))
+
+# Below this many pages a batch is parsed in-process (not worth the pickling)
+MIN_POOL_BATCH = 4
+
+REGEX_FLAGS = {'i': re.IGNORECASE, 'm': re.MULTILINE, 's': re.DOTALL}
+
+
+def _own_text_contains(elem, needle):
+    """True if one of the element's own text nodes (not its children's) contains the needle"""
+    return any(
+        isinstance(child, NavigableString) and not isinstance(child, Comment) and needle in child.lower()
+        for child in elem.children
+    )
+
+
+def _candidates(soup, rule, sources):
+    """Texts a rule reads from the document (the Python side of RUNNER_JS candidates())"""
+    if 'source' in rule:
+        return [sources.get(rule['source']) or '']
+    if 'label' in rule:
+        needle = rule['label'].lower()
+        texts = []
+        for elem in (soup.body or soup).find_all(True):
+            if _own_text_contains(elem, needle) and elem.parent is not None:
+                texts.extend(sibling.get_text().strip() for sibling in elem.parent.find_all(True))
+        return texts
+    if rule.get('scan') == 'all':
+        return [elem.get_text().strip() for elem in soup.select(rule['selector'])]
+    elem = soup.select_one(rule['selector'])
+    return [elem.get_text().strip()] if elem else []
+
+
+def _capture(rule, text):
+    """A rule's value from one candidate text, or None (the Python side of RUNNER_JS capture())"""
+    if not text:
+        return None
+    if rule.get('min_length') and len(text) < rule['min_length']:
+        return None
+    if rule.get('max_length') and len(text) > rule['max_length']:
+        return None
+    if not rule.get('pattern'):
+        return text
+    flags = 0
+    for flag in rule.get('flags', ''):
+        flags |= REGEX_FLAGS.get(flag, 0)
+    match = re.search(rule['pattern'], text, flags)
+    if not match:
+        return None
+    if rule.get('value') == 'text':
+        return text
+    if rule.get('template'):
+        return re.sub(r'\{(\d+)\}', lambda group: match.group(int(group.group(1))) or '', rule['template'])
+    return (match.group(1) or '') if match.re.groups else match.group(0)
+
+
+def extract_fields_from_html(html, spec=LOT_PAGE_RULES, url=""):
+    """
+    Run a rule spec over page HTML, like lot_rules.extract_fields does on a live page.
+
+    Args:
+        html: Page HTML
+        spec: Rule spec (LOT_PAGE_RULES by default)
+        url: URL of the page (the 'url' source)
+
+    Returns:
+        (values, matched, page_info) - page_info holds the page 'title' and 'url'
+    """
+    soup = BeautifulSoup(html, "lxml")
+    title = soup.title.get_text() if soup.title else ""
+    sources = {'body': soup.body.get_text() if soup.body else '', 'title': title, 'url': url}
+
+    raw = {}
+    for field, rules in expand_rules(spec).items():
+        raw[field] = []
+        for index, rule in enumerate(rules):
+            try:
+                for text in _candidates(soup, rule, sources):
+                    value = _capture(rule, text)
+                    if value is not None:
+                        raw[field].append([index, value])
+            except Exception:  # Selectors soupsieve cannot parse are skipped, as the browser would
+                continue
+    values, matched = resolve_fields(spec, raw)
+    return values, matched, {'title': title, 'url': url}
+
+
+def parse_lot_html(html, lot_number=0, lot_url=""):
+    """
+    Extract lot data from lot page HTML.
+
+    Args:
+        html: Lot page HTML
+        lot_number: Sequential lot number (fallback)
+        lot_url: URL of the lot page
+
+    Returns:
+        Dict with lot data (the fields of eig.extract_lot_data_from_page, without
+        the English House Prices lookup), or None if the page does not show a lot
+        (login page, no address) and needs the browser
+    """
+    fields, _, page_info = extract_fields_from_html(html, LOT_PAGE_RULES, lot_url)
+
+    address = fields['address'] or ''
+    if not address or 'login' in address.lower() or 'sign in' in address.lower():
+        return None
+    if 'login' in page_info['title'].lower() or 'sign in' in page_info['title'].lower():
+        return None
+
+    return {
+        'lot_number': fields['lot_number'] or str(lot_number),
+        'address': address,
+        'auction_sale': fields['auction_sale'] or '',
+        'guide_price': fields['guide_price'],
+        'purchase_price': '',
+        'sale_date': '',
+        'postcode': postcode_from_address(address),
+        'found_in_prices': False,
+    }
+
+
+def _parse_page(page):
+    html, lot_number, lot_url = page
+    try:
+        return parse_lot_html(html, lot_number, lot_url)
+    except Exception as e:
+        print(f"    ⚠️ Could not parse lot page {lot_url}: {e}")
+        return None
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_parser_pool():
+    """Return the process-wide ProcessPoolExecutor used for lot parsing"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Forking a process that runs pipeline threads and a Playwright driver
+            # can deadlock the children, so workers start from a fresh interpreter
+            _pool = ProcessPoolExecutor(max_workers=max(1, LOT_PARSER_WORKERS),
+                                        mp_context=multiprocessing.get_context('spawn'))
+        return _pool
+
+
+def parse_lot_pages(pages):
+    """
+    Parse a batch of lot pages across all cores.
+
+    Args:
+        pages: List of (html, lot_number, lot_url) tuples
+
+    Returns:
+        List of lot dicts (None for pages that need the browser), in input order
+    """
+    if len(pages) < MIN_POOL_BATCH or LOT_PARSER_WORKERS <= 1:
+        return [_parse_page(page) for page in pages]
+    chunksize = max(1, len(pages) // (LOT_PARSER_WORKERS * 4))
+    return list(get_parser_pool().map(_parse_page, pages, chunksize=chunksize))
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Declarative field-extraction rules for EIG lot pages
+
+Each field has an ordered list of rules; the first rule that yields a value
+wins. A rule reads text from one of:
+
+    selectors  CSS selectors tried in order (first element, or every element with scan='all')
+    label      elements whose own text contains the label; their parent's descendants are scanned
+    source     'body' (page text), 'title' or 'url'
+
+and then filters it with min_length / max_length and an optional regex
+(pattern + JS-style flags). The value is the first capture group (or the whole
+match), the element's whole text with value='text', or a '{1}, {2}' template
+of groups. A Python normalizer named by 'normalize' is applied afterwards.
+
+compile_rules() turns a spec into one JavaScript function, so extract_fields()
+reads every field of a lot page in a single page.evaluate round trip and also
+reports which rule matched each field. Patterns must stay valid in both Python
+and JavaScript regex syntax.
+"""
+
+import json
+import re
+from functools import lru_cache
+
+import eig_http
+
+PRICE = r'£([\d,]+(?:,\d{3})*)'
+PRICE_PLUS = r'£([\d,]+(?:,\d{3})*\+?)'
+
+SALE_STATUS_KEYWORDS = ['sold', 'withdrawn', 'reserved', 'unsold', 'passed', 'cancelled', 'postponed', 'adjourned', 'auction', 'lot']
+
+GUIDE_PRICE_RULES = [
+    {'label': 'Guide Price', 'pattern': PRICE_PLUS, 'normalize': 'pounds'},
+    {'label': 'Estimate', 'pattern': PRICE_PLUS, 'normalize': 'pounds'},
+    {'selectors': [".guide-price", ".estimate", "[class*='guide']", "[class*='estimate']", ".price", "[class*='price']",
+                   "h2", "h3", "h4", "h5", "h6", ".lot-description", ".property-description"],
+     'pattern': PRICE_PLUS, 'normalize': 'pounds'},
+] + [
+    {'source': 'body', 'pattern': pattern, 'flags': 'i', 'normalize': 'pounds'}
+    for pattern in eig_http.GUIDE_PRICE_PATTERNS
+]
+
+LOT_PAGE_RULES = {
+    'lot_number': [
+        {'label': 'Lot Number', 'pattern': r'(\d+[A-Za-z]*)', 'max_length': 6},
+        {'selectors': eig_http.LOT_NUMBER_SELECTORS, 'pattern': r'^(\d{1,4})$'},
+        {'source': 'body', 'pattern': r'Lot(?:\s+Number)?\s+(\d+)', 'flags': 'i'},
+        {'source': 'url', 'pattern': r'/lot/[^/?]*?(\d+)'},
+    ],
+    'address': [
+        {'selectors': eig_http.LOT_ADDRESS_SELECTORS, 'min_length': 6},
+        # "... Lot 12 - 1 High Street, Town AB1 2CD"
+        {'source': 'title', 'pattern': r'^(?=.*lot).* - (.{6,}?)\s*$', 'flags': 'i'},
+        # Line with a comma right before the first postcode on the page
+        {'source': 'body', 'pattern': r'([^\n]{5,}?,[^\n]*?)[\s,]*' + eig_http.POSTCODE_PATTERN,
+         'flags': 'i', 'template': '{1}, {2}'},
+    ],
+    'auction_sale': [
+        {'selectors': eig_http.AUCTION_SALE_SELECTORS, 'scan': 'all', 'min_length': 4, 'value': 'text',
+         'pattern': r'£[\d,]+|sold|unsold|withdrawn|reserved|auctioneer', 'flags': 'i'},
+        {'source': 'body', 'pattern': r'Sold\s+for\s+' + PRICE, 'flags': 'i', 'normalize': 'pounds'},
+        {'source': 'body', 'pattern': r'Sold\s+at\s+' + PRICE, 'flags': 'i', 'normalize': 'pounds'},
+        {'source': 'body', 'pattern': r'Price\s+' + PRICE, 'flags': 'i', 'normalize': 'pounds'},
+        {'source': 'body', 'pattern': PRICE, 'normalize': 'pounds'},
+    ] + [
+        {'source': 'body', 'pattern': r'([^.]{0,94}' + keyword + r'[^.]{0,94})', 'flags': 'i', 'normalize': 'sentence'}
+        for keyword in SALE_STATUS_KEYWORDS
+    ],
+    'guide_price': GUIDE_PRICE_RULES,
+    'catalogue_entry': [
+        {'selectors': ["a", "button"], 'scan': 'all', 'pattern': r'catalogue entry', 'flags': 'i', 'value': 'text'},
+    ],
+}
+
+NORMALIZERS = {
+    'pounds': lambda value: f"£{value}",
+    'upper': lambda value: value.upper(),
+    # Keyword sentences only count at a reasonable length (6-99 characters)
+    'sentence': lambda value: value.strip() if 5 < len(value.strip()) < 100 else None,
+}
+
+RUNNER_JS = r"""
+    const clean = text => (text || '').trim();
+    const sources = {
+        body: document.body ? (document.body.textContent || '') : '',
+        title: document.title || '',
+        url: location.href
+    };
+    const labelled = label => {
+        const needle = label.toLowerCase();
+        const found = [];
+        for (const el of document.querySelectorAll('body *')) {
+            for (const node of el.childNodes) {
+                if (node.nodeType === 3 && node.textContent.toLowerCase().includes(needle)) {
+                    found.push(el);
+                    break;
+                }
+            }
+        }
+        return found;
+    };
+    const candidates = rule => {
+        if (rule.source) return [sources[rule.source] || ''];
+        if (rule.label) {
+            const texts = [];
+            for (const el of labelled(rule.label)) {
+                if (!el.parentElement) continue;
+                for (const sibling of el.parentElement.querySelectorAll('*')) texts.push(clean(sibling.textContent));
+            }
+            return texts;
+        }
+        if (rule.scan === 'all') return Array.from(document.querySelectorAll(rule.selector)).map(el => clean(el.textContent));
+        const el = document.querySelector(rule.selector);
+        return el ? [clean(el.textContent)] : [];
+    };
+    const capture = (rule, text) => {
+        if (!text) return null;
+        if (rule.min_length && text.length < rule.min_length) return null;
+        if (rule.max_length && text.length > rule.max_length) return null;
+        if (!rule.pattern) return text;
+        const match = new RegExp(rule.pattern, rule.flags || '').exec(text);
+        if (!match) return null;
+        if (rule.value === 'text') return text;
+        if (rule.template) return rule.template.replace(/\{(\d+)\}/g, (_, i) => match[+i] || '');
+        return match.length > 1 ? (match[1] || '') : match[0];
+    };
+    const result = {};
+    for (const [field, rules] of Object.entries(spec)) {
+        result[field] = [];
+        rules.forEach((rule, index) => {
+            try {
+                for (const text of candidates(rule)) {
+                    const value = capture(rule, text);
+                    if (value !== null) result[field].push([index, value]);
+                }
+            } catch (e) {}
+        });
+    }
+    result._page = {title: sources.title, url: sources.url};
+    return result;
+"""
+
+
+def expand_rules(spec):
+    """Split every multi-selector rule into one rule per selector (order preserved)"""
+    expanded = {}
+    for field, rules in spec.items():
+        expanded[field] = []
+        for rule in rules:
+            if 'selectors' in rule:
+                for selector in rule['selectors']:
+                    single = {key: value for key, value in rule.items() if key != 'selectors'}
+                    single['selector'] = selector
+                    expanded[field].append(single)
+            else:
+                expanded[field].append(dict(rule))
+    return expanded
+
+
+@lru_cache(maxsize=None)
+def _compile(spec_json):
+    return "() => {\n    const spec = " + spec_json + ";\n" + RUNNER_JS + "}"
+
+
+def compile_rules(spec):
+    """Compile a rule spec into the JavaScript function run by page.evaluate"""
+    return _compile(json.dumps(expand_rules(spec), sort_keys=True))
+
+
+def describe_rule(rule):
+    """Short human readable name of a rule, for logging which one matched"""
+    if 'selector' in rule:
+        return f"selector {rule['selector']}"
+    if 'label' in rule:
+        return f"label '{rule['label']}'"
+    return f"{rule['source']} /{rule.get('pattern', '')}/"
+
+
+def resolve_fields(spec, raw):
+    """
+    Pick each field's value from the candidates the page returned.
+
+    Candidates arrive as [rule index, value] pairs in rule order; the first
+    one that survives its rule's normalizer wins.
+
+    Returns:
+        (values, matched) - field -> value (None if nothing matched) and field -> rule description
+    """
+    rules = expand_rules(spec)
+    values, matched = {}, {}
+    for field, field_rules in rules.items():
+        values[field] = None
+        for index, value in raw.get(field) or []:
+            rule = field_rules[index]
+            normalizer = NORMALIZERS.get(rule.get('normalize'))
+            value = normalizer(value) if normalizer else value
+            if value:
+                values[field] = value
+                matched[field] = describe_rule(rule)
+                break
+    return values, matched
+
+
+def extract_fields(page, spec=LOT_PAGE_RULES):
+    """
+    Run a rule spec against a sync Playwright page in one round trip.
+
+    Returns:
+        (values, matched, page_info) - page_info holds the page 'title' and 'url'
+    """
+    raw = page.evaluate(compile_rules(spec))
+    values, matched = resolve_fields(spec, raw)
+    return values, matched, raw.get('_page', {})
+
+
+async def extract_fields_async(page, spec=LOT_PAGE_RULES):
+    """playwright.async_api version of extract_fields"""
+    raw = await page.evaluate(compile_rules(spec))
+    values, matched = resolve_fields(spec, raw)
+    return values, matched, raw.get('_page', {})
+
+
+def postcode_from_address(address):
+    """Trailing postcode of an address (upper-cased), else its last word"""
+    match = re.search(eig_http.POSTCODE_PATTERN + r'$', address, re.IGNORECASE)
+    if match:
+        return match.group(1).upper()
+    parts = address.split()
+    return parts[-1] if len(parts) >= 2 else ''
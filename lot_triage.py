@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Auction-outcome triage for lots
+
+A large share of every auction is withdrawn, postponed or unsold, and for
+those lots the catalogue-entry click, the English House Prices lookup and the
+listing enrichment produce nothing worth importing. triage_lot() classifies a
+lot's outcome once, from the auction results row when there is one and else
+from the lot page header (auction_sale), and TRIAGE_POLICY decides which
+downstream steps still run for that outcome.
+
+Counters record how many lots had each outcome and how many steps were
+skipped; the summary is printed at the end of a run.
+"""
+
+import os
+import re
+import threading
+
+LOT_TRIAGE_ENABLED = os.getenv('LOT_TRIAGE', 'true').lower() != 'false'
+
+STEPS = ('catalogue', 'ehp', 'enrichment')
+
+# Checked in order; the first outcome whose pattern matches wins
+OUTCOME_PATTERNS = [
+    ('withdrawn', r'\bwithdrawn\b'),
+    ('postponed', r'\b(?:postponed|adjourned|cancelled)\b'),
+    ('unsold', r'\b(?:unsold|not sold|no bids?|passed in)\b'),
+    ('sold_prior', r'\bsold\s+prior\b'),
+    ('sold_post', r'\bsold\s+(?:post|after)\b'),
+    ('sold', r'\bsold\b|£\s?\d'),
+]
+
+# Outcome -> downstream steps worth running
+TRIAGE_POLICY = {
+    'sold': set(STEPS),
+    'sold_prior': set(STEPS),
+    'sold_post': set(STEPS),
+    'unknown': set(STEPS),  # No outcome yet (or an unfamiliar one): do everything, as before
+    'unsold': set(),
+    'withdrawn': set(),
+    'postponed': set(),
+}
+
+
+def classify_outcome(text):
+    """Auction outcome ('sold', 'withdrawn', ... or 'unknown') from a results row or sale status text"""
+    lowered = (text or '').lower()
+    for outcome, pattern in OUTCOME_PATTERNS:
+        if re.search(pattern, lowered):
+            return outcome
+    return 'unknown'
+
+
+class TriageStats:
+    """Thread-safe counters of lot outcomes and skipped steps"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.outcomes = {}
+        self.skipped = {step: 0 for step in STEPS}
+
+    def record_outcome(self, outcome):
+        with self._lock:
+            self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+
+    def record_skip(self, step):
+        with self._lock:
+            self.skipped[step] = self.skipped.get(step, 0) + 1
+
+    def summary(self):
+        """One-line human readable summary"""
+        with self._lock:
+            outcomes = ", ".join(f"{count} {outcome}" for outcome, count in sorted(self.outcomes.items()))
+            skipped = ", ".join(f"{count} {step}" for step, count in self.skipped.items() if count)
+            return f"Lot triage: {outcomes or 'no lots'}; skipped {skipped or 'nothing'}"
+
+
+_stats = TriageStats()
+
+
+def get_triage_stats():
+    """Return the process-wide TriageStats"""
+    return _stats
+
+
+def triage_lot(lot, results_text=None):
+    """
+    Classify a lot's outcome (once) and store it on the lot as 'outcome'.
+
+    Args:
+        lot: Lot dict (auction_sale is used when there is no results row)
+        results_text: The lot's row from the auction results table, if known
+
+    Returns:
+        The outcome
+    """
+    if lot.get('outcome'):
+        return lot['outcome']
+    outcome = classify_outcome(results_text)
+    if outcome == 'unknown':
+        outcome = classify_outcome(lot.get('auction_sale'))
+    lot['outcome'] = outcome
+    _stats.record_outcome(outcome)
+    return outcome
+
+
+def outcome_needs(outcome, step):
+    """True if TRIAGE_POLICY runs a step for an outcome (nothing is counted; for planning ahead)"""
+    return not LOT_TRIAGE_ENABLED or step in TRIAGE_POLICY.get(outcome, TRIAGE_POLICY['unknown'])
+
+
+def should_run(lot, step):
+    """
+    True if a downstream step is worth running for the lot (counts the skip if not).
+
+    Lots are triaged on first use, so this also works for rows read back from the sheet.
+    """
+    if not LOT_TRIAGE_ENABLED or outcome_needs(triage_lot(lot), step):
+        return True
+    _stats.record_skip(step)
+    return False
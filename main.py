@@ -3,7 +3,7 @@ from pydantic import BaseModel
 from typing import Optional
 import os
 import requests
-from eig import process_auctions_to_sheets
+from eig_async import process_auctions_to_sheets
 
 app = FastAPI()
 
@@ -16,8 +16,8 @@ class RunEIGRequest(BaseModel):
     end_date: str
 
 @app.post("/eig/run_pipeline", operation_id="run_eig_pipeline")
-def run_pipeline(req: RunEIGRequest):
-    result = process_auctions_to_sheets(req.start_date, req.end_date)
+async def run_pipeline(req: RunEIGRequest):
+    result = await process_auctions_to_sheets(req.start_date, req.end_date)
     return result
 
 # ----------------------------
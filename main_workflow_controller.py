@@ -22,7 +22,21 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 import eig
 from run_listing_enrichment_workflow import ListingEnrichmentWorkflow
-from sheets_webapp import PropertyDataManagerWebApp
+from sheets_webapp import PropertyDataManagerWebApp, wait_for_write
+from browser_manager import close_browser_thread
+
+def write_succeeded(write):
+    """
+    Whether a queued write reached the sheet (once the writer has sent it)
+    
+    Args:
+        write: add_property result, or a SheetWriter Future
+    """
+    if isinstance(write, dict):
+        result = wait_for_write(write)
+        # 'added_local' only reached the local backup
+        return result.get('status') == 'success' and result.get('action') == 'added'
+    return bool(write.result().get('ok'))
 
 class MainWorkflowController:
     def __init__(self):
@@ -135,7 +149,7 @@ class MainWorkflowController:
             property_data (dict): Property data from EIG scraper
             
         Returns:
-            bool: True if successfully processed
+            The queued sheet write (see settle_writes), or None if nothing was queued
         """
         print(f"\n🔄 Processing OLDER AUCTION: {property_data.get('address', 'Unknown')}")
         
@@ -165,20 +179,14 @@ class MainWorkflowController:
                     property_data['qa_status'] = 'enrichment_failed'
                 
                 # Import to AUCTION_MASTER
-                success = self.sheets_manager.add_property(property_data)
-                if success:
-                    print(f"   ✅ Successfully imported to AUCTION_MASTER")
-                    return True
-                else:
-                    print(f"   ❌ Failed to import to AUCTION_MASTER")
-                    return False
+                return self.import_property(property_data)
                     
             except Exception as e:
                 print(f"   ❌ Error during enrichment: {e}")
-                return False
+                return None
         else:
             print(f"   ⏭️ Purchase price criteria not met - skipping")
-            return False
+            return None
     
     def process_newer_auction(self, property_data):
         """
@@ -188,7 +196,7 @@ class MainWorkflowController:
             property_data (dict): Property data from EIG scraper
             
         Returns:
-            bool: True if successfully processed
+            The queued sheet write (see settle_writes), or None if nothing was queued
         """
         print(f"\n🔄 Processing NEWER AUCTION: {property_data.get('address', 'Unknown')}")
         
@@ -200,14 +208,7 @@ class MainWorkflowController:
             
             # Direct import to AUCTION_MASTER
             property_data['qa_status'] = 'direct_import'
-            success = self.sheets_manager.add_property(property_data)
-            
-            if success:
-                print(f"   ✅ Successfully imported to AUCTION_MASTER")
-                return True
-            else:
-                print(f"   ❌ Failed to import to AUCTION_MASTER")
-                return False
+            return self.import_property(property_data)
         else:
             print(f"   ⏭️ Purchase price criteria not met - storing in POTENTIAL_TRADES")
             
@@ -215,69 +216,85 @@ class MainWorkflowController:
             property_data['qa_status'] = 'pending_enrichment'
             property_data['added_to_potential_trades'] = datetime.now().isoformat()
             
-            success = self.add_to_potential_trades(property_data)
+            return self.add_to_potential_trades(property_data)
+    
+    def import_property(self, property_data):
+        """
+        Queue a property for AUCTION_MASTER (sent with the sheet writer's next batch)
+        
+        Args:
+            property_data (dict): Property data
             
-            if success:
-                print(f"   ✅ Successfully stored in POTENTIAL_TRADES")
-                return True
-            else:
-                print(f"   ❌ Failed to store in POTENTIAL_TRADES")
-                return False
+        Returns:
+            The queued write (see settle_writes), or None if it could not be queued
+        """
+        try:
+            write = self.sheets_manager.add_property(property_data)
+            print(f"   📤 Queued for AUCTION_MASTER")
+            return write
+        except Exception as e:
+            print(f"   ❌ Error adding to AUCTION_MASTER: {e}")
+            return None
     
     def add_to_potential_trades(self, property_data):
         """
-        Add property to POTENTIAL_TRADES tab
+        Queue a property for the POTENTIAL_TRADES tab (sent with the sheet writer's next batch)
         
         Args:
             property_data (dict): Property data
             
         Returns:
-            bool: True if successfully added
+            The queued write (see settle_writes), or None if it could not be queued
         """
         try:
-            # Prepare payload for POTENTIAL_TRADES
-            payload = {
-                'token': self.sheets_manager.shared_token,
-                'action': 'add',
-                'sheet_name': 'POTENTIAL_TRADES',  # Specify the tab name
-                'rows': [{
-                    'auction_name': property_data.get('auction_name', ''),
-                    'auction_date': property_data.get('auction_date', ''),
-                    'address': property_data.get('address', ''),
-                    'auction_sale': property_data.get('auction_sale', ''),
-                    'lot_number': property_data.get('lot_number', ''),
-                    'postcode': property_data.get('postcode', ''),
-                    'purchase_price': property_data.get('purchase_price', ''),
-                    'sold_date': property_data.get('sold_date', ''),
-                    'auction_url': property_data.get('auction_url', ''),
-                    'source_url': property_data.get('source_url', ''),
-                    'guide_price': property_data.get('guide_price', ''),
-                    'owner': property_data.get('owner', ''),
-                    'qa_status': property_data.get('qa_status', 'pending_enrichment'),
-                    'added_to_potential_trades': property_data.get('added_to_potential_trades', ''),
-                    'ingested_at': property_data.get('added_timestamp', datetime.now().isoformat())
-                }]
+            row = {
+                'auction_name': property_data.get('auction_name', ''),
+                'auction_date': property_data.get('auction_date', ''),
+                'address': property_data.get('address', ''),
+                'auction_sale': property_data.get('auction_sale', ''),
+                'lot_number': property_data.get('lot_number', ''),
+                'postcode': property_data.get('postcode', ''),
+                'purchase_price': property_data.get('purchase_price', ''),
+                'sold_date': property_data.get('sold_date', ''),
+                'auction_url': property_data.get('auction_url', ''),
+                'source_url': property_data.get('source_url', ''),
+                'guide_price': property_data.get('guide_price', ''),
+                'owner': property_data.get('owner', ''),
+                'qa_status': property_data.get('qa_status', 'pending_enrichment'),
+                'added_to_potential_trades': property_data.get('added_to_potential_trades', ''),
+                'ingested_at': property_data.get('added_timestamp', datetime.now().isoformat())
             }
-            
-            # Send request to Google Apps Script
-            import requests
-            response = requests.post(self.sheets_manager.webapp_url, json=payload, timeout=30)
-            
-            if response.status_code == 200:
-                result = response.json()
-                if result.get('ok'):
-                    print(f"   ✅ Added to POTENTIAL_TRADES successfully")
-                    return True
-                else:
-                    print(f"   ❌ Failed to add to POTENTIAL_TRADES: {result}")
-                    return False
-            else:
-                print(f"   ❌ HTTP error adding to POTENTIAL_TRADES: {response.status_code}")
-                return False
+            write = self.sheets_manager.writer.add(row, 'POTENTIAL_TRADES')
+            print(f"   📤 Queued for POTENTIAL_TRADES")
+            return write
                 
         except Exception as e:
             print(f"   ❌ Error adding to POTENTIAL_TRADES: {e}")
-            return False
+            return None
+    
+    def settle_writes(self, writes):
+        """
+        Send the queued writes in one flush and count those that reached the sheet
+        
+        Args:
+            writes: Writes returned by import_property/add_to_potential_trades (None entries are ignored)
+            
+        Returns:
+            int: Number of rows written
+        """
+        writes = [write for write in writes if write is not None]
+        if not writes:
+            return 0
+        self.sheets_manager.flush()
+        written = 0
+        for write in writes:
+            try:
+                written += write_succeeded(write)
+            except Exception as e:
+                print(f"   ❌ Error writing to the sheet: {e}")
+        if written < len(writes):
+            print(f"   ❌ {len(writes) - written} of {len(writes)} sheet rows were not written")
+        return written
     
     def process_potential_trades(self):
         """
@@ -289,6 +306,9 @@ class MainWorkflowController:
         print(f"\n🔄 Processing POTENTIAL_TRADES entries...")
         
         try:
+            # Rows still queued for the sheet are written before it is read
+            self.sheets_manager.flush()
+            
             # Read POTENTIAL_TRADES data
             payload = {
                 'token': self.sheets_manager.shared_token,
@@ -311,7 +331,7 @@ class MainWorkflowController:
             entries = result.get('rows', [])
             print(f"   📊 Found {len(entries)} entries in POTENTIAL_TRADES")
             
-            processed_count = 0
+            moved = []  # Writes to AUCTION_MASTER, settled in one batch after the loop
             current_date = datetime.now()
             
             for entry in entries:
@@ -345,13 +365,8 @@ class MainWorkflowController:
                             
                             if meets_criteria:
                                 # Move to AUCTION_MASTER
-                                success = self.sheets_manager.add_property(entry)
-                                if success:
-                                    print(f"   ✅ Moved to AUCTION_MASTER")
-                                    # TODO: Remove from POTENTIAL_TRADES
-                                    processed_count += 1
-                                else:
-                                    print(f"   ❌ Failed to move to AUCTION_MASTER")
+                                moved.append(self.import_property(entry))
+                                # TODO: Remove from POTENTIAL_TRADES once written
                             else:
                                 print(f"   ❌ Still doesn't meet criteria - DELETE")
                                 # TODO: Remove from POTENTIAL_TRADES (DELETE)
@@ -363,6 +378,7 @@ class MainWorkflowController:
                     print(f"   ❌ Error processing entry: {e}")
                     continue
             
+            processed_count = self.settle_writes(moved)
             print(f"   ✅ Processed {processed_count} entries from POTENTIAL_TRADES")
             return processed_count
             
@@ -433,6 +449,13 @@ class MainWorkflowController:
             print(f"❌ Error in main workflow: {e}")
             import traceback
             traceback.print_exc()
+        finally:
+            # Send whatever is still queued for the sheet
+            self.sheets_manager.flush()
+            print(f"📤 {self.sheets_manager.writer.summary()}")
+            # Both scraping steps and the enrichment share one browser; close it once at the end
+            self.enrichment_workflow.close_browser()
+            close_browser_thread()
 
 def main():
     """Main entry point"""
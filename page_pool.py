@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Pool of reusable Playwright pages for crawling many lot pages at once
+
+Navigations are started on every free page before any of them is waited on,
+so page loads overlap in the browser while extraction stays on the calling
+thread (Playwright's sync API is bound to the thread that created it).
+"""
+
+import os
+
+from rate_limit import get_host_limiter
+from readiness import wait_ready
+
+DEFAULT_POOL_SIZE = int(os.getenv('EIG_LOT_CONCURRENCY', '4'))
+
+
+class PagePool:
+    """Fixed set of pages in one browser context, reused across navigations"""
+
+    def __init__(self, context, size=DEFAULT_POOL_SIZE, limiter=None):
+        """
+        Initialize the pool
+
+        Args:
+            context: Playwright BrowserContext the pages are created in
+            size: Number of pages (lots loading at the same time)
+            limiter: HostRateLimiter enforcing the per-host request ceiling
+        """
+        self.limiter = limiter or get_host_limiter()
+        self.pages = [context.new_page() for _ in range(max(1, size))]
+        self.navigations = 0
+
+    def crawl(self, urls, handler, ready_step='eig_lot', timeout=30000):
+        """
+        Load each URL on a pooled page and run the handler on it.
+
+        Args:
+            urls: URLs to visit
+            handler: Callable (page, index, url) -> result, run once the page has loaded
+            ready_step: readiness.READINESS_STEPS entry to wait for before calling the handler
+            timeout: Navigation timeout in milliseconds
+
+        Returns:
+            Dict of index -> handler result for every URL that loaded
+        """
+        results = {}
+        pending = list(enumerate(urls))
+        # Never hold more slots than the host ceiling allows, or the wave would block on itself
+        wave_size = min(len(self.pages), self.limiter.max_concurrent)
+
+        while pending:
+            wave, pending = pending[:wave_size], pending[wave_size:]
+
+            # Start every navigation in the wave
+            started = []
+            for page, (index, url) in zip(self.pages, wave):
+                self.limiter.acquire(url)
+                self.navigations += 1
+                try:
+                    page.goto(url, wait_until="commit", timeout=timeout)
+                    started.append((page, index, url))
+                except Exception as e:
+                    self.limiter.release(url)
+                    print(f"    ⚠️ Error navigating to {url}: {e}")
+
+            # Then wait for each one in turn and extract
+            for page, index, url in started:
+                try:
+                    wait_ready(page, ready_step)
+                finally:
+                    self.limiter.release(url)
+
+                try:
+                    results[index] = handler(page, index, url)
+                except Exception as e:
+                    print(f"    ⚠️ Error processing {url}: {e}")
+                    results[index] = None
+
+        return results
+
+    def close(self):
+        """Close every pooled page"""
+        for page in self.pages:
+            try:
+                page.close()
+            except Exception:
+                pass
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Staged pipeline with bounded queues between the stages
+
+A Pipeline is a chain of Stages, each run by its own number of workers
+reading from a bounded input queue. A handler's results are put on the next
+stage's queue as soon as it returns, and that put blocks while the queue is
+full, so a slow stage (English House Prices, the sheet) holds back the stages
+feeding it instead of letting fetched lots pile up in memory, while every
+stage keeps working on whatever has already reached it.
+
+Batched stages are handed whatever is queued, up to batch_size items, per
+call: batches stay small while the pipeline is filling up (so the first
+results come through quickly) and grow when the stage falls behind.
+
+A handler call that raises is retried one item at a time, so one bad item
+does not take its batch with it; an item that still fails is handed to the
+stage's on_error, whose results go straight to the pipeline's results, so
+every input is accounted for.
+
+Pipeline runs its workers on threads; AsyncPipeline is the asyncio
+counterpart used by eig_async (workers are tasks and handlers coroutines).
+"""
+
+import os
+import time
+import queue
+import asyncio
+import threading
+
+DEFAULT_QUEUE_SIZE = int(os.getenv('PIPELINE_QUEUE_SIZE', '32'))
+
+# End of input marker; each worker of a stage receives one
+_DONE = object()
+
+
+def stage_workers(name, default):
+    """Worker count of a stage: PIPELINE_<NAME>_WORKERS if set, else the default"""
+    return max(1, int(os.getenv(f"PIPELINE_{name.upper()}_WORKERS", str(default))))
+
+
+class Stage:
+    """One step of a pipeline: its handler, worker count and input queue bound"""
+
+    def __init__(self, name, handler, workers=1, batch_size=1, queue_size=DEFAULT_QUEUE_SIZE, on_worker_exit=None,
+                 on_error=None):
+        """
+        Describe a stage
+
+        Args:
+            name: Stage name, used in logs and for PIPELINE_<NAME>_WORKERS
+            handler: Callable taking one item (a list of items when batch_size > 1)
+                     and returning an iterable of results for the next stage
+                     (a coroutine function for AsyncPipeline)
+            workers: Number of workers (PIPELINE_<NAME>_WORKERS overrides it)
+            batch_size: Most items handed to one handler call
+            queue_size: Bound of the stage's input queue
+            on_worker_exit: Called on each worker as it finishes (e.g. to close
+                            the browser a worker thread started)
+            on_error: Called with (item, error) for an item the handler fails on
+                      even on its own; returns the item's final results, which
+                      skip the later stages (without it the item is dropped)
+        """
+        self.name = name
+        self.handler = handler
+        self.workers = stage_workers(name, workers)
+        self.batch_size = max(1, batch_size)
+        self.queue_size = max(1, queue_size)
+        self.on_worker_exit = on_worker_exit
+        self.on_error = on_error
+        self.stats = {'items': 0, 'results': 0, 'errors': 0, 'busy': 0.0, 'held_back': 0.0}
+
+    def summary(self):
+        """Items in and results out, workers and time spent working and held back by the next stage"""
+        return (f"{self.name} {self.stats['items']}→{self.stats['results']} "
+                f"({self.workers}w, {self.stats['busy']:.0f}s busy, {self.stats['held_back']:.0f}s held back"
+                + (f", {self.stats['errors']} errors)" if self.stats['errors'] else ")"))
+
+
+class _PipelineBase:
+    def __init__(self, stages):
+        """
+        Build a pipeline
+
+        Args:
+            stages: Stages in order; the first stage's input is what run() is given
+        """
+        self.stages = stages
+        self.results = []
+        self.started = None
+        self.first_result_at = None
+        self.elapsed = None
+
+    def _record(self, stage, items, results, busy, held_back, failed=()):
+        stage.stats['items'] += items
+        stage.stats['results'] += results
+        stage.stats['busy'] += busy
+        stage.stats['held_back'] += held_back
+        stage.stats['errors'] += len(failed)
+        for _, error in failed:
+            print(f"    ⚠️ Pipeline stage '{stage.name}' failed on an item: {error}")
+
+    def _failed_results(self, stage, failed):
+        """Final results of the items a stage failed on (see Stage on_error)"""
+        results = []
+        for item, error in failed:
+            if stage.on_error:
+                try:
+                    results.extend(stage.on_error(item, error) or ())
+                except Exception as e:
+                    print(f"    ⚠️ Pipeline stage '{stage.name}' error handler failed: {e}")
+        return results
+
+    def _collect(self, result):
+        if self.first_result_at is None:
+            self.first_result_at = time.monotonic()
+        self.results.append(result)
+
+    def summary(self):
+        """One-line human readable summary"""
+        first = f"first result after {self.first_result_at - self.started:.1f}s, " if self.first_result_at else ""
+        elapsed = f"{self.elapsed:.0f}s" if self.elapsed is not None else "running"
+        return f"Pipeline ({first}{elapsed}): " + ", ".join(stage.summary() for stage in self.stages)
+
+
+class Pipeline(_PipelineBase):
+    """Chain of stages run on worker threads, connected by bounded queues"""
+
+    def __init__(self, stages):
+        super().__init__(stages)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _take(inbox, batch_size):
+        """Block for the next item, then add whatever else is queued (up to batch_size)"""
+        item = inbox.get()
+        if item is _DONE:
+            return [], True
+        batch = [item]
+        while len(batch) < batch_size:
+            try:
+                item = inbox.get_nowait()
+            except queue.Empty:
+                break
+            if item is _DONE:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _worker(self, k, queues, remaining):
+        stage = self.stages[k]
+        outbox = queues[k + 1] if k + 1 < len(queues) else None
+        try:
+            while True:
+                batch, done = self._take(queues[k], stage.batch_size)
+                if batch:
+                    self._handle(stage, batch, outbox)
+                if done:
+                    break
+        finally:
+            if stage.on_worker_exit:
+                try:
+                    stage.on_worker_exit()
+                except Exception as e:
+                    print(f"    ⚠️ Pipeline stage '{stage.name}' worker cleanup failed: {e}")
+            with self._lock:
+                remaining[k] -= 1
+                last = remaining[k] == 0
+            # The last worker out tells every worker of the next stage to finish
+            if last and outbox is not None:
+                for _ in range(self.stages[k + 1].workers):
+                    outbox.put(_DONE)
+
+    def _pass_on(self, results, outbox, passed):
+        """Hand a handler's results to the next stage (or collect them); passed counts [results, held back]"""
+        for result in results or ():
+            passed[0] += 1
+            if outbox is None:
+                with self._lock:
+                    self._collect(result)
+            else:
+                put_at = time.monotonic()
+                outbox.put(result)
+                passed[1] += time.monotonic() - put_at
+
+    def _handle(self, stage, batch, outbox):
+        started = time.monotonic()
+        passed = [0, 0.0]
+        failed = []
+        try:
+            self._pass_on(stage.handler(batch if stage.batch_size > 1 else batch[0]), outbox, passed)
+        except Exception as e:
+            if len(batch) > 1 and not passed[0]:
+                # Find the items it failed on by handing them over one at a time
+                for item in batch:
+                    try:
+                        self._pass_on(stage.handler([item]), outbox, passed)
+                    except Exception as item_error:
+                        failed.append((item, item_error))
+            else:
+                failed = [(item, e) for item in batch]
+        results = self._failed_results(stage, failed)
+        with self._lock:
+            for result in results:
+                self._collect(result)
+            self._record(stage, len(batch), passed[0], time.monotonic() - started - passed[1], passed[1], failed)
+
+    def run(self, items):
+        """
+        Push items through every stage and wait until the pipeline has drained.
+
+        Args:
+            items: Inputs of the first stage; consumed lazily (feeding blocks
+                   while the first stage is full), so a generator may pace them
+
+        Returns:
+            List of the last stage's results, in the order they came out
+        """
+        queues = [queue.Queue(maxsize=stage.queue_size) for stage in self.stages]
+        remaining = [stage.workers for stage in self.stages]
+        self.results = []
+        self.started = time.monotonic()
+        self.first_result_at = None
+
+        threads = [
+            threading.Thread(target=self._worker, args=(k, queues, remaining),
+                             name=f"pipeline-{stage.name}-{n}", daemon=True)
+            for k, stage in enumerate(self.stages)
+            for n in range(stage.workers)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            for item in items:
+                queues[0].put(item)
+        finally:
+            for _ in range(self.stages[0].workers):
+                queues[0].put(_DONE)
+            for thread in threads:
+                thread.join()
+            self.elapsed = time.monotonic() - self.started
+        return self.results
+
+
+class AsyncPipeline(_PipelineBase):
+    """Async version of Pipeline: workers are tasks on the running event loop"""
+
+    @staticmethod
+    async def _take(inbox, batch_size):
+        item = await inbox.get()
+        if item is _DONE:
+            return [], True
+        batch = [item]
+        while len(batch) < batch_size:
+            try:
+                item = inbox.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            if item is _DONE:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    async def _worker(self, k, queues, remaining):
+        stage = self.stages[k]
+        outbox = queues[k + 1] if k + 1 < len(queues) else None
+        try:
+            while True:
+                batch, done = await self._take(queues[k], stage.batch_size)
+                if batch:
+                    await self._handle(stage, batch, outbox)
+                if done:
+                    break
+        finally:
+            if stage.on_worker_exit:
+                try:
+                    stage.on_worker_exit()
+                except Exception as e:
+                    print(f"    ⚠️ Pipeline stage '{stage.name}' worker cleanup failed: {e}")
+            remaining[k] -= 1
+            if remaining[k] == 0 and outbox is not None:
+                for _ in range(self.stages[k + 1].workers):
+                    await outbox.put(_DONE)
+
+    async def _pass_on(self, results, outbox, passed):
+        for result in results or ():
+            passed[0] += 1
+            if outbox is None:
+                self._collect(result)
+            else:
+                put_at = time.monotonic()
+                await outbox.put(result)
+                passed[1] += time.monotonic() - put_at
+
+    async def _handle(self, stage, batch, outbox):
+        started = time.monotonic()
+        passed = [0, 0.0]
+        failed = []
+        try:
+            await self._pass_on(await stage.handler(batch if stage.batch_size > 1 else batch[0]), outbox, passed)
+        except Exception as e:
+            if len(batch) > 1 and not passed[0]:
+                for item in batch:
+                    try:
+                        await self._pass_on(await stage.handler([item]), outbox, passed)
+                    except Exception as item_error:
+                        failed.append((item, item_error))
+            else:
+                failed = [(item, e) for item in batch]
+        for result in self._failed_results(stage, failed):
+            self._collect(result)
+        self._record(stage, len(batch), passed[0], time.monotonic() - started - passed[1], passed[1], failed)
+
+    async def run(self, items):
+        """Async version of Pipeline.run (items may also be an async iterable)"""
+        queues = [asyncio.Queue(maxsize=stage.queue_size) for stage in self.stages]
+        remaining = [stage.workers for stage in self.stages]
+        self.results = []
+        self.started = time.monotonic()
+        self.first_result_at = None
+
+        workers = [
+            asyncio.create_task(self._worker(k, queues, remaining), name=f"pipeline-{stage.name}-{n}")
+            for k, stage in enumerate(self.stages)
+            for n in range(stage.workers)
+        ]
+        try:
+            if hasattr(items, '__aiter__'):
+                async for item in items:
+                    await queues[0].put(item)
+            else:
+                for item in items:
+                    await queues[0].put(item)
+            for _ in range(self.stages[0].workers):
+                await queues[0].put(_DONE)
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+            self.elapsed = time.monotonic() - self.started
+        return self.results
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Local index of HM Land Registry Price Paid Data
+
+English House Prices is a front end over the Land Registry Price Paid Data
+(PPD). Loading the PPD CSV (the complete file, a yearly file or the monthly
+update) into SQLite, indexed by postcode and normalized address, lets the
+pipeline answer a purchase-price lookup with a local query and only scrape
+englishhouseprices.com for postcodes the index does not cover.
+
+Usage:
+    python price_paid.py pp-monthly-update-new-version.csv [more.csv ...]
+    python price_paid.py --download monthly
+    python price_paid.py --download complete
+
+The loader streams the CSV and applies the PPD record status column: 'A'
+adds a transaction, 'C' replaces it and 'D' deletes it, so monthly updates
+can be loaded on top of an earlier complete file.
+"""
+
+import os
+import csv
+import sys
+import sqlite3
+import threading
+from datetime import datetime
+
+from ehp_cache import normalize_postcode
+
+PRICE_PAID_DB_PATH = os.getenv('PRICE_PAID_DB_PATH', 'cache/price_paid.sqlite')
+PRICE_PAID_ENABLED = os.getenv('PRICE_PAID_INDEX', 'true').lower() != 'false'
+
+PPD_BASE_URL = "http://prod.publicdata.landregistry.gov.uk.s3-website-eu-west-1.amazonaws.com"
+PPD_DOWNLOADS = {
+    'complete': f"{PPD_BASE_URL}/pp-complete.csv",
+    'monthly': f"{PPD_BASE_URL}/pp-monthly-update-new-version.csv",
+}
+
+# Column order of the PPD CSV (the files have no header row)
+PPD_COLUMNS = [
+    'transaction_id', 'price', 'date', 'postcode', 'property_type', 'old_new', 'duration',
+    'paon', 'saon', 'street', 'locality', 'town', 'district', 'county', 'category', 'record_status',
+]
+
+PROPERTY_TYPES = {'D': 'Detached', 'S': 'Semi-Detached', 'T': 'Terraced', 'F': 'Flat/Maisonette', 'O': 'Other'}
+
+LOAD_BATCH_SIZE = 50_000
+
+
+def normalize_address(address):
+    """Index key for an address line: upper case, punctuation dropped, single spaces"""
+    cleaned = "".join(char if char.isalnum() else " " for char in (address or "").upper())
+    return " ".join(cleaned.split())
+
+
+def address_line(saon, paon, street):
+    """Readable first address line from the PPD address columns (e.g. 'Flat 2, 10 High Street')"""
+    building = " ".join(part for part in [paon, street] if part)
+    line = ", ".join(part for part in [saon, building] if part)
+    return line.title()
+
+
+class PricePaidIndex:
+    """SQLite index of Price Paid Data transactions keyed by postcode and normalized address"""
+
+    def __init__(self, path=PRICE_PAID_DB_PATH):
+        """
+        Open (or create) the index
+
+        Args:
+            path: SQLite file (created with its directory if missing)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS price_paid ("
+            " transaction_id TEXT PRIMARY KEY,"
+            " postcode TEXT NOT NULL,"
+            " address_key TEXT NOT NULL,"
+            " address TEXT NOT NULL,"
+            " town TEXT,"
+            " property_type TEXT,"
+            " price INTEGER NOT NULL,"
+            " sale_date TEXT NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS ix_price_paid_postcode_address"
+            " ON price_paid (postcode, address_key, sale_date)"
+        )
+        self._db.commit()
+
+    @staticmethod
+    def _record(row):
+        """PPD CSV row -> (transaction_id, record_status, table row)"""
+        fields = dict(zip(PPD_COLUMNS, row))
+        address = address_line(fields.get('saon'), fields.get('paon'), fields.get('street'))
+        record = (
+            fields['transaction_id'],
+            normalize_postcode(fields.get('postcode')),
+            normalize_address(address),
+            address,
+            (fields.get('town') or '').title(),
+            fields.get('property_type', ''),
+            int(fields['price']),
+            fields['date'][:10],  # "YYYY-MM-DD 00:00"
+        )
+        return fields['transaction_id'], (fields.get('record_status') or 'A').upper(), record
+
+    def load_csv(self, csv_path, replace=False):
+        """
+        Stream a PPD CSV file into the index.
+
+        Args:
+            csv_path: Path to a complete, yearly or monthly PPD CSV
+            replace: Empty the index first (use when loading the complete file)
+
+        Returns:
+            Dict with counts of added/changed and deleted transactions and skipped rows
+        """
+        counts = {'upserted': 0, 'deleted': 0, 'skipped': 0}
+        upserts, deletes = [], []
+
+        def flush():
+            self._db.executemany(
+                "INSERT OR REPLACE INTO price_paid (transaction_id, postcode, address_key, address, town,"
+                " property_type, price, sale_date) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                upserts
+            )
+            self._db.executemany("DELETE FROM price_paid WHERE transaction_id = ?", deletes)
+            self._db.commit()
+            counts['upserted'] += len(upserts)
+            counts['deleted'] += len(deletes)
+            upserts.clear()
+            deletes.clear()
+
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=OFF")
+            if replace:
+                self._db.execute("DELETE FROM price_paid")
+
+            with open(csv_path, newline='', encoding='utf-8') as handle:
+                for row in csv.reader(handle):
+                    try:
+                        transaction_id, status, record = self._record(row)
+                    except (KeyError, ValueError, IndexError):
+                        counts['skipped'] += 1
+                        continue
+                    if status == 'D':
+                        deletes.append((transaction_id,))
+                    elif record[1]:  # Transactions without a postcode can never be looked up
+                        upserts.append(record)
+                    else:
+                        counts['skipped'] += 1
+                    if len(upserts) + len(deletes) >= LOAD_BATCH_SIZE:
+                        flush()
+                flush()
+
+            self._db.execute("PRAGMA synchronous=FULL")
+        return counts
+
+    def has_data(self):
+        """True once at least one transaction has been loaded"""
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM price_paid LIMIT 1").fetchone() is not None
+
+    def sales_for_postcode(self, postcode):
+        """
+        Every recorded sale in a postcode, most recent first.
+
+        Returns:
+            List of dicts with address, address_key, town, property_type, price and sale_date
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT address, address_key, town, property_type, price, sale_date FROM price_paid"
+                " WHERE postcode = ? ORDER BY sale_date DESC",
+                (normalize_postcode(postcode),)
+            ).fetchall()
+        return [
+            {'address': address, 'address_key': address_key, 'town': town, 'property_type': property_type,
+             'price': price, 'sale_date': sale_date}
+            for address, address_key, town, property_type, price, sale_date in rows
+        ]
+
+    def prices_rows(self, postcode):
+        """
+        A postcode's sales in the {'cell', 'text'} row format read from English House Prices.
+
+        Returns:
+            List of rows (most recent sale first), or None if the index has no sales for the postcode
+        """
+        sales = self.sales_for_postcode(postcode)
+        if not sales:
+            return None
+        rows = []
+        for sale in sales:
+            sale_date = datetime.strptime(sale['sale_date'], "%Y-%m-%d").strftime("%d/%m/%Y")
+            property_type = PROPERTY_TYPES.get(sale['property_type'], sale['property_type'])
+            rows.append({
+                'cell': sale['address'],
+                'text': f"{sale['address']}, {sale['town']} {normalize_postcode(postcode)} {property_type} {sale_date} £{sale['price']:,}",
+            })
+        return rows
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_price_paid_index():
+    """
+    Return the process-wide PricePaidIndex, or None when no index has been built
+    (or PRICE_PAID_INDEX=false), so callers go straight to English House Prices.
+    """
+    global _index
+    if not PRICE_PAID_ENABLED or not os.path.exists(PRICE_PAID_DB_PATH):
+        return None
+    with _index_lock:
+        if _index is None:
+            _index = PricePaidIndex()
+        return _index
+
+
+def download_ppd(kind, destination_dir='cache'):
+    """
+    Download a PPD CSV from the Land Registry.
+
+    Args:
+        kind: 'complete' or 'monthly'
+        destination_dir: Directory to save the file in
+
+    Returns:
+        Path of the downloaded file
+    """
+    import httpx
+
+    url = PPD_DOWNLOADS[kind]
+    os.makedirs(destination_dir, exist_ok=True)
+    destination = os.path.join(destination_dir, url.rsplit('/', 1)[-1])
+    print(f"⬇️ Downloading {url}")
+    with httpx.stream("GET", url, timeout=None, follow_redirects=True) as response:
+        response.raise_for_status()
+        with open(destination, 'wb') as handle:
+            for chunk in response.iter_bytes(1 << 20):
+                handle.write(chunk)
+    return destination
+
+
+def main(argv):
+    if len(argv) == 2 and argv[0] == '--download' and argv[1] in PPD_DOWNLOADS:
+        paths, replace = [download_ppd(argv[1])], argv[1] == 'complete'
+    elif argv and not argv[0].startswith('--'):
+        paths, replace = argv, False
+    else:
+        print(__doc__)
+        return 1
+
+    index = PricePaidIndex()
+    for path in paths:
+        print(f"📥 Loading {path} into {index.path}")
+        counts = index.load_csv(path, replace=replace)
+        print(f"   ✅ {counts['upserted']} added/changed, {counts['deleted']} deleted, {counts['skipped']} skipped")
+    index.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Per-host request limits shared by every scraper in the process
+
+HostRateLimiter caps how many requests may be in flight to one host at a time
+and spaces out request starts, so concurrent lot crawling stays polite to
+eigpropertyauctions.co.uk.
+
+AdaptiveRateLimiter is a per-domain token bucket whose rate follows the site's
+real tolerance (AIMD): every successful request adds a little to the rate, a
+WAF block halves it and pauses the domain for a cool-down. It replaces the
+fixed worst-case sleeps in front of englishhouseprices.com.
+"""
+
+import os
+import time
+import random
+import asyncio
+import threading
+from contextlib import contextmanager, asynccontextmanager
+from urllib.parse import urlparse
+
+DEFAULT_MAX_REQUESTS_PER_HOST = int(os.getenv('MAX_REQUESTS_PER_HOST', '4'))
+DEFAULT_MIN_REQUEST_INTERVAL = float(os.getenv('MIN_REQUEST_INTERVAL', '0.25'))
+
+# Domain -> AIMD token bucket settings (rates in requests per second)
+ADAPTIVE_PROFILES = {
+    'englishhouseprices.com': {
+        'initial_rate': float(os.getenv('EHP_RATE', '0.3')),  # ~ the old random 2-5s gap
+        'min_rate': float(os.getenv('EHP_MIN_RATE', '0.02')),
+        'max_rate': float(os.getenv('EHP_MAX_RATE', '1.0')),
+        'increase': 0.02,
+        'decrease': 0.5,
+        'cooldown': 30.0,
+    },
+    # Google Apps Script web app (sheet_writer): executions are batched, so a
+    # slow steady rate is plenty; quota errors back it off like a WAF block
+    'script.google.com': {
+        'initial_rate': float(os.getenv('SHEET_RATE', '1.0')),
+        'min_rate': 0.05,
+        'max_rate': 2.0,
+        'increase': 0.05,
+        'decrease': 0.5,
+        'cooldown': 30.0,
+    },
+}
+DEFAULT_ADAPTIVE_PROFILE = {
+    'initial_rate': 1.0, 'min_rate': 0.05, 'max_rate': 4.0, 'increase': 0.05, 'decrease': 0.5, 'cooldown': 10.0,
+}
+
+
+class BlockedError(Exception):
+    """Raised when a site's WAF rejects a request, so the caller can queue it for a retry"""
+
+
+def host_of(url):
+    """Return the host part of a URL (the limiter key)"""
+    return urlparse(url).netloc.lower()
+
+
+class HostRateLimiter:
+    """Thread-safe per-host concurrency ceiling with a minimum gap between request starts"""
+
+    def __init__(self, max_concurrent=DEFAULT_MAX_REQUESTS_PER_HOST, min_interval=DEFAULT_MIN_REQUEST_INTERVAL):
+        """
+        Initialize the limiter
+
+        Args:
+            max_concurrent: Maximum requests in flight to one host
+            min_interval: Minimum seconds between two request starts to one host
+        """
+        self.max_concurrent = max(1, max_concurrent)
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._next_start = {}
+
+    def _semaphore(self, host):
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.max_concurrent)
+            return self._semaphores[host]
+
+    def acquire(self, url):
+        """Block until a request to the URL's host may start"""
+        host = host_of(url)
+        self._semaphore(host).acquire()
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+
+    def release(self, url):
+        """Mark a request to the URL's host as finished"""
+        self._semaphore(host_of(url)).release()
+
+    @contextmanager
+    def slot(self, url):
+        """Context manager holding a request slot for the URL's host"""
+        self.acquire(url)
+        try:
+            yield
+        finally:
+            self.release(url)
+
+
+class AsyncHostRateLimiter:
+    """asyncio counterpart of HostRateLimiter for eig_async"""
+
+    def __init__(self, max_concurrent=DEFAULT_MAX_REQUESTS_PER_HOST, min_interval=DEFAULT_MIN_REQUEST_INTERVAL):
+        self.max_concurrent = max(1, max_concurrent)
+        self.min_interval = min_interval
+        self._semaphores = {}
+        self._next_start = {}
+
+    async def acquire(self, url):
+        """Wait until a request to the URL's host may start"""
+        host = host_of(url)
+        semaphore = self._semaphores.setdefault(host, asyncio.Semaphore(self.max_concurrent))
+        await semaphore.acquire()
+        now = time.monotonic()
+        start = max(now, self._next_start.get(host, now))
+        self._next_start[host] = start + self.min_interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    def release(self, url):
+        """Mark a request to the URL's host as finished"""
+        self._semaphores[host_of(url)].release()
+
+    @asynccontextmanager
+    async def slot(self, url):
+        """Async context manager holding a request slot for the URL's host"""
+        await self.acquire(url)
+        try:
+            yield
+        finally:
+            self.release(url)
+
+
+def domain_profile(host):
+    """AIMD settings for a host (most specific ADAPTIVE_PROFILES suffix wins)"""
+    matches = [domain for domain in ADAPTIVE_PROFILES if host == domain or host.endswith('.' + domain)]
+    return ADAPTIVE_PROFILES[max(matches, key=len)] if matches else DEFAULT_ADAPTIVE_PROFILE
+
+
+class AdaptiveTokenBucket:
+    """
+    Token bucket (capacity 1, so requests are evenly spaced) with an AIMD refill rate.
+
+    Reservations are taken under a lock and the caller sleeps outside it, so the
+    same bucket serves threads and asyncio tasks.
+    """
+
+    def __init__(self, initial_rate, min_rate, max_rate, increase, decrease, cooldown):
+        self.rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.stats = {'requests': 0, 'successes': 0, 'blocks': 0}
+        self._lock = threading.Lock()
+        self._next_start = time.monotonic()
+        self._consecutive_blocks = 0
+
+    def reserve(self):
+        """Reserve the next request start; returns the seconds to wait before it"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            # Small jitter so the spacing does not look machine-regular
+            self._next_start = start + random.uniform(0.8, 1.2) / self.rate
+            self.stats['requests'] += 1
+            return start - now
+
+    def record_success(self):
+        """Additive increase after a request the site accepted"""
+        with self._lock:
+            self.stats['successes'] += 1
+            self._consecutive_blocks = 0
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def record_block(self):
+        """Multiplicative decrease and a cool-down (longer for repeated blocks) after a WAF rejection"""
+        with self._lock:
+            self.stats['blocks'] += 1
+            self._consecutive_blocks += 1
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            pause = self.cooldown * min(2 ** (self._consecutive_blocks - 1), 8)
+            self._next_start = max(self._next_start, time.monotonic() + pause)
+            return pause
+
+    def summary(self):
+        return (f"{self.stats['requests']} requests, {self.stats['successes']} ok, {self.stats['blocks']} blocked, "
+                f"rate now {self.rate:.2f}/s")
+
+
+class AdaptiveRateLimiter:
+    """Per-domain AdaptiveTokenBucket registry used by both the sync and async scrapers"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = {}
+
+    def bucket(self, url):
+        """The token bucket for the URL's host"""
+        host = host_of(url).split(':')[0]
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = AdaptiveTokenBucket(**domain_profile(host))
+            return self._buckets[host]
+
+    def acquire(self, url):
+        """Block until the URL's domain may take another request"""
+        wait = self.bucket(url).reserve()
+        if wait > 0:
+            print(f"    ⏱️ Waiting {wait:.1f} seconds for {host_of(url)} rate limit...")
+            time.sleep(wait)
+
+    async def acquire_async(self, url):
+        """asyncio version of acquire"""
+        wait = self.bucket(url).reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def record_success(self, url):
+        self.bucket(url).record_success()
+
+    def record_block(self, url):
+        """Back the URL's domain off after a WAF block"""
+        bucket = self.bucket(url)
+        pause = bucket.record_block()
+        print(f"    🐢 {host_of(url)} blocked us: rate cut to {bucket.rate:.2f}/s, pausing {pause:.0f}s")
+
+    def summary(self):
+        """One line per domain"""
+        with self._lock:
+            buckets = dict(self._buckets)
+        return "\n".join(f"{host}: {bucket.summary()}" for host, bucket in sorted(buckets.items()))
+
+
+_host_limiter = None
+_host_limiter_lock = threading.Lock()
+_adaptive_limiter = None
+
+
+def get_host_limiter():
+    """Return the process-wide HostRateLimiter"""
+    global _host_limiter
+    with _host_limiter_lock:
+        if _host_limiter is None:
+            _host_limiter = HostRateLimiter()
+        return _host_limiter
+
+
+def get_adaptive_limiter():
+    """Return the process-wide AdaptiveRateLimiter"""
+    global _adaptive_limiter
+    with _host_limiter_lock:
+        if _adaptive_limiter is None:
+            _adaptive_limiter = AdaptiveRateLimiter()
+        return _adaptive_limiter
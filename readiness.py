@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Condition-based readiness waits for Playwright pages
+
+Instead of sleeping a fixed number of seconds (or waiting for networkidle,
+which never settles on pages with polling scripts), each scraping step waits
+for the element it actually needs, up to a per-step timeout. A page that is
+ready in 300ms is used after 300ms; a slow page still gets its full timeout.
+
+READINESS_STEPS maps step names to a selector and timeout. Steps that time out
+are logged and the caller carries on, the same as it did after the old
+fixed sleeps.
+"""
+
+import os
+
+READINESS_TIMEOUT_SCALE = float(os.getenv('READINESS_TIMEOUT_SCALE', '1.0'))
+
+# Step name -> what "ready" means for it
+READINESS_STEPS = {
+    # EIG
+    'eig_results': {'selector': "table tr td, a[href*='auction-result'], a[href*='/auction/']", 'timeout': 15000},
+    'eig_auction_detail': {'selector': "a[href*='/lot/']", 'timeout': 15000},
+    'eig_lot': {'selector': ".lot-address, .property-address, [class*='address'], h1", 'timeout': 15000},
+    'eig_catalogue': {'selector': "text=/guide price|estimate/i", 'timeout': 8000},
+    # English House Prices
+    'ehp_results': {'selector': "table tr td, h1", 'timeout': 20000},
+    # Google / listing sites (the Google timeout leaves time to solve a CAPTCHA by hand)
+    'google_results': {'selector': "#search, #rso, #botstuff", 'timeout': 45000},
+    'listing_page': {'selector': "h1", 'timeout': 15000},
+    # PropertyEngine
+    'pe_login': {'selector': "input[type='email'], a[href*='logout'], a[href*='/properties']", 'timeout': 15000},
+    'pe_home': {'selector': "a[href*='logout'], a[href*='/properties'], nav, input[type='email']", 'timeout': 15000},
+    'pe_properties': {'selector': "button:has-text('Paste Link'), a:has-text('Paste Link'), [data-testid*='paste'], [class*='paste']", 'timeout': 20000},
+    'pe_paste_input': {'selector': "input[placeholder*='aste'], input[placeholder*='ink'], input[placeholder*='URL'], input[placeholder*='url'], input[type='url'], textarea", 'timeout': 10000},
+    'pe_paste_submit': {'selector': "button[type='submit']:not([disabled]), input[type='submit']:not([disabled])", 'timeout': 5000},
+    'pe_property': {'selector': "[role='dialog'], .modal, [class*='modal'], [class*='popup'], [class*='timeline'], [class*='activity']", 'timeout': 20000, 'state': 'visible'},
+    'pe_timeline': {'selector': "[class*='timeline'], [class*='activity'], [class*='history'], [class*='events']", 'timeout': 15000, 'state': 'visible'},
+}
+
+
+def _step(step):
+    if step not in READINESS_STEPS:
+        raise ValueError(f"Unknown readiness step: {step}")
+    config = READINESS_STEPS[step]
+    return config['selector'], config.get('state', 'attached'), int(config['timeout'] * READINESS_TIMEOUT_SCALE)
+
+
+def wait_ready(page, step, timeout=None):
+    """
+    Wait until the page is ready for a step.
+
+    Args:
+        page: Playwright Page
+        step: Key of READINESS_STEPS
+        timeout: Override for the step's timeout in milliseconds
+
+    Returns:
+        True if the step's selector appeared, False if it timed out
+    """
+    selector, state, step_timeout = _step(step)
+    timeout = timeout if timeout is not None else step_timeout
+    try:
+        page.wait_for_load_state("domcontentloaded", timeout=timeout)
+        page.wait_for_selector(selector, state=state, timeout=timeout)
+        return True
+    except Exception:
+        print(f"    ⏱️ Page not ready for '{step}' after {timeout}ms, continuing")
+        return False
+
+
+def goto_ready(page, url, step, timeout=None):
+    """
+    Navigate to a URL and wait for the step's readiness condition.
+
+    Raises:
+        Navigation errors from page.goto (retry logic stays with the caller)
+    """
+    _, _, step_timeout = _step(step)
+    response = page.goto(url, wait_until="domcontentloaded", timeout=timeout or max(step_timeout, 30000))
+    wait_ready(page, step, timeout)
+    return response
+
+
+async def wait_ready_async(page, step, timeout=None):
+    """playwright.async_api version of wait_ready"""
+    selector, state, step_timeout = _step(step)
+    timeout = timeout if timeout is not None else step_timeout
+    try:
+        await page.wait_for_load_state("domcontentloaded", timeout=timeout)
+        await page.wait_for_selector(selector, state=state, timeout=timeout)
+        return True
+    except Exception:
+        print(f"    ⏱️ Page not ready for '{step}' after {timeout}ms, continuing")
+        return False
+
+
+async def goto_ready_async(page, url, step, timeout=None):
+    """playwright.async_api version of goto_ready"""
+    _, _, step_timeout = _step(step)
+    response = await page.goto(url, wait_until="domcontentloaded", timeout=timeout or max(step_timeout, 30000))
+    await wait_ready_async(page, step, timeout)
+    return response
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Persistent re-check queue for lots whose sale is not in the price data yet
+
+Land Registry (and so English House Prices) data lags completions by months,
+so a lot sold at a recent auction usually comes back not_found. Instead of
+re-scraping whole auctions later, each such lot is stored here with a
+next-check time; every run looks up only the lots that are due, backing off
+between attempts (RECHECK_BACKOFF_DAYS) and giving up after the last one.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+
+RECHECK_QUEUE_PATH = os.getenv('RECHECK_QUEUE_PATH', 'cache/recheck_queue.sqlite')
+
+# Days to wait before each successive re-check (the lot is dropped after the last)
+RECHECK_BACKOFF_DAYS = [int(days) for days in os.getenv('RECHECK_BACKOFF_DAYS', '14,30,45,60,90').split(',')]
+
+
+def recheck_key(lot):
+    """Queue key of a lot: its lot page URL, else its property ID"""
+    return lot.get('source_url') or lot.get('property_id') or lot.get('address', '')
+
+
+class RecheckQueue:
+    """SQLite-backed queue of lots to look up again once their sale may have been registered"""
+
+    def __init__(self, path=RECHECK_QUEUE_PATH, backoff_days=None):
+        """
+        Initialize the queue
+
+        Args:
+            path: SQLite file (created with its directory if missing)
+            backoff_days: Days before each successive re-check
+        """
+        self.path = path
+        self.backoff = [days * 86400 for days in (backoff_days or RECHECK_BACKOFF_DAYS)]
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS rechecks ("
+            " key TEXT PRIMARY KEY,"
+            " lot TEXT NOT NULL,"
+            " auction TEXT NOT NULL,"
+            " attempts INTEGER NOT NULL,"
+            " next_check REAL NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS ix_rechecks_next_check ON rechecks (next_check)")
+        self._db.commit()
+
+    def add(self, lot, auction):
+        """
+        Queue a not-found lot for its first re-check (no-op if it is already queued).
+
+        Args:
+            lot: Lot dict
+            auction: Auction dict the lot belongs to (needed to import it later)
+        """
+        with self._lock:
+            self._db.execute(
+                "INSERT OR IGNORE INTO rechecks (key, lot, auction, attempts, next_check, created_at)"
+                " VALUES (?, ?, ?, 0, ?, ?)",
+                (recheck_key(lot), json.dumps(lot), json.dumps(auction), time.time() + self.backoff[0], time.time())
+            )
+            self._db.commit()
+
+    def due(self, now=None):
+        """
+        Lots whose next check time has passed, oldest first.
+
+        Returns:
+            List of {'key', 'lot', 'auction', 'attempts'} dicts
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT key, lot, auction, attempts FROM rechecks WHERE next_check <= ? ORDER BY next_check",
+                (now or time.time(),)
+            ).fetchall()
+        return [
+            {'key': key, 'lot': json.loads(lot), 'auction': json.loads(auction), 'attempts': attempts}
+            for key, lot, auction, attempts in rows
+        ]
+
+    def reschedule(self, entry):
+        """
+        Push a still-not-found entry to its next check, or drop it after the last one.
+
+        Returns:
+            True if it was rescheduled, False if it was given up on
+        """
+        attempts = entry['attempts'] + 1
+        if attempts >= len(self.backoff):
+            self.remove(entry['key'])
+            return False
+        with self._lock:
+            self._db.execute(
+                "UPDATE rechecks SET attempts = ?, next_check = ? WHERE key = ?",
+                (attempts, time.time() + self.backoff[attempts], entry['key'])
+            )
+            self._db.commit()
+        return True
+
+    def remove(self, key):
+        """Take a lot off the queue (found, imported or given up on)"""
+        with self._lock:
+            self._db.execute("DELETE FROM rechecks WHERE key = ?", (key,))
+            self._db.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM rechecks").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_recheck_queue():
+    """Return the process-wide RecheckQueue"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = RecheckQueue()
+        return _queue
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Request interception profiles for Playwright pages
+
+Every scraper only reads page text, so images, fonts, media, stylesheets and
+third-party analytics are aborted before they are downloaded. Which resource
+types are blocked is configurable per site domain (BLOCKING_PROFILES); tracker
+hosts are blocked everywhere. Counters record how many requests were aborted
+and roughly how many bytes that saved.
+
+install_request_blocking() is applied to every browser context the
+BrowserManager creates, so all pages in eig.py, eig_async.py and
+run_listing_enrichment_workflow.py inherit it.
+"""
+
+import os
+import threading
+from urllib.parse import urlparse
+
+REQUEST_BLOCKING_ENABLED = os.getenv('BLOCK_PAGE_ASSETS', 'true').lower() != 'false'
+
+DEFAULT_BLOCKED_TYPES = frozenset({'image', 'font', 'media', 'stylesheet'})
+
+# Page domain -> resource types to abort (most specific suffix wins)
+BLOCKING_PROFILES = {
+    'eigpropertyauctions.co.uk': DEFAULT_BLOCKED_TYPES,
+    'englishhouseprices.com': DEFAULT_BLOCKED_TYPES,
+    'rightmove.co.uk': DEFAULT_BLOCKED_TYPES,
+    'zoopla.co.uk': DEFAULT_BLOCKED_TYPES,
+    'google.com': DEFAULT_BLOCKED_TYPES,
+    # PropertyEngine's paste-link form and popups are found by visibility, so keep its CSS
+    'propertyengine.co.uk': frozenset({'image', 'font', 'media'}),
+}
+
+# Google's "unusual traffic" page and reCAPTCHA frames, which a person may have
+# to solve (image challenges need their images and CSS): nothing is blocked there
+CHALLENGE_PATHS = ('/sorry/', '/recaptcha/')
+CHALLENGE_DOMAINS = ('google.com', 'recaptcha.net')
+
+TRACKER_DOMAINS = (
+    'google-analytics.com',
+    'googletagmanager.com',
+    'doubleclick.net',
+    'googlesyndication.com',
+    'googleadservices.com',
+    'facebook.net',
+    'facebook.com',
+    'hotjar.com',
+    'clarity.ms',
+    'bing.com',
+    'linkedin.com',
+    'segment.io',
+    'newrelic.com',
+    'nr-data.net',
+    'cookielaw.org',
+    'onetrust.com',
+)
+
+# Rough transfer size of an aborted request, used for the bytes-saved counter
+ESTIMATED_BYTES = {
+    'image': 60_000,
+    'font': 40_000,
+    'media': 500_000,
+    'stylesheet': 30_000,
+    'script': 50_000,
+}
+DEFAULT_ESTIMATED_BYTES = 10_000
+
+
+def _host_matches(host, domain):
+    return host == domain or host.endswith('.' + domain)
+
+
+def is_tracker(url):
+    """True for requests to a known analytics/advertising host"""
+    host = urlparse(url).netloc.lower().split(':')[0]
+    return any(_host_matches(host, domain) for domain in TRACKER_DOMAINS)
+
+
+def is_challenge(url):
+    """True for Google's /sorry/ page and reCAPTCHA frames and resources"""
+    parsed = urlparse(url or "")
+    host = parsed.netloc.lower().split(':')[0]
+    return (any(_host_matches(host, domain) for domain in CHALLENGE_DOMAINS)
+            and parsed.path.startswith(CHALLENGE_PATHS))
+
+
+def blocked_types_for(page_url):
+    """Resource types blocked on pages from this URL's domain"""
+    if is_challenge(page_url):
+        return frozenset()
+    host = urlparse(page_url or "").netloc.lower().split(':')[0]
+    matches = [domain for domain in BLOCKING_PROFILES if _host_matches(host, domain)]
+    if not matches:
+        return DEFAULT_BLOCKED_TYPES
+    return BLOCKING_PROFILES[max(matches, key=len)]
+
+
+class BlockingStats:
+    """Thread-safe counters of aborted requests"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.bytes = 0
+        self.by_type = {}
+
+    def record(self, resource_type, size=None):
+        """Count one aborted request of the given resource type"""
+        size = size if size is not None else ESTIMATED_BYTES.get(resource_type, DEFAULT_ESTIMATED_BYTES)
+        with self._lock:
+            self.requests += 1
+            self.bytes += size
+            self.by_type[resource_type] = self.by_type.get(resource_type, 0) + 1
+
+    def summary(self):
+        """One-line human readable summary"""
+        with self._lock:
+            types = ", ".join(f"{count} {kind}" for kind, count in sorted(self.by_type.items()))
+            return f"Blocked {self.requests} requests (~{self.bytes / 1_000_000:.1f} MB saved){': ' + types if types else ''}"
+
+
+_stats = BlockingStats()
+
+
+def get_blocking_stats():
+    """Return the process-wide BlockingStats"""
+    return _stats
+
+
+def should_block(request):
+    """
+    Decide whether a request should be aborted.
+
+    Returns:
+        Resource type label to count it under, or None to let it through
+    """
+    resource_type = request.resource_type
+    if resource_type == 'document' or is_challenge(request.url):
+        return None
+    if is_tracker(request.url):
+        return 'tracker'
+    try:
+        page_url = request.frame.url
+    except Exception:
+        page_url = request.url
+    if resource_type in blocked_types_for(page_url):
+        return resource_type
+    return None
+
+
+def install_request_blocking(target, stats=None):
+    """
+    Abort unneeded requests on a sync Playwright page or browser context.
+
+    Args:
+        target: Page or BrowserContext to install the route on
+        stats: BlockingStats to count into (process-wide counters by default)
+    """
+    if not REQUEST_BLOCKING_ENABLED:
+        return
+    stats = stats or _stats
+
+    def handle_route(route):
+        reason = should_block(route.request)
+        if reason:
+            stats.record(reason)
+            route.abort()
+        else:
+            route.continue_()
+
+    target.route("**/*", handle_route)
+
+
+async def install_request_blocking_async(target, stats=None):
+    """playwright.async_api version of install_request_blocking"""
+    if not REQUEST_BLOCKING_ENABLED:
+        return
+    stats = stats or _stats
+
+    async def handle_route(route):
+        reason = should_block(route.request)
+        if reason:
+            stats.record(reason)
+            await route.abort()
+        else:
+            await route.continue_()
+
+    await target.route("**/*", handle_route)
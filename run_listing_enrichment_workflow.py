@@ -17,44 +17,45 @@ import time
 import random
 import re
 from datetime import datetime
-from playwright.sync_api import sync_playwright
+from browser_manager import get_browser_manager, on_browser_thread
+from readiness import goto_ready, wait_ready
 from sheets_webapp import PropertyDataManagerWebApp
+from address_matching import parse_address, property_id
+from lot_triage import should_run, get_triage_stats
 
 class ListingEnrichmentWorkflow:
     def __init__(self):
         """Initialize the listing enrichment workflow"""
         self.sheets_manager = PropertyDataManagerWebApp()
-        self.playwright = None
-        self.browser = None
-        self.page = None
+        self.browser_manager = None
+        self.context = None
+        self._page = None
+    
+    @property
+    def page(self):
+        """PropertyEngine page, started on first use (callers like the workflow controller never call start_browser)"""
+        if self._page is None or self._page.is_closed():
+            self.start_browser()
+        return self._page
         
+    @on_browser_thread
     def start_browser(self):
-        """Start the browser for web scraping"""
-        self.playwright = sync_playwright().start()
-        self.browser = self.playwright.chromium.launch(headless=False)
-        
-        # Try to load PropertyEngine session if available
-        session_file = "sessions/propertyengine.json"
-        if os.path.exists(session_file):
-            print(f"📁 Loading PropertyEngine session from: {session_file}")
-            self.context = self.browser.new_context(storage_state=session_file)
-        else:
-            print("⚠️ No PropertyEngine session found, starting fresh browser")
-            self.context = self.browser.new_context()
-        
-        self.page = self.context.new_page()
+        """Open a page in the shared browser's PropertyEngine context"""
+        self.browser_manager = get_browser_manager(headless=False)
+        self.context = self.browser_manager.context('propertyengine')
+        self._page = self.context.new_page()
         
         # Verify PropertyEngine login status
         self.ensure_propertyengine_login()
     
+    @on_browser_thread
     def ensure_propertyengine_login(self):
         """Ensure PropertyEngine is logged in, re-login if needed"""
         try:
             print("🔍 Checking PropertyEngine login status...")
             
             # Navigate to PropertyEngine login page to check status
-            self.page.goto("https://propertyengine.co.uk/login", wait_until="networkidle")
-            time.sleep(3)
+            goto_ready(self.page, "https://propertyengine.co.uk/login", 'pe_login')
             
             # Check if we're logged in by looking for login indicators
             page_text = self.page.locator("body").text_content()
@@ -111,14 +112,14 @@ class ListingEnrichmentWorkflow:
             print("🔄 Attempting to login...")
             return self.login_propertyengine()
     
+    @on_browser_thread
     def login_propertyengine(self):
         """Login to PropertyEngine"""
         try:
             print("🔐 Logging into PropertyEngine...")
             
             # Navigate to login page
-            self.page.goto("https://propertyengine.co.uk/login", wait_until="networkidle")
-            time.sleep(3)
+            goto_ready(self.page, "https://propertyengine.co.uk/login", 'pe_login')
             
             # Load credentials
             credentials_file = "credentials/propertyengine.json"
@@ -184,8 +185,7 @@ class ListingEnrichmentWorkflow:
             input("   Press Enter when you've completed the login in the browser...")
             
             # Verify login was successful
-            self.page.goto("https://propertyengine.co.uk/", wait_until="networkidle")
-            time.sleep(3)
+            goto_ready(self.page, "https://propertyengine.co.uk/", 'pe_home')
             
             page_text = self.page.locator("body").text_content()
             success_indicators = ['dashboard', 'welcome', 'logout', 'profile', 'account', 'property', 'search']
@@ -196,7 +196,7 @@ class ListingEnrichmentWorkflow:
                     
                     # Save session
                     print("💾 Saving session state...")
-                    self.context.storage_state(path="sessions/propertyengine.json")
+                    self.browser_manager.save_session('propertyengine')
                     print("   Session saved!")
                     
                     return True
@@ -208,18 +208,15 @@ class ListingEnrichmentWorkflow:
             print(f"❌ Error during PropertyEngine login: {e}")
             return False
         
+    @on_browser_thread
     def close_browser(self):
-        """Close the browser"""
-        try:
-            if self.browser:
-                self.browser.close()
-        except Exception as e:
-            print(f"⚠️ Error closing browser: {e}")
+        """Close this workflow's page (the shared browser stays up for other callers)"""
         try:
-            if self.playwright:
-                self.playwright.stop()
+            if self._page and not self._page.is_closed():
+                self._page.close()
         except Exception as e:
-            print(f"⚠️ Error stopping playwright: {e}")
+            print(f"⚠️ Error closing page: {e}")
+        self._page = None
     
     def get_missing_data_rows(self):
         """Get rows from Google Sheet that are missing guide_price or source_url"""
@@ -272,6 +269,11 @@ class ListingEnrichmentWorkflow:
                     print(f"   ⏭️ Row {i+1}: {address} - Skipping test address")
                     continue
                 
+                # Withdrawn, postponed and unsold lots have no listing worth enriching
+                if not should_run(row, 'enrichment'):
+                    print(f"   ⏭️ Row {i+1}: {address} - Skipping {row['outcome']} lot")
+                    continue
+                
                 if not guide_price:
                     missing_rows.append({
                         'row_index': i,
@@ -302,6 +304,7 @@ class ListingEnrichmentWorkflow:
             print(f"❌ Error getting missing data rows: {e}")
             return []
     
+    @on_browser_thread
     def google_search_property_sites(self, address):
         """Google search for property listings on Rightmove first, then Zoopla if needed"""
         try:
@@ -330,12 +333,12 @@ class ListingEnrichmentWorkflow:
             search_url = f"https://www.google.com/search?q={search_query.replace(' ', '+')}"
             
             # Navigate to Google search
-            self.page.goto(search_url, wait_until="networkidle")
-            time.sleep(random.uniform(2, 4))
+            goto_ready(self.page, search_url, 'google_results', timeout=15000)
             
-            # Wait for CAPTCHA if present
-            print("⏱️ Waiting 45 seconds for potential CAPTCHA...")
-            time.sleep(45)
+            # Wait for CAPTCHA if present (results appear once it is solved)
+            if '/sorry/' in self.page.url or self.page.query_selector('#captcha-form'):
+                print("⏱️ CAPTCHA shown, waiting up to 45 seconds for it to be solved...")
+                wait_ready(self.page, 'google_results')
             
             # Look for property site links
             property_links = []
@@ -368,6 +371,7 @@ class ListingEnrichmentWorkflow:
             print(f"❌ Error Google searching {site_name}: {e}")
             return []
     
+    @on_browser_thread
     def verify_property_address(self, property_url, target_address):
         """Verify that the property page is for the correct address"""
         try:
@@ -382,18 +386,16 @@ class ListingEnrichmentWorkflow:
             print(f"🔍 Verifying address on {site_name}: {property_url}")
             
             # Navigate to the property page
-            self.page.goto(property_url, wait_until="networkidle")
-            time.sleep(3)
+            goto_ready(self.page, property_url, 'listing_page')
             
             # Get page content
             page_text = self.page.locator("body").text_content()
             page_title = self.page.title()
             
-            # Extract key parts of the target address
-            target_parts = target_address.lower().split(',')
-            street_part = target_parts[0].strip() if target_parts else ""
-            city_part = target_parts[1].strip() if len(target_parts) > 1 else ""
-            postcode_part = target_parts[-1].strip() if len(target_parts) > 2 else ""
+            # Compare normalized address keys (abbreviations expanded, postcode spacing ignored)
+            target = parse_address(target_address)
+            page_words = parse_address(page_text).tokens
+            page_compact = re.sub(r'\s+', '', page_text.upper())
             
             # Check for address match in page content
             address_found = False
@@ -402,22 +404,21 @@ class ListingEnrichmentWorkflow:
             if target_address.lower() in page_text.lower():
                 address_found = True
                 print(f"   ✅ Full address match found")
-            # Check if key parts match
-            elif (street_part and street_part in page_text.lower() and 
-                  city_part and city_part in page_text.lower()):
+            # Check if the street/town words (and house number) all appear
+            elif (target.tokens and target.tokens <= page_words and
+                  (not target.number or re.search(r'\b' + re.escape(target.number) + r'\b', page_text.upper()))):
                 address_found = True
                 print(f"   ✅ Street and city match found")
             # Check if postcode matches
-            elif postcode_part and postcode_part in page_text.lower():
+            elif target.postcode and target.postcode.replace(' ', '') in page_compact:
                 address_found = True
                 print(f"   ✅ Postcode match found")
             
             if not address_found:
                 print(f"   ❌ Address not found on Rightmove page")
                 print(f"   Looking for: {target_address}")
-                print(f"   Street part: {street_part}")
-                print(f"   City part: {city_part}")
-                print(f"   Postcode part: {postcode_part}")
+                print(f"   Number: {target.number}, words: {' '.join(sorted(target.tokens))}")
+                print(f"   Postcode: {target.postcode}")
                 return False
             
             print(f"   ✅ Address verified on Rightmove page")
@@ -427,6 +428,7 @@ class ListingEnrichmentWorkflow:
             print(f"❌ Error verifying Rightmove address: {e}")
             return False
     
+    @on_browser_thread
     def extract_from_propertyengine(self, property_url, auction_name=None, auction_date=None):
         """Extract property information from PropertyEngine using property URL"""
         try:
@@ -439,8 +441,7 @@ class ListingEnrichmentWorkflow:
             
             # Navigate directly to PropertyEngine properties page where the paste link input is located
             propertyengine_url = "https://propertyengine.co.uk/properties"
-            self.page.goto(propertyengine_url, wait_until="networkidle")
-            time.sleep(3)
+            goto_ready(self.page, propertyengine_url, 'pe_properties')
             
             print(f"📋 Page title: {self.page.title()}")
             print(f"🔗 Current URL: {self.page.url}")
@@ -481,7 +482,7 @@ class ListingEnrichmentWorkflow:
             # Click on the Paste Link button
             print(f"   🖱️ Clicking on Paste Link button...")
             paste_link_button.click()
-            time.sleep(2)
+            wait_ready(self.page, 'pe_paste_input')
             
             # Now look for the input field that appears after clicking Paste Link
             input_selectors = [
@@ -513,12 +514,11 @@ class ListingEnrichmentWorkflow:
             print(f"   📝 Pasting property URL: {property_url}")
             input_field.fill("")
             input_field.type(property_url)
-            time.sleep(3)
             
             # Press Enter to trigger any validation
             print(f"   ⌨️ Pressing Enter to validate input...")
             input_field.press("Enter")
-            time.sleep(2)
+            wait_ready(self.page, 'pe_paste_submit')
             
             # Look for submit button
             submit_selectors = [
@@ -562,7 +562,7 @@ class ListingEnrichmentWorkflow:
                     # Continue anyway - the form might have auto-submitted
                     print(f"   🔄 Continuing with extraction...")
             
-            time.sleep(5)
+            wait_ready(self.page, 'pe_property')
             
             # Look for the property pop-up that appears after submitting
             print(f"   🔍 Looking for property pop-up...")
@@ -604,16 +604,16 @@ class ListingEnrichmentWorkflow:
                         print(f"   ✅ Found property listing with selector: {selector}")
                         print(f"   🖱️ Clicking on property listing...")
                         property_elem.click()
-                        time.sleep(3)
+                        wait_ready(self.page, 'pe_timeline')
                         break
             
             # Take screenshot to see current state
             self.page.screenshot(path="propertyengine_after_submit.png")
             print("📸 Screenshot saved: propertyengine_after_submit.png")
             
-            # Wait a bit more for timeline to load
+            # Wait for the timeline to load
             print(f"   ⏳ Waiting for timeline to load...")
-            time.sleep(5)
+            wait_ready(self.page, 'pe_timeline')
             
             # Extract property information from the current page
             page_text = self.page.locator("body").text_content()
@@ -1005,7 +1005,7 @@ class ListingEnrichmentWorkflow:
                             # Click the link to go to the listing page
                             print(f"   🖱️ Clicking on view listing link...")
                             listing_link.click()
-                            time.sleep(3)
+                            wait_ready(self.page, 'listing_page')
                             
                             # Get the current URL (should be the original listing)
                             current_url = self.page.url
@@ -1088,20 +1088,20 @@ class ListingEnrichmentWorkflow:
                                                     print(f"   ❌ Listing is outside 12-month timeframe")
                                                     # Go back to PropertyEngine page to try next listing
                                                     self.page.go_back()
-                                                    time.sleep(2)
+                                                    wait_ready(self.page, 'pe_timeline')
                                                     continue
                                                     
                                             except Exception as e:
                                                 print(f"   ⚠️ Error parsing dates: {e}")
                                                 # If date parsing fails, skip this listing
                                                 self.page.go_back()
-                                                time.sleep(2)
+                                                wait_ready(self.page, 'pe_timeline')
                                                 continue
                                         else:
                                             print(f"   ⚠️ No listing date found")
                                             # Go back to PropertyEngine page to try next listing
                                             self.page.go_back()
-                                            time.sleep(2)
+                                            wait_ready(self.page, 'pe_timeline')
                                             continue
                                     else:
                                         print(f"   ⚠️ No auction date available for timeframe check")
@@ -1114,7 +1114,7 @@ class ListingEnrichmentWorkflow:
                                     print(f"   ❌ Auction names are the same, trying next listing")
                                     # Go back to PropertyEngine page to try next listing
                                     self.page.go_back()
-                                    time.sleep(2)
+                                    wait_ready(self.page, 'pe_timeline')
                                     continue
                             else:
                                 print(f"   ⚠️ No auction name to compare, using this listing")
@@ -1159,7 +1159,7 @@ class ListingEnrichmentWorkflow:
                             # Click the link to go to the listing page
                             print(f"   🖱️ Clicking on view listing link...")
                             listing_link.click()
-                            time.sleep(3)
+                            wait_ready(self.page, 'listing_page')
                             
                             # Get the current URL
                             current_url = self.page.url
@@ -1271,7 +1271,7 @@ class ListingEnrichmentWorkflow:
                             
                             # Go back to PropertyEngine page to try next listing
                             self.page.go_back()
-                            time.sleep(2)
+                            wait_ready(self.page, 'pe_timeline')
                         
                         if not suitable_listing_found:
                             print(f"   ⚠️ No suitable listing found within 12 months")
@@ -1319,52 +1319,34 @@ class ListingEnrichmentWorkflow:
             return None
     
     def update_spreadsheet_row(self, row_data, new_data):
-        """Update a row in the Google Sheet with new data"""
+        """Queue a row update for the Google Sheet; returns its write Future (None if it could not be queued)"""
         try:
-            # Prepare update payload
-            update_payload = {
-                'token': self.sheets_manager.shared_token,
-                'action': 'update_row',
-                'sheet_id': os.getenv('GOOGLE_SHEETS_ID', '1ONZrugWl0amSFqGLq3_hHmR82Bps-vNxr-25gGk8B9Q'),
-                'row_data': {
-                    'auction_name': row_data.get('auction_name', ''),
-                    'auction_date': row_data.get('auction_date', ''),
-                    'address': row_data.get('address', ''),
-                    'auction_sale': row_data.get('auction_sale', ''),
-                    'lot_number': row_data.get('lot_number', ''),
-                    'postcode': row_data.get('postcode', ''),
-                    'purchase_price': row_data.get('purchase_price', ''),
-                    'sold_date': row_data.get('sold_date', ''),
-                    'auction_url': row_data.get('auction_url', ''),
-                    'source_url': new_data.get('source_url', row_data.get('source_url', '')),
-                    'guide_price': new_data.get('guide_price', row_data.get('guide_price', '')),
-                    'owner': row_data.get('owner', ''),
-                    'qa_status': 'enriched'
-                }
-            }
-            
-            # Send update request
-            import requests
-            response = requests.post(self.sheets_manager.webapp_url, json=update_payload, timeout=30)
-            
-            if response.status_code == 200:
-                result = response.json()
-                if result.get('ok'):
-                    print(f"✅ Successfully updated spreadsheet row")
-                    return True
-                else:
-                    print(f"❌ Failed to update spreadsheet: {result}")
-                    return False
-            else:
-                print(f"❌ HTTP error updating spreadsheet: {response.status_code}")
-                return False
+            write = self.sheets_manager.writer.update({
+                'auction_name': row_data.get('auction_name', ''),
+                'auction_date': row_data.get('auction_date', ''),
+                'address': row_data.get('address', ''),
+                # Rows imported before property_id existed get it backfilled here
+                'property_id': row_data.get('property_id') or property_id(row_data.get('address', ''), row_data.get('postcode')),
+                'auction_sale': row_data.get('auction_sale', ''),
+                'lot_number': row_data.get('lot_number', ''),
+                'postcode': row_data.get('postcode', ''),
+                'purchase_price': row_data.get('purchase_price', ''),
+                'sold_date': row_data.get('sold_date', ''),
+                'auction_url': row_data.get('auction_url', ''),
+                'source_url': new_data.get('source_url', row_data.get('source_url', '')),
+                'guide_price': new_data.get('guide_price', row_data.get('guide_price', '')),
+                'owner': row_data.get('owner', ''),
+                'qa_status': 'enriched'
+            })
+            print(f"📤 Spreadsheet row update queued")
+            return write
                 
         except Exception as e:
             print(f"❌ Error updating spreadsheet: {e}")
-            return False
+            return None
     
     def process_missing_row(self, row_info):
-        """Process a single row with missing data"""
+        """Process a single row with missing data; returns its queued row update, or False"""
         row_data = row_info['data']
         address = row_data.get('address', '')
         auction_date = row_data.get('auction_date', '')
@@ -1398,12 +1380,11 @@ class ListingEnrichmentWorkflow:
             if result:
                 print(f"   ✅ Successfully extracted data from PropertyEngine!")
                 
-                # Update the spreadsheet
-                update_success = self.update_spreadsheet_row(row_data, result)
+                # Update the spreadsheet (sent with the rest of the run's updates)
+                write = self.update_spreadsheet_row(row_data, result)
                 
-                if update_success:
-                    print(f"   ✅ Successfully updated spreadsheet")
-                    return True
+                if write is not None:
+                    return write
                 else:
                     print(f"   ❌ Failed to update spreadsheet")
             elif result is None:
@@ -1436,16 +1417,16 @@ class ListingEnrichmentWorkflow:
             
             print(f"\n📊 Processing {len(missing_rows)} rows with missing data...")
             
-            # Process each missing row
-            processed_count = 0
+            # Process each missing row, queueing the sheet updates
+            writes = []
             for i, row_info in enumerate(missing_rows):
                 print(f"\n{'='*60}")
                 print(f"Processing row {i+1}/{len(missing_rows)}")
                 print(f"{'='*60}")
                 
-                success = self.process_missing_row(row_info)
-                if success:
-                    processed_count += 1
+                write = self.process_missing_row(row_info)
+                if write:
+                    writes.append(write)
                 
                 # Add delay between rows
                 if i < len(missing_rows) - 1:  # Don't delay after last row
@@ -1453,14 +1434,27 @@ class ListingEnrichmentWorkflow:
                     print(f"⏱️ Waiting {delay:.1f} seconds before next row...")
                     time.sleep(delay)
             
+            # Send the queued updates in one batch, then count those written
+            self.sheets_manager.flush()
+            processed_count = 0
+            for write in writes:
+                result = write.result()
+                if result.get('ok'):
+                    processed_count += 1
+                else:
+                    print(f"❌ Spreadsheet row not updated: {result.get('error', 'Unknown error')}")
+            
             print(f"\n📊 Workflow Summary:")
             print(f"   ✅ Successfully processed: {processed_count}")
             print(f"   ⏭️ Failed to process: {len(missing_rows) - processed_count}")
             print(f"   📈 Success rate: {processed_count/len(missing_rows)*100:.1f}%")
+            print(f"   🏷️ {get_triage_stats().summary()}")
             
         except Exception as e:
             print(f"❌ Error in workflow: {e}")
         finally:
+            # Send the row updates still queued for the sheet
+            self.sheets_manager.flush()
             self.close_browser()
 
 if __name__ == "__main__":
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Write-behind batching for the Google Apps Script web app
+
+Every sheet write used to be a web-app execution of its own: one POST per
+imported lot, per POTENTIAL_TRADES row and per enrichment update. SheetWriter
+buffers rows per (action, tab) and sends a buffer as one request (the script's
+'add' action takes a rows array, 'update_rows' updates many rows) when
+
+- SHEET_BATCH_SIZE rows are waiting in it,
+- its oldest row has waited SHEET_FLUSH_INTERVAL seconds, or
+- a caller asks for flush() (a pipeline stage that wants its rows written, or
+  the end of a run; whatever is still queued at exit is flushed by atexit).
+
+Updates waiting for the same row (property_id or address, plus auction) are
+coalesced into one, the later values winning. Every queued row gets a Future
+resolving to its own result ({'ok': True} or {'ok': False, 'error': ...}).
+
+Requests are sent one at a time through the process-wide AdaptiveRateLimiter,
+so executions stay spaced out and well inside Apps Script's simultaneous
+execution limit, and a quota error or 429/5xx answer backs off and retries.
+Appends are only retried when the request cannot have run (refused
+connection, 429/503), so a lost response never writes the rows twice.
+"""
+
+import os
+import time
+import atexit
+import threading
+from concurrent.futures import Future
+
+import requests
+from urllib3.exceptions import NewConnectionError
+
+from rate_limit import get_adaptive_limiter
+
+SHEET_BATCH_SIZE = int(os.getenv('SHEET_BATCH_SIZE', '50'))
+SHEET_FLUSH_INTERVAL = float(os.getenv('SHEET_FLUSH_INTERVAL', '30.0'))
+SHEET_MAX_RETRIES = int(os.getenv('SHEET_MAX_RETRIES', '3'))
+SHEET_REQUEST_TIMEOUT = 60
+
+DEFAULT_TAB = 'AUCTIONS_MASTER'
+
+# Answers worth retrying after backing off: the request was turned away before it ran.
+# An 'add' that may have run is not sent again (it would append its rows twice),
+# so adds are only retried on the answers that mean it was refused outright
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+ADD_RETRY_STATUSES = {429, 503}
+QUOTA_ERRORS = ('too many times', 'quota', 'rate limit', 'try again later')
+
+
+def row_key(row):
+    """Coalescing key of an update: property_id (or address) plus auction, as the script's findRowIndex matches"""
+    return (row.get('property_id') or row.get('address', ''), row.get('auction_name', ''), row.get('auction_date', ''))
+
+
+def _never_sent(error):
+    """True if a requests ConnectionError happened while connecting, before the request was sent"""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = error.args[0] if error.args else None
+    return isinstance(getattr(reason, 'reason', reason), NewConnectionError)
+
+
+def _is_quota_error(text):
+    text = (text or '').lower()
+    return any(phrase in text for phrase in QUOTA_ERRORS)
+
+
+class _Buffer:
+    """Rows waiting for one (action, tab), with their futures"""
+
+    def __init__(self):
+        self.rows = []
+        self.futures = []
+        self.keys = {}  # row_key -> position, for coalescing updates
+        self.since = time.monotonic()
+
+
+class SheetWriter:
+    """Thread-safe write-behind buffer in front of the Apps Script web app"""
+
+    def __init__(self, webapp_url, token, batch_size=SHEET_BATCH_SIZE, flush_interval=SHEET_FLUSH_INTERVAL):
+        """
+        Initialize the writer
+
+        Args:
+            webapp_url: Google Apps Script web app URL
+            token: Shared token for authentication
+            batch_size: Most rows sent in one request (a full buffer is sent right away)
+            flush_interval: Most seconds a row waits in a buffer before it is sent
+        """
+        self.webapp_url = webapp_url
+        self.token = token
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.sheet_id = os.getenv('GOOGLE_SHEETS_ID')
+        self.stats = {'rows': 0, 'coalesced': 0, 'requests': 0, 'retries': 0, 'failed': 0}
+        self._cond = threading.Condition()
+        self._send_lock = threading.Lock()  # one request in flight at a time
+        self._buffers = {}
+        self._batch_updates = True  # False once the deployed script turns out not to know update_rows
+        self._flusher = None
+        self._closed = False
+
+    def add(self, row, tab=DEFAULT_TAB):
+        """Queue a row to append to a tab. Returns a Future of the row's result"""
+        return self._queue('add', tab, row, None)
+
+    def update(self, row, tab=DEFAULT_TAB):
+        """Queue an update of an existing row (matched like update_row). Returns a Future of the row's result"""
+        return self._queue('update_rows', tab, row, row_key(row))
+
+    def _queue(self, action, tab, row, key):
+        with self._cond:
+            buffer = self._buffers.setdefault((action, tab), _Buffer())
+            if key is not None and key in buffer.keys:
+                position = buffer.keys[key]
+                buffer.rows[position] = {**buffer.rows[position], **row}
+                self.stats['coalesced'] += 1
+                return buffer.futures[position]
+            future = Future()
+            if key is not None:
+                buffer.keys[key] = len(buffer.rows)
+            buffer.rows.append(row)
+            buffer.futures.append(future)
+            self.stats['rows'] += 1
+            if self._flusher is None:
+                self._closed = False
+                self._flusher = threading.Thread(target=self._run, name="sheet-writer", daemon=True)
+                self._flusher.start()
+            # Wake the flusher for a full buffer, or to time a new one
+            if len(buffer.rows) == 1 or len(buffer.rows) >= self.batch_size:
+                self._cond.notify()
+            return future
+
+    def _due(self, now):
+        """(action, tab) keys of the buffers that are full or have waited long enough"""
+        return [name for name, buffer in self._buffers.items()
+                if len(buffer.rows) >= self.batch_size or now - buffer.since >= self.flush_interval]
+
+    def _run(self):
+        """Flusher thread: send buffers as they fill up or age"""
+        while True:
+            with self._cond:
+                while not self._closed and not self._due(time.monotonic()):
+                    oldest = min((buffer.since for buffer in self._buffers.values()), default=None)
+                    self._cond.wait(None if oldest is None else max(0.0, oldest + self.flush_interval - time.monotonic()))
+                if self._closed:
+                    return
+            self._send_buffers(everything=False)
+
+    def _send_buffers(self, everything):
+        # Buffers are taken under the send lock, so once flush() returns every
+        # row queued before it has been sent (not just handed to the flusher)
+        with self._send_lock:
+            with self._cond:
+                names = list(self._buffers) if everything else self._due(time.monotonic())
+                taken = [(name, self._buffers.pop(name)) for name in names]
+            for (action, tab), buffer in taken:
+                for start in range(0, len(buffer.rows), self.batch_size):
+                    rows = buffer.rows[start:start + self.batch_size]
+                    try:
+                        results = self._send_rows(action, tab, rows)
+                    except Exception as e:
+                        results = [{'ok': False, 'error': str(e)}] * len(rows)
+                    for row, future, result in zip(rows, buffer.futures[start:start + self.batch_size], results):
+                        if not result.get('ok'):
+                            self.stats['failed'] += 1
+                            print(f"    ❌ Sheet row not written to {tab}: {row.get('address', 'Unknown')} ({result.get('error')})")
+                        future.set_result(result)
+
+    def flush(self):
+        """Send every queued row now and wait until they have been written"""
+        self._send_buffers(everything=True)
+
+    def close(self):
+        """Flush and stop the flusher thread"""
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            flusher, self._flusher = self._flusher, None
+        if flusher is not None:
+            flusher.join(timeout=5)
+
+    def _send_rows(self, action, tab, rows):
+        """One request for a batch of rows; returns one result per row"""
+        if action == 'update_rows' and not self._batch_updates:
+            return [self._send_one_update(tab, row) for row in rows]
+
+        response = self._post({'action': action, 'sheet_name': tab, 'rows': rows})
+        if action == 'update_rows' and response.get('error') == 'Invalid action':
+            print("⚠️ Deployed web app has no update_rows action - updating rows one at a time (redeploy the script)")
+            self._batch_updates = False
+            return [self._send_one_update(tab, row) for row in rows]
+
+        print(f"📤 Sheet: {action} {len(rows)} row(s) on {tab} in one request")
+        if not response.get('ok'):
+            return [{'ok': False, 'error': response.get('error', 'Unknown error')}] * len(rows)
+        results = response.get('results')
+        if not isinstance(results, list) or len(results) != len(rows):
+            # Deployments from before per-row results answer for the whole batch
+            return [{'ok': True}] * len(rows)
+        return [{'ok': bool(result.get('ok')), **result} for result in sorted(results, key=lambda r: r.get('index', 0))]
+
+    def _send_one_update(self, tab, row):
+        return self._post({'action': 'update_row', 'sheet_name': tab, 'row_data': row})
+
+    def _post(self, payload):
+        """POST to the web app with pacing and retries; returns the parsed answer"""
+        payload = {'token': self.token, **payload}
+        if self.sheet_id:
+            payload['sheet_id'] = self.sheet_id
+        adding = payload.get('action') == 'add'
+        retry_statuses = ADD_RETRY_STATUSES if adding else RETRY_STATUSES
+        limiter = get_adaptive_limiter()
+        error = 'No attempt made'
+        for attempt in range(SHEET_MAX_RETRIES + 1):
+            if attempt:
+                self.stats['retries'] += 1
+                limiter.record_block(self.webapp_url)
+            limiter.acquire(self.webapp_url)
+            self.stats['requests'] += 1
+            try:
+                response = requests.post(self.webapp_url, json=payload, timeout=SHEET_REQUEST_TIMEOUT)
+            except requests.ConnectionError as e:
+                error = f"Connection error: {e}"
+                if adding and not _never_sent(e):
+                    # The rows may have been appended before the connection dropped
+                    return {'ok': False, 'error': error}
+                continue
+            except requests.RequestException as e:
+                # A timed out add may still have been written, so it is not sent twice
+                return {'ok': False, 'error': f"Request failed: {e}"}
+
+            if response.status_code in retry_statuses:
+                error = f"HTTP {response.status_code}"
+                continue
+            if response.status_code != 200:
+                return {'ok': False, 'error': f"HTTP {response.status_code}: {response.text[:200]}"}
+            try:
+                result = response.json()
+            except ValueError:
+                if _is_quota_error(response.text):
+                    error = f"Quota error: {response.text[:200]}"
+                    continue
+                return {'ok': False, 'error': f"Invalid JSON response: {response.text[:200]}"}
+            if not result.get('ok') and _is_quota_error(result.get('error')):
+                error = result.get('error')
+                continue
+            limiter.record_success(self.webapp_url)
+            return result
+        return {'ok': False, 'error': error}
+
+    def summary(self):
+        """One-line human readable summary"""
+        return (f"{self.stats['rows']} rows in {self.stats['requests']} requests "
+                f"({self.stats['coalesced']} coalesced, {self.stats['retries']} retries, {self.stats['failed']} failed)")
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def get_sheet_writer(webapp_url, token):
+    """Return the process-wide SheetWriter for a web app (flushed at exit)"""
+    with _writers_lock:
+        if not _writers:
+            atexit.register(close_sheet_writers)
+        if (webapp_url, token) not in _writers:
+            _writers[(webapp_url, token)] = SheetWriter(webapp_url, token)
+        return _writers[(webapp_url, token)]
+
+
+def close_sheet_writers():
+    """Flush and close every SheetWriter (registered with atexit)"""
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        try:
+            writer.close()
+            print(f"📤 Sheet writer: {writer.summary()}")
+        except Exception as e:
+            print(f"⚠️ Error flushing sheet writes: {e}")
@@ -5,14 +5,37 @@ Google Sheets integration using Google Apps Script web app
 
 import os
 import json
-import requests
+import threading
+from concurrent.futures import Future
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
 from dotenv import load_dotenv
 
+from sheet_writer import get_sheet_writer
+
 # Load environment variables from .env file
 load_dotenv()
 
+
+def wait_for_write(result, timeout=None):
+    """
+    Final result of a property queued by add_property/process_property_data
+    
+    Args:
+        result: Dictionary returned by add_property (results without a pending
+                write, e.g. validation errors, are returned as they are)
+        timeout: Most seconds to wait (None waits until the row is sent)
+        
+    Returns:
+        Dictionary with status and message
+        
+    Raises:
+        The error that kept the write's result from being built
+    """
+    write = result.get('write')
+    return write.result(timeout) if write is not None else result
+
+
 class PropertyDataManagerWebApp:
     """Property data manager using Google Apps Script web app"""
     
@@ -26,10 +49,12 @@ class PropertyDataManagerWebApp:
         """
         self.webapp_url = webapp_url or "https://script.google.com/macros/s/AKfycbyq-rzQJCXz3OiDhrHHNoZ-3jrUvTF-5OR9l9QtlyQTVib6rfGN6MOeWXDNlIIhkNAE/exec"
         self.shared_token = shared_token or os.getenv('GOOGLE_SHEETS_SHARED_TOKEN')
+        self.writer = get_sheet_writer(self.webapp_url, self.shared_token)
         
         # Fallback to local JSON file
         self.local_data_file = "property_data.json"
         self.property_data = []
+        self._local_lock = threading.Lock()
         self.load_local_data()
         
         print(f"✅ WebApp Property Data Manager initialized")
@@ -59,118 +84,83 @@ class PropertyDataManagerWebApp:
     
     def add_property(self, property_data):
         """
-        Add a property to the Google Sheet via web app
+        Queue a property for the Google Sheet via web app
+        
+        The row goes out with the next batch of the shared SheetWriter (see
+        sheet_writer); the returned 'write' future resolves to the final result
+        once it has been written (or kept in local storage if the web app
+        rejected it). Use wait_for_write() to get it.
         
         Args:
             property_data: Dictionary containing property information
             
         Returns:
-            Dictionary with status and message
+            Dictionary with status and message, plus the pending 'write'
         """
+        # Add timestamp for tracking
+        property_data['added_timestamp'] = datetime.now().isoformat()
+        
+        # Row in the format expected by the Google Apps Script 'add' action
+        row = {
+            'auction_name': property_data.get('auction_name', ''),
+            'auction_date': property_data.get('auction_date', ''),
+            'address': property_data.get('address', ''),
+            'property_id': property_data.get('property_id', ''),  # Canonical key used to find the row again
+            'auction_sale': property_data.get('auction_sale', ''),
+            'lot_number': property_data.get('lot_number', ''),
+            'postcode': property_data.get('postcode', ''),
+            'purchase_price': property_data.get('purchase_price', ''),
+            'sold_date': property_data.get('sold_date', ''),
+            'owner': '',  # Not provided in our data
+            'guide_price': property_data.get('guide_price', '') if property_data.get('guide_price') is not None else '',  # Handle null guide price
+            'auction_url': property_data.get('auction_url', ''),  # New auction_url field
+            'source_url': '',  # Leave source_url empty as requested
+            'qa_status': 'imported',  # Default status
+            'ingested_at': property_data['added_timestamp']
+        }
+        
+        written = Future()
+        self.writer.add(row).add_done_callback(
+            lambda future: self._resolve_written(written, property_data, future)
+        )
+        return {
+            "status": "success",
+            "action": "queued",
+            "message": f"Queued property for Google Sheets: {property_data.get('address', 'Unknown')}",
+            "write": written
+        }
+    
+    def _resolve_written(self, written, property_data, future):
+        """Resolve add_property's 'write' future, with the error if the result could not be built"""
         try:
-            # Add timestamp for tracking
-            property_data['added_timestamp'] = datetime.now().isoformat()
-            
-            # Prepare payload for web app in the format expected by the Google Apps Script
-            # The script expects: body.rows (array) with specific field names
-            script_payload = {
-                'token': self.shared_token,
-                'action': 'add',  # Add the action field
-                'rows': [{
-                    'auction_name': property_data.get('auction_name', ''),
-                    'auction_date': property_data.get('auction_date', ''),
-                    'address': property_data.get('address', ''),
-                    'auction_sale': property_data.get('auction_sale', ''),
-                    'lot_number': property_data.get('lot_number', ''),
-                    'postcode': property_data.get('postcode', ''),
-                    'purchase_price': property_data.get('purchase_price', ''),
-                    'sold_date': property_data.get('sold_date', ''),
-                    'owner': '',  # Not provided in our data
-                    'guide_price': property_data.get('guide_price', '') if property_data.get('guide_price') is not None else '',  # Handle null guide price
-                    'auction_url': property_data.get('auction_url', ''),  # New auction_url field
-                    'source_url': '',  # Leave source_url empty as requested
-                    'qa_status': 'imported',  # Default status
-                    'ingested_at': property_data.get('added_timestamp', datetime.now().isoformat())
-                }]
-            }
-            
-            print(f"📤 Sending data to Google Apps Script in correct format...")
-            print(f"   Rows count: {len(script_payload['rows'])}")
-            print(f"   First row address: {script_payload['rows'][0].get('address', 'Unknown')}")
-            
-            payload = script_payload
-            
-            # Send request to web app
-            print(f"🌐 Sending request to Google Apps Script web app...")
-            print(f"📤 Payload: {json.dumps(payload, indent=2)}")
-            
-            response = requests.post(self.webapp_url, json=payload, timeout=30)
-            
-            print(f"📥 Response status: {response.status_code}")
-            print(f"📥 Response text: {response.text[:500]}...")
-            
-            if response.status_code == 200:
-                try:
-                    result = response.json()
-                    print(f"📥 Parsed response: {result}")
-                    
-                    if result.get('ok'):
-                        print(f"✅ Added to Google Sheets via WebApp: {property_data.get('address', 'Unknown')}")
-                        
-                        # Also add to local data as backup
-                        self.property_data.append(property_data)
-                        self.save_local_data()
-                        
-                        return {
-                            "status": "success",
-                            "action": "added",
-                            "message": f"Added property to Google Sheets via WebApp: {property_data.get('address', 'Unknown')}"
-                        }
-                    else:
-                        print(f"⚠️ WebApp returned error: {result}")
-                        # Fallback to local storage
-                        self.property_data.append(property_data)
-                        self.save_local_data()
-                        
-                        return {
-                            "status": "success",
-                            "action": "added_local",
-                            "message": f"Added property to local storage (WebApp error): {property_data.get('address', 'Unknown')}"
-                        }
-                except Exception as e:
-                    print(f"❌ Error parsing response JSON: {e}")
-                    # Fallback to local storage
-                    self.property_data.append(property_data)
-                    self.save_local_data()
-                    
-                    return {
-                        "status": "success",
-                        "action": "added_local",
-                        "message": f"Added property to local storage (JSON parse error): {property_data.get('address', 'Unknown')}"
-                    }
-            else:
-                print(f"❌ HTTP error {response.status_code}: {response.text}")
-                # Fallback to local storage
-                self.property_data.append(property_data)
-                self.save_local_data()
-                
-                return {
-                    "status": "success",
-                    "action": "added_local",
-                    "message": f"Added property to local storage (HTTP error): {property_data.get('address', 'Unknown')}"
-                }
-                
+            written.set_result(self._property_written(property_data, future.result()))
         except Exception as e:
-            print(f"❌ Error adding property: {e}")
-            # Fallback to local storage
+            print(f"⚠️ Error finishing sheet write of {property_data.get('address', 'Unknown')}: {e}")
+            written.set_exception(e)
+    
+    def _property_written(self, property_data, result):
+        """Keep the local backup of a sent row and build add_property's final result"""
+        address = property_data.get('address', 'Unknown')
+        with self._local_lock:
             self.property_data.append(property_data)
             self.save_local_data()
-            
+        
+        if result.get('ok'):
             return {
                 "status": "success",
-                "action": "added_local",
-                "message": f"Added property to local storage (Exception): {property_data.get('address', 'Unknown')}"
+                "action": "added",
+                "message": f"Added property to Google Sheets via WebApp: {address}"
             }
+        # Fallback to local storage
+        return {
+            "status": "success",
+            "action": "added_local",
+            "message": f"Added property to local storage (WebApp error: {result.get('error')}): {address}"
+        }
+    
+    def flush(self):
+        """Send every queued sheet write now and wait until they have been written"""
+        self.writer.flush()
     
     def process_property_data(self, property_data):
         """
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Compressed, content-addressed store of fetched pages
+
+Every EIG listing page, lot page and English House Prices results page the
+pipeline fetches is kept here, so a parser fix or a new field can be re-run
+over historical pages (eig.reparse_lot_snapshots / reparse_prices_snapshots)
+instead of re-scraping the live sites and paying their rate limits again.
+
+Page bodies are stored once per distinct content (SHA-256) under
+SNAPSHOT_DIR/objects, zstd compressed when the zstandard package is
+installed and gzip otherwise. An SQLite index records which URL had which
+content at which fetch time. prune() applies the retention policy: snapshots
+older than SNAPSHOT_RETENTION_DAYS are dropped, except the newest one of each
+URL, and content no snapshot refers to any more is deleted.
+
+Usage:
+    python snapshot_store.py stats
+    python snapshot_store.py prune [retention_days]
+"""
+
+import os
+import sys
+import gzip
+import time
+import sqlite3
+import hashlib
+import threading
+
+try:
+    import zstandard
+except ImportError:  # Optional: gzip is used without it
+    zstandard = None
+
+SNAPSHOT_DIR = os.getenv('SNAPSHOT_DIR', 'cache/snapshots')
+SNAPSHOTS_ENABLED = os.getenv('SNAPSHOTS', 'true').lower() != 'false'
+SNAPSHOT_RETENTION_DAYS = float(os.getenv('SNAPSHOT_RETENTION_DAYS', '365'))
+
+KINDS = ('listing', 'lot', 'ehp')
+
+
+def page_kind(url):
+    """Snapshot kind of a page URL: 'ehp', 'lot' or 'listing'"""
+    if 'englishhouseprices.com' in url:
+        return 'ehp'
+    if '/lot/' in url:
+        return 'lot'
+    return 'listing'
+
+
+def compress(data):
+    """
+    Compress a page body.
+
+    Returns:
+        (codec, blob) - codec is 'zst' or 'gz'
+    """
+    if zstandard is not None:
+        return 'zst', zstandard.ZstdCompressor(level=10).compress(data)
+    return 'gz', gzip.compress(data, compresslevel=6)
+
+
+def decompress(codec, blob):
+    """Inverse of compress()"""
+    if codec == 'zst':
+        if zstandard is None:
+            raise RuntimeError("zstandard is needed to read zstd-compressed snapshots")
+        return zstandard.ZstdDecompressor().decompress(blob)
+    return gzip.decompress(blob)
+
+
+class SnapshotStore:
+    """Content-addressed page snapshots with an SQLite (url, fetched_at) index"""
+
+    def __init__(self, root=SNAPSHOT_DIR):
+        """
+        Open (or create) the store
+
+        Args:
+            root: Directory holding index.sqlite and the objects/ tree
+        """
+        self.root = root
+        self.objects = os.path.join(root, 'objects')
+        self.stats = {'saved': 0, 'deduplicated': 0, 'bytes_raw': 0, 'bytes_stored': 0}
+        self._lock = threading.Lock()
+
+        os.makedirs(self.objects, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(root, 'index.sqlite'), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS snapshots ("
+            " url TEXT NOT NULL,"
+            " kind TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL,"
+            " digest TEXT NOT NULL,"
+            " codec TEXT NOT NULL,"
+            " size INTEGER NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS ix_snapshots_url ON snapshots (url, fetched_at)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS ix_snapshots_kind ON snapshots (kind, fetched_at)")
+        self._db.commit()
+
+    def _object_path(self, digest, codec):
+        return os.path.join(self.objects, digest[:2], f"{digest}.{codec}")
+
+    def save(self, url, html, kind=None, fetched_at=None):
+        """
+        Store a fetched page.
+
+        Args:
+            url: URL the page was fetched from
+            html: Page body
+            kind: 'listing', 'lot' or 'ehp' (guessed from the URL if not given)
+            fetched_at: Fetch time (now if not given)
+
+        Returns:
+            SHA-256 digest of the body
+        """
+        data = html.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        codec = 'zst' if zstandard is not None else 'gz'
+
+        with self._lock:
+            existing = self._db.execute("SELECT codec FROM snapshots WHERE digest = ? LIMIT 1", (digest,)).fetchone()
+            if existing:
+                codec = existing[0]
+                self.stats['deduplicated'] += 1
+            else:
+                codec, blob = compress(data)
+                path = self._object_path(digest, codec)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path + '.tmp', 'wb') as handle:
+                    handle.write(blob)
+                os.replace(path + '.tmp', path)
+                self.stats['saved'] += 1
+                self.stats['bytes_raw'] += len(data)
+                self.stats['bytes_stored'] += len(blob)
+
+            self._db.execute(
+                "INSERT INTO snapshots (url, kind, fetched_at, digest, codec, size) VALUES (?, ?, ?, ?, ?, ?)",
+                (url, kind or page_kind(url), fetched_at or time.time(), digest, codec, len(data))
+            )
+            self._db.commit()
+        return digest
+
+    def _read(self, digest, codec):
+        with open(self._object_path(digest, codec), 'rb') as handle:
+            return decompress(codec, handle.read()).decode('utf-8')
+
+    def latest(self, url, before=None):
+        """
+        Most recent snapshot of a URL.
+
+        Args:
+            url: Page URL
+            before: Only consider snapshots fetched before this time
+
+        Returns:
+            (html, fetched_at), or (None, None) if the URL was never stored
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT digest, codec, fetched_at FROM snapshots WHERE url = ? AND fetched_at < ?"
+                " ORDER BY fetched_at DESC LIMIT 1",
+                (url, before or float('inf'))
+            ).fetchone()
+        if row is None:
+            return None, None
+        return self._read(row[0], row[1]), row[2]
+
+    def latest_by_url(self, kind):
+        """
+        Newest snapshot of every URL of a kind, for re-parsing historical pages.
+
+        Yields:
+            (url, html, fetched_at)
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT url, digest, codec, MAX(fetched_at) FROM snapshots WHERE kind = ? GROUP BY url ORDER BY url",
+                (kind,)
+            ).fetchall()
+        for url, digest, codec, fetched_at in rows:
+            try:
+                yield url, self._read(digest, codec), fetched_at
+            except (OSError, RuntimeError) as e:
+                print(f"⚠️ Could not read snapshot of {url}: {e}")
+
+    def prune(self, retention_days=SNAPSHOT_RETENTION_DAYS):
+        """
+        Apply the retention policy: drop snapshots older than retention_days
+        (keeping each URL's newest) and delete content nothing refers to.
+
+        Returns:
+            Dict with the number of snapshots and objects removed
+        """
+        cutoff = time.time() - retention_days * 86400
+        with self._lock:
+            removed = self._db.execute(
+                "DELETE FROM snapshots WHERE fetched_at < ? AND rowid NOT IN"
+                " (SELECT rowid FROM snapshots s WHERE s.fetched_at = (SELECT MAX(fetched_at) FROM snapshots t WHERE t.url = s.url))",
+                (cutoff,)
+            ).rowcount
+            self._db.commit()
+            referenced = {digest for digest, in self._db.execute("SELECT DISTINCT digest FROM snapshots")}
+
+        objects_removed = 0
+        for directory, _, files in os.walk(self.objects):
+            for name in files:
+                if name.split('.', 1)[0] not in referenced and not name.endswith('.tmp'):
+                    os.remove(os.path.join(directory, name))
+                    objects_removed += 1
+        return {'snapshots': removed, 'objects': objects_removed}
+
+    def counts(self):
+        """Number of snapshots per kind"""
+        with self._lock:
+            return dict(self._db.execute("SELECT kind, COUNT(*) FROM snapshots GROUP BY kind").fetchall())
+
+    def summary(self):
+        """One-line human readable summary"""
+        with self._lock:
+            ratio = self.stats['bytes_stored'] / self.stats['bytes_raw'] if self.stats['bytes_raw'] else 0
+            return (f"Snapshots: {self.stats['saved']} pages stored ({ratio:.0%} of their size), "
+                    f"{self.stats['deduplicated']} unchanged pages deduplicated")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_snapshot_store():
+    """Return the process-wide SnapshotStore, or None when SNAPSHOTS=false"""
+    global _store
+    if not SNAPSHOTS_ENABLED:
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = SnapshotStore()
+        return _store
+
+
+def snapshot_page(url, html, kind=None):
+    """Store a fetched page if snapshots are enabled (never raises; a failed write only loses the snapshot)"""
+    store = get_snapshot_store()
+    if store is None or not html:
+        return
+    try:
+        store.save(url, html, kind)
+    except (OSError, sqlite3.Error) as e:
+        print(f"    ⚠️ Could not store snapshot of {url}: {e}")
+
+
+def main(argv):
+    store = SnapshotStore()
+    if argv[:1] == ['stats']:
+        print(f"📸 {store.counts()} in {store.root}")
+    elif argv[:1] == ['prune']:
+        retention_days = float(argv[1]) if len(argv) > 1 else SNAPSHOT_RETENTION_DAYS
+        removed = store.prune(retention_days)
+        print(f"🧹 Removed {removed['snapshots']} snapshots and {removed['objects']} unreferenced pages")
+    else:
+        print(__doc__)
+        return 1
+    store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test address matching
+
+Offline checks that AddressIndex and ResultsIndex match differently written
+forms of an address to the right row, and that those forms share a
+property_id while different properties at the same postcode never do.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from address_matching import AddressIndex, ResultsIndex, property_id
+
+POSTCODE = 'EN5 1AA'
+
+SALES_ROWS = [
+    {'cell': 'Flat 2, 10 High Street', 'date': '2020-06-01'},
+    {'cell': '10 High Street', 'date': '2019-03-01'},
+    {'cell': '10 High Street', 'date': '2023-09-01'},
+    {'cell': '12 High Street', 'date': '2021-01-01'},
+    {'cell': 'Rose Cottage, Church Lane', 'date': '2018-05-01'},
+]
+
+def test_address_index_best_match():
+    """Abbreviations, flat order and town words still find the row; the latest sale wins ties"""
+    index = AddressIndex(SALES_ROWS)
+    prefer = lambda row: row['date']
+    match = index.best_match('10 High St, Barnet EN5 1AA', prefer=prefer)
+    assert match.row is SALES_ROWS[2] and match.score == 1.0
+    for address in ['10 High Street, Flat 2', 'FLAT 2 10 HIGH STREET', '2 10 High Street']:
+        assert index.best_match(address, prefer=prefer).row is SALES_ROWS[0]
+    assert index.best_match('Rose Cottage Church Lane Barnet').row is SALES_ROWS[4]
+
+def test_address_index_no_match():
+    """Another house number or flat is never taken for the one asked for"""
+    index = AddressIndex(SALES_ROWS)
+    assert index.best_match('14 High Street') is None
+    assert index.best_match('Flat 9, 10 High Street') is None
+    assert index.best_match('Ivy Cottage, Mill Lane') is None
+
+def test_results_index_match():
+    """Lots are matched to their results row despite prices, outcomes and extra town words"""
+    results = ResultsIndex({
+        '1': '10 High Street, Barnet EN5 1AA Sold £250,000',
+        '2': '12 High Street, Barnet EN5 1AA Unsold',
+        '3': 'Rose Cottage, Church Lane, Barnet Withdrawn',
+        '4': '5 Mill Road, Leeds LS1 1AA Sold Prior',
+    })
+    assert results.match('10 High St, Barnet, EN5 1AA') == '1'
+    assert results.match('12 High Street Barnet') == '2'
+    assert results.match('Rose Cottage, Church Lane') == '3'
+    assert results.match('99 Nowhere Road') is None
+
+def test_same_property_shares_id():
+    """Abbreviations, town names and where the postcode comes from do not change the ID"""
+    expected = property_id('10 High Street', POSTCODE)
+    assert expected
+    assert property_id('10 High St', POSTCODE) == expected
+    assert property_id('10 High Street, Barnet', POSTCODE) == expected
+    assert property_id('10 High Street, London EN5 1AA') == expected
+
+def test_town_and_punctuation_do_not_change_id():
+    """Town words with or without commas, and a house number on its own, give one ID"""
+    expected = property_id('10 High Street', POSTCODE)
+    assert property_id('10 High Street London EN5 1AA', POSTCODE) == expected
+    assert property_id('10, High Street, Barnet EN5 1AA', POSTCODE) == expected
+    assert property_id('10 HIGH STREET BARNET HERTS', POSTCODE) == expected
+    assert property_id('10 Park Road Wood Green', 'N22 1AA') == property_id('10 Park Road, Wood Green', 'N22 1AA')
+    assert property_id('Flat 2, 10, High Street', POSTCODE) == property_id('Flat 2, 10 High Street', POSTCODE)
+
+def test_different_properties_do_not_collide():
+    """Other streets, flats and parcels at the same number and postcode get their own ID"""
+    ids = [
+        property_id('10 High Street', POSTCODE),
+        property_id('10 Low Road', POSTCODE),
+        property_id('12 High Street', POSTCODE),
+        property_id('Flat 2, 10 High Street', POSTCODE),
+        property_id('Flat 3, 10 High Street', POSTCODE),
+        property_id('Land Adjacent to 10 High Street', POSTCODE),
+        property_id('Rear of 10 High Street', POSTCODE),
+    ]
+    assert len(set(ids)) == len(ids)
+
+def test_no_postcode_has_no_id():
+    """Without a postcode there is no ID (callers match on the address instead)"""
+    assert property_id('10 High Street') == ''
+    assert property_id('10 High Street', None) == ''
+
+if __name__ == "__main__":
+    test_address_index_best_match()
+    test_address_index_no_match()
+    test_results_index_match()
+    test_same_property_shares_id()
+    test_town_and_punctuation_do_not_change_id()
+    test_different_properties_do_not_collide()
+    test_no_postcode_has_no_id()
+    print("✅ Address matching tests passed")
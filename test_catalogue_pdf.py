@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Test catalogue guide price parsing
+
+Offline checks of guide_prices_from_text on catalogue text as pypdf extracts it.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from catalogue_pdf import guide_prices_from_text, first_guide_price
+
+CATALOGUE_TEXT = """Contents
+Lot 1 ........ 3
+Lot 2 ........ 4
+Lot 1
+10 High Street, Barnet EN5 1AA
+A two bedroom flat. Guide Price £120,000+
+Lot 2
+Land adjacent to 12 High Street
+Guide: £95,000
+Lot 3A
+Withdrawn prior to auction
+Lot No. 4
+Guide Price
+£250,000 - £275,000
+"""
+
+def test_guide_prices_from_text():
+    """Each lot keeps its first section with a guide; lots without one are left out"""
+    guides = guide_prices_from_text(CATALOGUE_TEXT)
+    assert guides['1'] == '£120,000+'
+    assert guides['2'] == '£95,000'
+    assert '3A' not in guides
+    assert guides['4'].startswith('£250,000')
+
+def test_no_lot_headings():
+    """Text without lot headings maps no lots, but its first guide is still found"""
+    assert guide_prices_from_text("Guide Price £120,000+") == {}
+    assert first_guide_price("Guide Price £120,000+") == '£120,000+'
+    assert first_guide_price("No price given") is None
+
+if __name__ == "__main__":
+    test_guide_prices_from_text()
+    test_no_lot_headings()
+    print("✅ Catalogue guide price tests passed")
@@ -57,9 +57,10 @@ def test_guide_price_extraction():
             
             # Test the update logic
             print(f"\n🔄 Testing spreadsheet update logic...")
-            update_success = workflow.update_spreadsheet_row(test_row, result)
+            write = workflow.update_spreadsheet_row(test_row, result)
+            workflow.sheets_manager.flush()
             
-            if update_success:
+            if write is not None and write.result().get('ok'):
                 print(f"✅ Successfully updated spreadsheet")
                 print(f"   Updated guide_price: {test_row.get('guide_price', 'Not found')}")
                 print(f"   Updated source_url: {test_row.get('source_url', 'Not found')}")
@@ -48,8 +48,8 @@ def test_potential_trades_integration():
     # Test 1: Add to POTENTIAL_TRADES
     print("🔄 Test 1: Adding to POTENTIAL_TRADES...")
     try:
-        success = controller.add_to_potential_trades(test_property)
-        if success:
+        write = controller.add_to_potential_trades(test_property)
+        if controller.settle_writes([write]):
             print("✅ Successfully added to POTENTIAL_TRADES")
         else:
             print("❌ Failed to add to POTENTIAL_TRADES")
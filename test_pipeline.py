@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test the staged pipeline
+
+Offline checks that Pipeline.run drains every stage, batches items and
+reports the items a handler fails on without losing the rest of their batch.
+"""
+
+import sys
+import os
+import asyncio
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from pipeline import Pipeline, AsyncPipeline, Stage
+
+def test_pipeline_drains_every_item():
+    """Every item comes out of the last stage, through several workers and batches"""
+    batches = []
+    pipeline = Pipeline([
+        Stage('double', lambda item: [item * 2], workers=3, queue_size=2),
+        Stage('batch', lambda items: batches.append(len(items)) or items, batch_size=5, queue_size=4),
+    ])
+    results = pipeline.run(range(50))
+    assert sorted(results) == [item * 2 for item in range(50)]
+    assert sum(batches) == 50
+    assert max(batches) <= 5
+    assert pipeline.stages[0].stats['items'] == 50
+    assert pipeline.stages[1].stats['results'] == 50
+
+def test_pipeline_counts_errors():
+    """A failing handler call is counted and its items dropped; the rest still drain"""
+    def fail_on_odd(item):
+        if item % 2:
+            raise ValueError(f"odd item {item}")
+        return [item]
+
+    pipeline = Pipeline([Stage('even', fail_on_odd, workers=2), Stage('collect', lambda item: [item])])
+    results = pipeline.run(range(10))
+    assert sorted(results) == [0, 2, 4, 6, 8]
+    assert pipeline.stages[0].stats['errors'] == 5
+    assert pipeline.stages[1].stats['items'] == 5
+
+def fail_on_three(items):
+    if 3 in items:
+        raise ValueError("bad item 3")
+    return items
+
+def test_pipeline_retries_failed_batch_per_item():
+    """A batch that fails is retried item by item; the bad item goes to on_error, the rest go on"""
+    reported = []
+    pipeline = Pipeline([
+        Stage('batch', fail_on_three, batch_size=10, on_error=lambda item, error: reported.append(item) or [-item]),
+        Stage('collect', lambda item: [item]),
+    ])
+    results = pipeline.run(range(6))
+    assert sorted(results) == [-3, 0, 1, 2, 4, 5]
+    assert reported == [3]
+    assert pipeline.stages[0].stats['errors'] == 1
+
+def test_async_pipeline_retries_failed_batch_per_item():
+    """AsyncPipeline reports failed items the same way"""
+    async def handler(items):
+        return fail_on_three(items)
+
+    async def collect(item):
+        return [item]
+
+    pipeline = AsyncPipeline([
+        Stage('batch', handler, batch_size=10, on_error=lambda item, error: [-item]),
+        Stage('collect', collect),
+    ])
+    results = asyncio.run(pipeline.run(range(6)))
+    assert sorted(results) == [-3, 0, 1, 2, 4, 5]
+    assert pipeline.stages[0].stats['errors'] == 1
+
+def test_pipeline_runs_worker_exit_hook():
+    """on_worker_exit is called once per worker, after the input has drained"""
+    exits = []
+    lock = threading.Lock()
+
+    def on_exit():
+        with lock:
+            exits.append(threading.current_thread().name)
+
+    pipeline = Pipeline([Stage('noop', lambda item: [item], workers=3, on_worker_exit=on_exit)])
+    assert sorted(pipeline.run([1, 2, 3])) == [1, 2, 3]
+    assert len(exits) == 3
+
+if __name__ == "__main__":
+    test_pipeline_drains_every_item()
+    test_pipeline_counts_errors()
+    test_pipeline_retries_failed_batch_per_item()
+    test_async_pipeline_retries_failed_batch_per_item()
+    test_pipeline_runs_worker_exit_hook()
+    print("✅ Pipeline tests passed")
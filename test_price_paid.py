@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Test the Price Paid Data index
+
+Offline checks that a monthly update loaded on top of an earlier file adds,
+changes and deletes transactions by their record status ('A', 'C', 'D').
+"""
+
+import sys
+import os
+import csv
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from price_paid import PricePaidIndex
+
+def ppd_row(transaction_id, price, date, paon, street, status='A', postcode='EN5 1AA', saon=''):
+    """One PPD CSV row in the published column order"""
+    return [transaction_id, str(price), f"{date} 00:00", postcode, 'T', 'N', 'F',
+            paon, saon, street, '', 'BARNET', 'BARNET', 'GREATER LONDON', 'A', status]
+
+def write_csv(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as handle:
+        csv.writer(handle).writerows(rows)
+
+def test_monthly_update_applies_record_status():
+    """'A' adds, 'C' replaces and 'D' deletes transactions loaded earlier"""
+    with tempfile.TemporaryDirectory() as directory:
+        index = PricePaidIndex(os.path.join(directory, 'price_paid.sqlite'))
+        try:
+            complete = os.path.join(directory, 'complete.csv')
+            write_csv(complete, [
+                ppd_row('{T1}', 250000, '2023-05-01', '10', 'HIGH STREET'),
+                ppd_row('{T2}', 180000, '2022-01-15', '12', 'HIGH STREET'),
+                ppd_row('{T3}', 300000, '2021-07-30', '2', 'LOW ROAD', saon='FLAT 1'),
+                ['not', 'a', 'ppd', 'row'],
+            ])
+            counts = index.load_csv(complete, replace=True)
+            assert counts == {'upserted': 3, 'deleted': 0, 'skipped': 1}
+
+            monthly = os.path.join(directory, 'monthly.csv')
+            write_csv(monthly, [
+                ppd_row('{T1}', 255000, '2023-05-01', '10', 'HIGH STREET', status='C'),
+                ppd_row('{T2}', 0, '2022-01-15', '12', 'HIGH STREET', status='D'),
+                ppd_row('{T4}', 410000, '2024-02-10', '14', 'HIGH STREET', status='A'),
+                ppd_row('{T5}', 99000, '2024-03-01', '1', 'NOWHERE LANE', postcode=''),
+            ])
+            counts = index.load_csv(monthly)
+            assert counts == {'upserted': 2, 'deleted': 1, 'skipped': 1}
+
+            sales = index.sales_for_postcode('en51aa')
+            assert [(sale['address'], sale['price']) for sale in sales] == [
+                ('14 High Street', 410000),
+                ('10 High Street', 255000),
+                ('Flat 1, 2 Low Road', 300000),
+            ]
+            rows = index.prices_rows('EN5 1AA')
+            assert rows[0]['cell'] == '14 High Street'
+            assert '10/02/2024' in rows[0]['text'] and '£410,000' in rows[0]['text']
+            assert index.prices_rows('N1 1AA') is None
+        finally:
+            index.close()
+
+if __name__ == "__main__":
+    test_monthly_update_applies_record_status()
+    print("✅ Price Paid index tests passed")